@@ -0,0 +1,198 @@
+import io
+import math
+import os
+import platform
+import sys
+import time
+import wave
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Protocol
+
+from trace_log import TRACE
+
+
+@dataclass(frozen=True)
+class BeepSpec:
+    freq_hz: int = 450
+    duration_ms: int = 200
+    repeat_cnt: int = 3
+    gap_ms: int = 40
+    volume: float = 0.5
+    sample_rate: int = 22050
+    # 每声首尾的淡入淡出，避免爆音
+    ramp_ms: int = 5
+
+
+def synthesize_pcm(spec: BeepSpec = BeepSpec()) -> bytes:
+    """ 生成整段提示音 (repeat_cnt 声 + 间隔) 的 16 bit 单声道 PCM 数据 """
+    n_tone = spec.sample_rate * spec.duration_ms // 1000
+    n_gap = spec.sample_rate * spec.gap_ms // 1000
+    n_ramp = min(spec.sample_rate * spec.ramp_ms // 1000, n_tone // 2)
+    amplitude = 32767 * spec.volume
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        t = np.arange(n_tone, dtype=np.float64) / spec.sample_rate
+        tone = np.sin(2 * np.pi * spec.freq_hz * t) * amplitude
+        if n_ramp:
+            ramp = np.linspace(0.0, 1.0, n_ramp)
+            tone[:n_ramp] *= ramp
+            tone[-n_ramp:] *= ramp[::-1]
+        beep = np.concatenate((tone, np.zeros(n_gap)))
+        return np.tile(beep, spec.repeat_cnt).astype('<i2').tobytes()
+
+    step = 2 * math.pi * spec.freq_hz / spec.sample_rate
+    tone = array('h', bytes(2 * n_tone))
+    for i in range(n_tone):
+        envelope = min(1.0, i / n_ramp, (n_tone - 1 - i) / n_ramp) if n_ramp else 1.0
+        tone[i] = int(math.sin(step * i) * amplitude * envelope)
+    pcm = (tone + array('h', bytes(2 * n_gap))) * spec.repeat_cnt
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    with io.BytesIO() as buf:
+        with wave.open(buf, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return buf.getvalue()
+
+
+class AlarmSink(Protocol):
+    # True: play 会阻塞到播放结束，需放到工作线程；False: play 立即返回
+    blocking: bool
+
+    def play(self, wav: bytes, pcm: bytes, spec: BeepSpec) -> None:
+        ...
+
+
+class WinSoundSink:
+    """ Windows：直接从内存播放 WAV，不落盘 """
+    blocking = True
+
+    def play(self, wav: bytes, pcm: bytes, spec: BeepSpec) -> None:
+        import winsound
+        winsound.PlaySound(wav, winsound.SND_MEMORY)
+
+
+class QtAudioSink:
+    """ 常驻的 QAudioOutput，重复播放同一块 PCM 缓冲，须在 Qt 主线程使用 """
+    blocking = False
+
+    def __init__(self, spec: BeepSpec) -> None:
+        from PyQt5.QtCore import QBuffer, QByteArray
+        from PyQt5.QtMultimedia import QAudio, QAudioDeviceInfo, QAudioFormat, QAudioOutput
+
+        fmt = QAudioFormat()
+        fmt.setSampleRate(spec.sample_rate)
+        fmt.setChannelCount(1)
+        fmt.setSampleSize(16)
+        fmt.setCodec('audio/pcm')
+        fmt.setByteOrder(QAudioFormat.Endian.LittleEndian)
+        fmt.setSampleType(QAudioFormat.SampleType.SignedInt)
+        device = QAudioDeviceInfo.defaultOutputDevice()
+        if device.isNull() or not device.isFormatSupported(fmt):
+            raise RuntimeError('no audio output device supports the alarm format')
+        self._stopped_state = QAudio.State.StoppedState
+        self._output = QAudioOutput(device, fmt)
+        self._buffer = QBuffer()
+        self._byte_array = QByteArray()
+
+    def play(self, wav: bytes, pcm: bytes, spec: BeepSpec) -> None:
+        if self._byte_array.size() != len(pcm):
+            self._buffer.close()
+            self._byte_array = QByteArray(pcm)
+            self._buffer.setData(self._byte_array)
+        if self._output.state() != self._stopped_state:
+            self._output.stop()
+        if not self._buffer.isOpen():
+            self._buffer.open(QBuffer.OpenModeFlag.ReadOnly)
+        self._buffer.seek(0)
+        self._output.start(self._buffer)
+
+
+class FileSink:
+    """ 把提示音写到 WAV 文件，并记录每次播放时间，用于无声卡/无界面环境测试 """
+    blocking = False
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.played_ns: List[int] = []
+
+    def play(self, wav: bytes, pcm: bytes, spec: BeepSpec) -> None:
+        self.played_ns.append(time.monotonic_ns())
+        with open(self.path, 'wb') as f:
+            f.write(wav)
+
+
+class NullSink:
+    """ 没有可用的音频输出，只提示一次 """
+    blocking = False
+
+    def __init__(self, reason: str = '') -> None:
+        self.reason = reason
+        self._warned = False
+
+    def play(self, wav: bytes, pcm: bytes, spec: BeepSpec) -> None:
+        if not self._warned:
+            TRACE.warning('AlarmEngine', 'no audio output, alarm is silent. %s', self.reason)
+            self._warned = True
+
+
+def default_sink(spec: BeepSpec) -> AlarmSink:
+    sink_path = os.environ.get('PYQTTIMER_ALARM_FILE')
+    if sink_path:
+        return FileSink(sink_path)
+    if platform.system() == 'Windows':
+        return WinSoundSink()
+    try:
+        return QtAudioSink(spec)
+    except (ImportError, RuntimeError) as e:
+        return NullSink(str(e))
+
+
+class AlarmEngine:
+    """ 提示音引擎：波形只合成一次并缓存为 PCM/WAV，播放时不再启动任何进程 """
+
+    def __init__(self, spec: BeepSpec = BeepSpec(), sink: Optional[AlarmSink] = None) -> None:
+        self.spec = spec
+        self.pcm = synthesize_pcm(spec)
+        self.wav = pcm_to_wav(self.pcm, spec.sample_rate)
+        self.sink = default_sink(spec) if sink is None else sink
+        # 最近一次从请求播放到音频输出接手的耗时
+        self.last_latency_ns = 0
+
+    @property
+    def blocking(self) -> bool:
+        return self.sink.blocking
+
+    def duration_ms(self) -> int:
+        return len(self.pcm) // 2 * 1000 // self.spec.sample_rate
+
+    def play(self, ns_request: Optional[int] = None) -> None:
+        ns_request = time.monotonic_ns() if ns_request is None else ns_request
+        if not self.sink.blocking:
+            self.sink.play(self.wav, self.pcm, self.spec)
+            self.last_latency_ns = time.monotonic_ns() - ns_request
+            return
+        self.last_latency_ns = time.monotonic_ns() - ns_request
+        self.sink.play(self.wav, self.pcm, self.spec)
+
+
+_ENGINE: Optional[AlarmEngine] = None
+
+
+def get_alarm_engine() -> AlarmEngine:
+    """ 应用共用的提示音引擎，首次调用时合成波形并打开音频输出 (Qt 输出须在主线程创建) """
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = AlarmEngine()
+    return _ENGINE
@@ -0,0 +1,163 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Callable, Hashable, List, Optional, Set, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from alarm_audio import AlarmEngine, get_alarm_engine
+from simple_timer import NS_PER_MS
+from tick_metrics import METRICS
+
+
+class AlarmStateEnum(Enum):
+    IDLE = auto()
+    RINGING = auto()
+    STOPPED = auto()  # 按策略自动停止
+
+
+@dataclass(frozen=True)
+class AlarmPolicy:
+    repeat_interval_ms: int = 1600
+    # 每响一次，间隔乘以该系数；1.0 表示固定间隔
+    backoff_factor: float = 1.0
+    max_interval_ms: int = 60_000
+    # 0 表示不限制
+    max_rings: int = 0
+    auto_stop_ms: int = 0
+
+    def interval_ns(self, ring_cnt: int) -> int:
+        interval_ms = self.repeat_interval_ms * self.backoff_factor ** max(ring_cnt - 1, 0)
+        return int(min(interval_ms, self.max_interval_ms)) * NS_PER_MS
+
+
+# 工作线程上测得的指标样本 (名称, 纳秒)，交回主线程写入 METRICS
+Samples = List[Tuple[str, int]]
+
+
+class AudioWorker:
+    """ 全应用唯一的阻塞音频播放线程，各个请求方的播放按提交顺序串行执行
+    同一请求方上一声还没播完时它的新请求直接丢弃，不同请求方 (多个计时器同时响铃) 互不丢弃，排队数不超过请求方个数
+    METRICS 没有加锁，工作线程不直接记录，测得的样本通过 on_done 交回主线程
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 已提交还没播完的请求方；主线程提交、工作线程移除，用锁保护
+        self._lock = threading.Lock()
+        self._owners: Set[Hashable] = set()
+
+    def try_play(self, engine: AlarmEngine, on_done: Callable[[Samples], None], owner: Hashable) -> bool:
+        with self._lock:
+            if owner in self._owners:
+                return False
+            self._owners.add(owner)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='alarm-audio')
+        ns_submit = time.monotonic_ns()
+
+        def worker():
+            samples: Samples = [('alarm.worker_wait', time.monotonic_ns() - ns_submit)]
+            try:
+                engine.play()
+                samples.append(('alarm.play_latency', engine.last_latency_ns))
+            finally:
+                with self._lock:
+                    self._owners.discard(owner)
+                on_done(samples)
+
+        self._executor.submit(worker)
+        return True
+
+
+AUDIO_WORKER = AudioWorker()
+
+
+class AlarmStateMachine(QObject):
+    """ 倒计时结束提醒的状态机，运行在 Qt 事件循环上，由 TickHub 按 next_deadline_ns 驱动
+    背景闪烁通过 flash 信号在主线程完成，阻塞的播放交给 AUDIO_WORKER
+    """
+    flash = pyqtSignal(bool)
+    auto_stopped = pyqtSignal()
+    # 工作线程播放结束后发出，跨线程排队回到主线程，带着工作线程上测得的指标样本
+    _beep_done = pyqtSignal(list)
+
+    def __init__(
+            self, policy: AlarmPolicy = AlarmPolicy(),
+            engine_factory: Callable[[], AlarmEngine] = get_alarm_engine, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.policy = policy
+        self.engine_factory = engine_factory
+        self.state = AlarmStateEnum.IDLE
+        self.ring_cnt = 0
+        self.skip_cnt = 0
+        self.ns_started: Optional[int] = None
+        self.ns_next_ring: Optional[int] = None
+        self._is_flashing = False
+        self._beep_done.connect(self._on_beep_done)
+
+    def is_ringing(self) -> bool:
+        return self.state == AlarmStateEnum.RINGING
+
+    def next_deadline_ns(self) -> Optional[int]:
+        return self.ns_next_ring if self.is_ringing() else None
+
+    def start(self, ns_now: int) -> None:
+        self.state = AlarmStateEnum.RINGING
+        self.ring_cnt = 0
+        self.ns_started = ns_now
+        self.ns_next_ring = ns_now
+        self.on_tick(ns_now)
+
+    def chime(self) -> None:
+        """ 只提醒一次 (番茄钟阶段切换)，不进入 RINGING 状态，不影响计时 """
+        if not self.is_ringing():
+            self._ring()
+
+    def stop(self) -> None:
+        self.state = AlarmStateEnum.IDLE
+        self.ns_next_ring = None
+
+    def on_tick(self, ns_now: int) -> None:
+        if not self.is_ringing() or ns_now < self.ns_next_ring:
+            return
+        policy = self.policy
+        if (
+            (policy.max_rings and self.ring_cnt >= policy.max_rings)
+            or (policy.auto_stop_ms and ns_now - self.ns_started >= policy.auto_stop_ms * NS_PER_MS)
+        ):
+            self.state = AlarmStateEnum.STOPPED
+            self.ns_next_ring = None
+            self.auto_stopped.emit()
+            return
+        if self.ring_cnt:
+            METRICS.record('alarm.late', ns_now - self.ns_next_ring)
+        self.ring_cnt += 1
+        self.ns_next_ring = ns_now + policy.interval_ns(self.ring_cnt)
+        self._ring()
+
+    @METRICS.timed('alarm.ring')
+    def _ring(self) -> None:
+        engine = self.engine_factory()
+        if engine.blocking:
+            if not AUDIO_WORKER.try_play(engine, self._beep_done.emit, owner=self):
+                self.skip_cnt += 1
+                return
+        else:
+            engine.play()
+            METRICS.record('alarm.play_latency', engine.last_latency_ns)
+            QTimer.singleShot(engine.duration_ms(), self._end_flash)
+        self._is_flashing = True
+        self.flash.emit(True)
+
+    def _on_beep_done(self, samples: Samples) -> None:
+        for name, ns in samples:
+            METRICS.record(name, ns)
+        self._end_flash()
+
+    def _end_flash(self) -> None:
+        if self._is_flashing:
+            self._is_flashing = False
+            self.flash.emit(False)
@@ -0,0 +1,305 @@
+""" 计时器无界面基准测试
+
+python benchmark.py --output bench.json
+python benchmark.py --output bench_new.json --baseline bench.json --tolerance 0.2
+
+结果为 JSON；指定 --baseline 时逐项对比，任一指标变差超过 tolerance 则以退出码 1 结束
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('PYQTTIMER_ALARM_FILE', os.path.join(tempfile.gettempdir(), 'pyqttimer_bench_alarm.wav'))
+
+from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from alarm_audio import AlarmEngine, FileSink  # noqa: E402
+from alarm_state import AlarmStateMachine  # noqa: E402
+from deadline_queue import DeadlineQueue  # noqa: E402
+from simple_timer import NS_PER_SEC, VirtualClock  # noqa: E402
+from tick_hub import TickHub  # noqa: E402
+from timer_history import HistoryAnalytics, HistoryStore, SessionOutcomeEnum, SessionRecord  # noqa: E402
+from timer_widget import DispDirectionEnum, TimerWidget  # noqa: E402
+
+SCALING_COUNTS = (1, 10, 50, 100, 500)
+
+
+def rss_bytes() -> Optional[int]:
+    """ 当前进程常驻内存，取不到时返回 None """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    samples_us = sorted(ns / 1000 for ns in samples_ns)
+    p95 = samples_us[min(int(len(samples_us) * 0.95), len(samples_us) - 1)]
+    return {'mean': statistics.fmean(samples_us), 'median': statistics.median(samples_us), 'p95': p95}
+
+
+def metric(value: float, unit: str, lower_is_better: bool = True) -> Dict:
+    return {'value': value, 'unit': unit, 'lower_is_better': lower_is_better}
+
+
+def make_started_widget(hub: TickHub, disp_direction: DispDirectionEnum, minutes: int = 25) -> TimerWidget:
+    widget = TimerWidget(disp_direction=disp_direction, hub=hub)
+    widget.timer_mm_edit.setText(f'{minutes:02}')
+    widget.start_pause()
+    return widget
+
+
+def bench_tick(app: QApplication, ticks: int) -> Dict[str, Dict]:
+    """ 单个计时器 on_timer_timeout 的耗时，每次推进 1 秒，使每次 tick 都有可见变化 """
+    clock = VirtualClock(NS_PER_SEC)
+    hub = TickHub(clock=clock)
+    results = {}
+    for disp_direction in DispDirectionEnum:
+        widget = make_started_widget(hub, disp_direction, minutes=99)
+        widget.show()
+        app.processEvents()
+        samples = []
+        for _ in range(ticks):
+            ns_now = clock.advance(ms=1000)
+            t0 = time.perf_counter_ns()
+            widget.on_timer_timeout(ns_now)
+            app.processEvents()
+            samples.append(time.perf_counter_ns() - t0)
+        stats = summarize(samples)
+        name = disp_direction.name.lower()
+        results[f'tick.{name}.median_us'] = metric(stats['median'], 'us')
+        results[f'tick.{name}.p95_us'] = metric(stats['p95'], 'us')
+        widget.close()
+        widget.deleteLater()
+    app.processEvents()
+    return results
+
+
+def bench_construction(app: QApplication, count: int) -> Dict[str, Dict]:
+    """ 每个 TimerWidget 的构造耗时和内存增量 """
+    hub = TickHub(clock=VirtualClock(NS_PER_SEC))
+    results = {}
+    for disp_direction in DispDirectionEnum:
+        TimerWidget(disp_direction=disp_direction, hub=hub).deleteLater()  # 预热：样式表、图标、字体
+        app.processEvents()
+        gc.collect()
+        rss_before = rss_bytes()
+        widgets = []
+        samples = []
+        for _ in range(count):
+            t0 = time.perf_counter_ns()
+            widgets.append(TimerWidget(disp_direction=disp_direction, hub=hub))
+            samples.append(time.perf_counter_ns() - t0)
+        app.processEvents()
+        rss_after = rss_bytes()
+        stats = summarize(samples)
+        name = disp_direction.name.lower()
+        results[f'construct.{name}.median_us'] = metric(stats['median'], 'us')
+        if rss_before is not None and rss_after is not None:
+            results[f'construct.{name}.rss_per_widget_kb'] = metric((rss_after - rss_before) / count / 1024, 'KiB')
+        for widget in widgets:
+            widget.deleteLater()
+        app.processEvents()
+    return results
+
+
+def bench_scaling(app: QApplication, counts=SCALING_COUNTS) -> Dict[str, Dict]:
+    """ n 个同时运行的计时器，一次 TickHub 分发 (全部到期) 的耗时 """
+    results = {}
+    for count in counts:
+        clock = VirtualClock(NS_PER_SEC)
+        hub = TickHub(clock=clock)
+        widgets = [make_started_widget(hub, DispDirectionEnum.HORIZONTAL) for _ in range(count)]
+        app.processEvents()
+        samples = []
+        for _ in range(20):
+            ns_now = clock.advance(ms=1000)
+            t0 = time.perf_counter_ns()
+            hub.dispatch(ns_now)
+            app.processEvents()
+            samples.append(time.perf_counter_ns() - t0)
+        stats = summarize(samples)
+        results[f'scaling.{count}.dispatch_median_us'] = metric(stats['median'], 'us')
+        results[f'scaling.{count}.per_timer_us'] = metric(stats['median'] / count, 'us')
+        for widget in widgets:
+            widget.deleteLater()
+        app.processEvents()
+    return results
+
+
+def bench_alarm(app: QApplication, rounds: int) -> Dict[str, Dict]:
+    """ 提示音路径：引擎交给输出的耗时，以及状态机从开始响铃到发出闪烁信号的耗时 """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = AlarmEngine(sink=FileSink(os.path.join(tmp_dir, 'alarm.wav')))
+        play_samples = []
+        for _ in range(rounds):
+            engine.play()
+            play_samples.append(engine.last_latency_ns)
+
+        alarm = AlarmStateMachine(engine_factory=lambda: engine)
+        ns_flash: List[int] = []
+        alarm.flash.connect(lambda is_alarm: is_alarm and ns_flash.append(time.perf_counter_ns()))
+        ring_samples = []
+        for _ in range(rounds):
+            t0 = time.perf_counter_ns()
+            alarm.start(time.monotonic_ns())
+            ring_samples.append(ns_flash[-1] - t0)
+            alarm.stop()
+        app.processEvents()
+    return {
+        'alarm.play_median_us': metric(summarize(play_samples)['median'], 'us'),
+        'alarm.ring_median_us': metric(summarize(ring_samples)['median'], 'us'),
+    }
+
+
+def bench_deadlines(count: int) -> Dict[str, Dict]:
+    """ count 个计时器的结束时刻：逐个设置、暂停、继续，以及同一时刻大批到期时的取出耗时 """
+    queue: DeadlineQueue[int] = DeadlineQueue()
+    t0 = time.perf_counter_ns()
+    for i in range(count):
+        queue.schedule(i, (i % 100 + 1) * NS_PER_SEC)
+    ns_schedule = time.perf_counter_ns() - t0
+    t0 = time.perf_counter_ns()
+    for i in range(0, count, 2):
+        queue.pause(i, 0)
+    for i in range(0, count, 2):
+        queue.resume(i, 0)
+    ns_pause_resume = time.perf_counter_ns() - t0
+    t0 = time.perf_counter_ns()
+    due = 0
+    for sec in range(1, 101):
+        due += len(queue.pop_due(sec * NS_PER_SEC))
+    ns_pop = time.perf_counter_ns() - t0
+    assert due == count
+    return {
+        f'deadline.{count}.schedule_us': metric(ns_schedule / count / 1000, 'us'),
+        f'deadline.{count}.pause_resume_us': metric(ns_pause_resume / count / 1000, 'us'),
+        f'deadline.{count}.pop_us': metric(ns_pop / count / 1000, 'us'),
+    }
+
+
+def bench_history(rows: int, days: int = 365, labels: int = 8) -> Dict[str, Dict]:
+    """ rows 条历史记录分布在 days 天、labels 种提醒内容上：写入耗时，统计冷启动载入和三项查询的耗时 """
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        return {}
+    outcomes = tuple(SessionOutcomeEnum)
+    ms_start = 1_700_000_000_000
+    ms_step = days * 86_400_000 // rows
+    records = (
+        SessionRecord(
+            timer='bench', label=f'label{i % labels}', started_at=ms_start + i * ms_step,
+            ended_at=ms_start + i * ms_step + 1_500_000, planned_ms=1_500_000, focus_ms=1_500_000 - i % 1000,
+            pause_cnt=i % 3, outcome=outcomes[i % len(outcomes)].value)
+        for i in range(rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.sqlite3')
+        store = HistoryStore(path)
+        t0 = time.perf_counter_ns()
+        store.add_many(records)
+        ns_insert = time.perf_counter_ns() - t0
+        store.close()
+
+        store = HistoryStore(path)
+        t0 = time.perf_counter_ns()
+        analytics = HistoryAnalytics(store)
+        ns_load = time.perf_counter_ns() - t0
+        since_ms = ms_start + days * 86_400_000 // 2
+        t0 = time.perf_counter_ns()
+        analytics.daily_focus_totals(since_ms)
+        analytics.completion_rate(since_ms, by_label=True)
+        analytics.interruption_counts(since_ms)
+        ns_query = time.perf_counter_ns() - t0
+        store.close()
+    return {
+        f'history.{rows}.insert_us': metric(ns_insert / rows / 1000, 'us'),
+        f'history.{rows}.cold_load_ms': metric(ns_load / 1e6, 'ms'),
+        f'history.{rows}.query_ms': metric(ns_query / 1e6, 'ms'),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """ 返回变差超过 tolerance 的指标说明 """
+    regressions = []
+    for name, curr in results.items():
+        base = baseline.get(name)
+        if base is None or not base['value']:
+            continue
+        change = (curr['value'] - base['value']) / abs(base['value'])
+        if not curr.get('lower_is_better', True):
+            change = -change
+        if change > tolerance:
+            regressions.append(f'{name}: {base["value"]:.2f} -> {curr["value"]:.2f} {curr["unit"]} (+{change:.0%})')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='结果 JSON 输出路径，默认打印到 stdout')
+    parser.add_argument('--baseline', help='对比的基准结果 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='允许的相对变差，默认 0.2')
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--widgets', type=int, default=50, help='构造测试的控件数')
+    parser.add_argument('--history-rows', type=int, default=1_000_000, help='历史统计测试的记录条数')
+    parser.add_argument('--quick', action='store_true', help='缩小规模，用于冒烟测试')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    benches: List[Callable[[], Dict[str, Dict]]] = [
+        lambda: bench_tick(app, 20 if args.quick else args.ticks),
+        lambda: bench_construction(app, 5 if args.quick else args.widgets),
+        lambda: bench_scaling(app, (1, 10) if args.quick else SCALING_COUNTS),
+        lambda: bench_alarm(app, 5 if args.quick else 50),
+        lambda: bench_deadlines(1000 if args.quick else 10000),
+        lambda: bench_history(10_000 if args.quick else args.history_rows),
+    ]
+    results: Dict[str, Dict] = {}
+    for bench in benches:
+        results.update(bench())
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'pyqt': PYQT_VERSION_STR,
+            'platform': platform.platform(),
+            'qpa': os.environ.get('QT_QPA_PLATFORM', ''),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
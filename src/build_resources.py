@@ -0,0 +1,63 @@
+""" 把 res/ 下的图标编译为 Qt 资源模块 src/res_rc.py
+
+python build_resources.py           # res.qrc 或其中列出的文件比 res_rc.py 新时才重新生成
+python build_resources.py --force   # 强制重新生成
+
+程序启动时 import res_rc 把图标注册到内存中的 :/res/ 路径，读取图标不再访问磁盘；
+打包前先运行本脚本，PyInstaller 会把 res_rc 作为普通模块打包，不需要再 --add-data 图片
+res_rc.py 是生成文件，不提交到仓库；开发时没有生成则回退到从 res/ 目录读取，打包后的程序缺少它时启动即报错
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QRC_PATH = os.path.join(ROOT, 'res', 'res.qrc')
+OUTPUT_PATH = os.path.join(ROOT, 'src', 'res_rc.py')
+
+
+def qrc_files(qrc_path: str = QRC_PATH) -> List[str]:
+    """ .qrc 中列出的文件，相对路径按 .qrc 所在目录解析 """
+    base = os.path.dirname(qrc_path)
+    return [os.path.join(base, node.text.strip()) for node in ET.parse(qrc_path).iter('file') if node.text]
+
+
+def is_stale(qrc_path: str = QRC_PATH, output_path: str = OUTPUT_PATH) -> bool:
+    if not os.path.exists(output_path):
+        return True
+    mtime = os.path.getmtime(output_path)
+    return any(os.path.getmtime(path) > mtime for path in [qrc_path, *qrc_files(qrc_path)])
+
+
+def build(qrc_path: str = QRC_PATH, output_path: str = OUTPUT_PATH) -> None:
+    missing = [path for path in qrc_files(qrc_path) if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f'files listed in {qrc_path} do not exist: {missing}')
+    pyrcc5 = shutil.which('pyrcc5')
+    if pyrcc5 is not None:
+        subprocess.run([pyrcc5, '-o', output_path, qrc_path], check=True)
+        return
+    # 没有 pyrcc5 命令行 (例如只装了 wheel 没有脚本目录) 时直接调用 PyQt5 自带的实现
+    from PyQt5.pyrcc_main import processResourceFile
+    if not processResourceFile([qrc_path], output_path, False):
+        raise RuntimeError(f'pyrcc5 failed to compile {qrc_path}')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--force', action='store_true', help='忽略修改时间，总是重新生成')
+    args = parser.parse_args(argv)
+    if not args.force and not is_stale():
+        print(f'{os.path.relpath(OUTPUT_PATH, ROOT)} is up to date')
+        return 0
+    build()
+    print(f'generated {os.path.relpath(OUTPUT_PATH, ROOT)} from {os.path.relpath(QRC_PATH, ROOT)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import heapq
+import itertools
+from typing import Dict, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+
+# 堆元素: [deadline_ns, seq, key, valid]；seq 保证同一时刻的先后顺序，也避免比较 key
+_DEADLINE, _SEQ, _KEY, _VALID = range(4)
+
+
+class DeadlineQueue(Generic[K]):
+    """ 按结束时刻排序的最小堆，只需给最早的 deadline 设置一个定时器
+    - schedule / pause / resume 为 O(log n)，cancel 为 O(1) 标记删除，失效元素在出堆时跳过，过多时整体重建
+    - pause 记录剩余时长，resume 时以新的时刻加上剩余时长重新入堆，与 SimpleTimer.resume 平移结束时刻一致
+    - pop_due 一次取出所有已到期的 key，同一时刻结束的计时器一起触发
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[list] = []
+        self._entries: Dict[K, list] = {}
+        # 暂停中的 key -> 剩余时长
+        self._paused: Dict[K, int] = {}
+        self._seq = itertools.count()
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def deadline(self, key: K) -> Optional[int]:
+        entry = self._entries.get(key)
+        return None if entry is None else entry[_DEADLINE]
+
+    def is_paused(self, key: K) -> bool:
+        return key in self._paused
+
+    def schedule(self, key: K, deadline_ns: int) -> None:
+        """ 设置 (或修改) key 的结束时刻，同时清除暂停状态 """
+        self._discard(key)
+        self._paused.pop(key, None)
+        entry = [deadline_ns, next(self._seq), key, True]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, key: K) -> None:
+        self._discard(key)
+        self._paused.pop(key, None)
+
+    def pause(self, key: K, ns_now: int) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        self._paused[key] = entry[_DEADLINE] - ns_now
+        self._discard(key)
+        return True
+
+    def resume(self, key: K, ns_now: int) -> bool:
+        if key not in self._paused:
+            return False
+        self.schedule(key, ns_now + self._paused[key])
+        return True
+
+    def peek(self) -> Optional[int]:
+        """ 最早的结束时刻，队列为空时返回 None """
+        self._drop_stale_top()
+        return self._heap[0][_DEADLINE] if self._heap else None
+
+    def pop_due(self, ns_now: int) -> List[K]:
+        """ 取出所有结束时刻不晚于 ns_now 的 key，按结束时刻先后排列 """
+        due = []
+        heap = self._heap
+        while heap and heap[0][_DEADLINE] <= ns_now:
+            entry = heapq.heappop(heap)
+            if entry[_VALID]:
+                del self._entries[entry[_KEY]]
+                due.append(entry[_KEY])
+            else:
+                self._stale -= 1
+        return due
+
+    def latest_before(self, ns_bound: int) -> Optional[int]:
+        """ 不晚于 ns_bound 的最晚结束时刻；只遍历堆中不晚于 ns_bound 的部分 """
+        heap = self._heap
+        latest = None
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            entry = heap[i]
+            if entry[_DEADLINE] > ns_bound:
+                continue  # 子树都更晚
+            if entry[_VALID] and (latest is None or entry[_DEADLINE] > latest):
+                latest = entry[_DEADLINE]
+            stack.extend(j for j in (2 * i + 1, 2 * i + 2) if j < len(heap))
+        return latest
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+        self._paused.clear()
+        self._stale = 0
+
+    def _discard(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        entry[_VALID] = False
+        self._stale += 1
+        if self._stale > 64 and self._stale > len(self._entries):
+            self._heap = [e for e in self._heap if e[_VALID]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _drop_stale_top(self) -> None:
+        heap = self._heap
+        while heap and not heap[0][_VALID]:
+            heapq.heappop(heap)
+            self._stale -= 1
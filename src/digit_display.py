@@ -0,0 +1,237 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PyQt5.QtCore import QEvent, QPointF, QRect, QRectF, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import (
+    QColor, QFont, QFontMetrics, QKeyEvent, QMouseEvent, QPainter, QPainterPath, QPaintEvent, QPalette, QPixmap)
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+from pyqt_helper import trace_key_event
+from timer_style import DEFAULT_THEME
+from trace_log import TRACE
+
+GLYPH_CHARS = '0123456789:'
+COLOR_FOCUS = QColor(DEFAULT_THEME.color_focus)
+FOCUS_RADIUS = 12
+
+DIGIT_KEYS = {
+    Qt.Key.Key_0, Qt.Key.Key_1, Qt.Key.Key_2, Qt.Key.Key_3, Qt.Key.Key_4,
+    Qt.Key.Key_5, Qt.Key.Key_6, Qt.Key.Key_7, Qt.Key.Key_8, Qt.Key.Key_9,
+}
+
+
+class GlyphSet(NamedTuple):
+    pixmaps: Dict[str, QPixmap]
+    # 每个字符的逻辑像素宽度；数字统一用最宽数字的宽度，跳动时位置不变
+    advances: Dict[str, int]
+    height: int
+
+
+class GlyphCache:
+    """ 大号数字字形的预渲染缓存，按 (字体, 设备像素比, 颜色) 各渲染一次 0-9 和 ':' """
+
+    def __init__(self) -> None:
+        self._sets: Dict[Tuple[str, float, int], GlyphSet] = {}
+        self.render_count = 0
+
+    def glyphs(self, font: QFont, dpr: float, color: QColor) -> GlyphSet:
+        key = (font.key(), dpr, color.rgba())
+        glyph_set = self._sets.get(key)
+        if glyph_set is None:
+            glyph_set = self._sets[key] = self._render(font, dpr, color)
+        return glyph_set
+
+    def _render(self, font: QFont, dpr: float, color: QColor) -> GlyphSet:
+        self.render_count += 1
+        metrics = QFontMetrics(font)
+        digit_w = max(metrics.horizontalAdvance(c) for c in '0123456789')
+        advances = {c: digit_w if c.isdigit() else metrics.horizontalAdvance(c) for c in GLYPH_CHARS}
+        height = metrics.height()
+        pixmaps = {}
+        for c, advance in advances.items():
+            pixmap = QPixmap(max(int(advance * dpr + 0.5), 1), max(int(height * dpr + 0.5), 1))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+            painter.setFont(font)
+            painter.setPen(color)
+            painter.drawText(QPointF((advance - metrics.horizontalAdvance(c)) / 2, metrics.ascent()), c)
+            painter.end()
+            pixmaps[c] = pixmap
+        return GlyphSet(pixmaps, advances, height)
+
+    def clear(self) -> None:
+        self._sets.clear()
+
+
+GLYPH_CACHE = GlyphCache()
+
+
+class DigitDisplay(QWidget):
+    """ 自绘的倒计时数字，替代 QLineEdit：字形从 GLYPH_CACHE 取预渲染的图片，文字变化时只重绘变化的字符格
+    保留 TimerNumberLineEdit 的接口和交互：text / setText / textChanged / is_edit_allowed，
+    点击获得焦点、数字键输入、退格、Esc 取消焦点，滚轮由外部替换 wheelEvent 处理
+    """
+    textChanged = pyqtSignal(str)
+
+    def __init__(self, text: str = '', parent: Optional[QWidget] = None, max_length: int = 2,
+                 focus_corner: Optional[Qt.Corner] = None) -> None:
+        super().__init__(parent)
+        self._text = text
+        self.max_length = max_length
+        # 获得焦点时背景只有这个角是圆角，与两侧输入框拼成一个整体
+        self.focus_corner = focus_corner
+        self.__is_edit_allowed = True
+        self._glyphs: Optional[GlyphSet] = None
+        self._glyph_key: Optional[Tuple[float, int]] = None
+        self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Preferred)
+
+    # region 与 QLineEdit 兼容的接口
+    def text(self) -> str:
+        return self._text
+
+    def setText(self, text: str) -> None:
+        text = text[:self.max_length]
+        if text == self._text:
+            return
+        old, self._text = self._text, text
+        if len(old) != len(text):
+            self.update()
+        else:
+            # 只重绘变化的字符格
+            rects = self._cell_rects()
+            for idx, (c_old, c_new) in enumerate(zip(old, text)):
+                if c_old != c_new:
+                    self.update(rects[idx])
+        self.textChanged.emit(text)
+
+    def setMaxLength(self, max_length: int) -> None:
+        self.max_length = max_length
+
+    def refresh_display(self) -> None:
+        if not self.__is_edit_allowed:
+            self.clearFocus()
+
+    @property
+    def is_edit_allowed(self) -> bool:
+        return self.__is_edit_allowed
+
+    @is_edit_allowed.setter
+    def is_edit_allowed(self, is_allowed: bool) -> None:
+        self.__is_edit_allowed = is_allowed
+        self.refresh_display()
+    # endregion 与 QLineEdit 兼容的接口
+
+    # region 绘制
+    def glyphs(self) -> GlyphSet:
+        dpr = self.devicePixelRatioF()
+        color = self.palette().color(QPalette.ColorRole.Text)
+        key = (dpr, color.rgba())
+        if self._glyphs is None or key != self._glyph_key:
+            self._glyphs = GLYPH_CACHE.glyphs(self.font(), dpr, color)
+            self._glyph_key = key
+        return self._glyphs
+
+    def _cell_rects(self) -> List[QRect]:
+        glyphs = self.glyphs()
+        widths = [glyphs.advances.get(c, 0) for c in self._text]
+        x = (self.width() - sum(widths)) // 2
+        y = (self.height() - glyphs.height) // 2
+        rects = []
+        for w in widths:
+            rects.append(QRect(x, y, w, glyphs.height))
+            x += w
+        return rects
+
+    def changeEvent(self, event: QEvent) -> None:
+        super().changeEvent(event)
+        if event.type() in (QEvent.Type.FontChange, QEvent.Type.PaletteChange, QEvent.Type.StyleChange):
+            self._glyphs = None
+            self.updateGeometry()
+            self.update()
+
+    def sizeHint(self) -> QSize:
+        glyphs = self.glyphs()
+        if self.max_length > 1:
+            # 与原输入框一致：两个字符宽度留出 25% 余量
+            width = int(glyphs.advances['0'] * self.max_length * 1.25 + 10)
+        else:
+            width = sum(glyphs.advances.get(c, 0) for c in self._text) + 4
+        return QSize(width, glyphs.height + 4)
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        if self.hasFocus():
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.fillPath(self._focus_path(), COLOR_FOCUS)
+        glyphs = self.glyphs()
+        dirty = event.rect()
+        for c, rect in zip(self._text, self._cell_rects()):
+            pixmap = glyphs.pixmaps.get(c)
+            if pixmap is not None and rect.intersects(dirty):
+                painter.drawPixmap(rect.topLeft(), pixmap)
+        painter.end()
+
+    def _focus_path(self) -> QPainterPath:
+        rect = QRectF(self.rect())
+        path = QPainterPath()
+        if self.focus_corner is None:
+            path.addRect(rect)
+            return path
+        path.addRoundedRect(rect, FOCUS_RADIUS, FOCUS_RADIUS)
+        # 除 focus_corner 外的三个角补成直角
+        half_w, half_h = rect.width() / 2, rect.height() / 2
+        corners = {
+            Qt.Corner.TopLeftCorner: QRectF(rect.left(), rect.top(), half_w, half_h),
+            Qt.Corner.TopRightCorner: QRectF(rect.left() + half_w, rect.top(), half_w, half_h),
+            Qt.Corner.BottomLeftCorner: QRectF(rect.left(), rect.top() + half_h, half_w, half_h),
+            Qt.Corner.BottomRightCorner: QRectF(rect.left() + half_w, rect.top() + half_h, half_w, half_h),
+        }
+        for corner, square in corners.items():
+            if corner != self.focus_corner:
+                square_path = QPainterPath()
+                square_path.addRect(square)
+                path = path.united(square_path)
+        return path
+
+    def focusInEvent(self, event) -> None:
+        super().focusInEvent(event)
+        self.update()
+
+    def focusOutEvent(self, event) -> None:
+        super().focusOutEvent(event)
+        self.update()
+    # endregion 绘制
+
+    # region 交互
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        if TRACE.debug_on:
+            trace_key_event('DigitDisplay.keyPressEvent', event)
+        if not self.is_edit_allowed:
+            self.refresh_display()
+            return
+        if event.key() == Qt.Key.Key_Escape:
+            self.clearFocus()
+        elif event.key() in DIGIT_KEYS:
+            self.setText(f'{self._text}{chr(event.key())}'[-2:].rjust(self.max_length, '0'))
+            return
+        elif event.key() == Qt.Key.Key_Backspace:
+            self.setText(f'{int(self._text[:-1] or 0):02}')
+            return
+        super().keyPressEvent(event)
+
+    def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
+        self.refresh_display()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if TRACE.debug_on:
+            TRACE.debug('DigitDisplay.mousePressEvent', 'button=%s is_edit_allowed=%s', int(event.button()),
+                        self.is_edit_allowed)
+        self.refresh_display()
+        if self.is_edit_allowed and event.button() in {Qt.MouseButton.LeftButton, Qt.MouseButton.RightButton}:
+            self.setFocus()
+    # endregion 交互
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QGuiApplication, QIcon, QPixmap
+
+# 控件上图标的逻辑尺寸 (控制按钮在两种布局下的 iconSize)，每个尺寸按设备像素比渲染一份
+ICON_SIZES = (40, 50)
+
+
+class IconRegistry:
+    """ 图标注册表：每个图片在每种设备像素比下只解码一次，所有控件共享同一个 QIcon
+    QIcon 中按 ICON_SIZES 的每个逻辑尺寸放一份 size * dpr 像素的图片，高 DPI 屏幕上显示为原尺寸且清晰
+    缓存有上限，超过后淘汰最久未使用的图标
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[str, float], QIcon]' = OrderedDict()
+        self.load_count = 0
+
+    @staticmethod
+    def device_pixel_ratio() -> float:
+        app = QGuiApplication.instance()
+        return app.devicePixelRatio() if app is not None else 1.0
+
+    def icon(self, path: str, dpr: Optional[float] = None) -> QIcon:
+        dpr = self.device_pixel_ratio() if dpr is None else dpr
+        key = (path, dpr)
+        icon = self._cache.get(key)
+        if icon is not None:
+            self._cache.move_to_end(key)
+            return icon
+        source = QPixmap(path)
+        icon = QIcon()
+        for size in ICON_SIZES:
+            pixmap = source.scaled(
+                QSize(round(size * dpr), round(size * dpr)), Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation)
+            pixmap.setDevicePixelRatio(dpr)
+            icon.addPixmap(pixmap)
+        self.load_count += 1
+        self._cache[key] = icon
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return icon
+
+    def warm_up(self, paths: Iterable[str], dpr: Optional[float] = None) -> None:
+        """ 预先解码图标，避免第一次点击时才读盘 """
+        for path in paths:
+            self.icon(path, dpr)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+ICON_REGISTRY = IconRegistry()
@@ -0,0 +1,80 @@
+import operator
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+
+T = TypeVar('T')
+
+WHEEL_UNITS_PER_STEP = 120  # QWheelEvent.angleDelta 一格为 120 (15° × 8)
+
+
+class WheelAccumulator:
+    """ 把 angleDelta 累积为整格
+    普通鼠标每个事件正好一格；高精度滚轮和触控板一次手势发来几十个小增量，累积满一格才算一步，余数留到下一次
+    反向滚动时丢弃旧方向的余数，避免回滚时先要抵消之前的残留
+    """
+
+    def __init__(self, units_per_step: int = WHEEL_UNITS_PER_STEP) -> None:
+        self.units_per_step = units_per_step
+        self.residual = 0
+
+    def add(self, delta: int) -> int:
+        """ 累积一次增量，返回凑满的整格数 (带符号) """
+        if delta == 0:
+            return 0
+        if (delta > 0) != (self.residual > 0) and self.residual != 0:
+            self.residual = 0
+        total = self.residual + delta
+        steps = abs(total) // self.units_per_step * (1 if total > 0 else -1)
+        self.residual = total - steps * self.units_per_step
+        return steps
+
+    def reset(self) -> None:
+        self.residual = 0
+
+
+class FrameCoalescer(QObject, Generic[T]):
+    """ 把输入事件按帧合并：同一 key 的值用 merge 合并，每帧最多调用一次 flush
+    空闲时第一个事件立即处理，不增加延迟；之后一帧之内到达的事件合并到下一帧一起处理
+    """
+
+    def __init__(self, flush: Callable[[Dict[Hashable, T]], None], merge: Callable[[T, T], T] = operator.add,
+                 interval_ms: Optional[int] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._flush = flush
+        self._merge = merge
+        self.pending: Dict[Hashable, T] = {}
+        self.flush_count = 0
+        self.push_count = 0
+        if interval_ms is None:
+            from progress_strip import FrameDriver
+            interval_ms = max(int(1000 / FrameDriver.instance().refresh_rate()), 1)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_frame)
+
+    def push(self, key: Hashable, value: T) -> None:
+        self.push_count += 1
+        if key in self.pending:
+            self.pending[key] = self._merge(self.pending[key], value)
+        else:
+            self.pending[key] = value
+        if not self._timer.isActive():
+            self.flush()
+
+    def flush(self) -> None:
+        """ 立即处理已合并的输入，并开始一帧的冷却 """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        self.flush_count += 1
+        self._timer.start()
+        self._flush(pending)
+
+    def discard(self) -> None:
+        self.pending.clear()
+
+    def _on_frame(self) -> None:
+        self.flush()
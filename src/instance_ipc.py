@@ -0,0 +1,246 @@
+""" 单实例与本地控制接口
+
+第一个启动的进程在本地套接字 (Windows 命名管道 / Unix domain socket) 上监听，之后的启动把命令行参数转发给它后立即退出
+协议为 JSON Lines：每行一个请求对象，或一个请求数组 (批量，一次往返)，响应与请求一一对应
+
+    {"id": 1, "cmd": "start", "args": {"minutes": 25}}
+    [{"cmd": "add-seconds", "args": {"seconds": 30}}, {"cmd": "query"}]
+
+客户端只用标准库，转发参数时不需要导入 PyQt5；服务端在 Qt 事件循环中运行
+"""
+import getpass
+import json
+import os
+import platform
+import re
+import socket
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional, Union
+
+SERVER_NAME = 'pyqttimer'
+ENCODING = 'utf-8'
+PROBE_TIMEOUT_MS = 500
+USAGE = ('usage: window_1_timer.py [--start [minutes]] [--cycle [25/5/25/5/25/15]] [--pause] [--resume] [--reset]'
+         ' [--add-seconds seconds] [--query]')
+
+Request = Dict
+Response = Dict
+CommandHandler = Callable[..., Optional[Dict]]
+
+
+class CommandError(Exception):
+    """ 命令无法执行，错误信息原样返回给客户端 """
+
+
+def server_name(name: str = SERVER_NAME) -> str:
+    """ 按用户区分的服务名，多用户同时登录时互不干扰 """
+    return f'{name}-{re.sub(r"[^A-Za-z0-9_.-]", "_", getpass.getuser())}'
+
+
+def server_address(name: str = SERVER_NAME) -> str:
+    """ QLocalServer.listen 使用的地址：Windows 为管道名，其他平台为临时目录下的套接字文件 """
+    if platform.system() == 'Windows':
+        return server_name(name)
+    return os.path.join(tempfile.gettempdir(), f'{server_name(name)}.sock')
+
+
+# region 协议
+def dispatch(handlers: Dict[str, CommandHandler], request: Request) -> Response:
+    response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+    try:
+        if not isinstance(request, dict) or not isinstance(request.get('cmd'), str):
+            raise CommandError('request must be an object with a "cmd" string')
+        handler = handlers.get(request['cmd'])
+        if handler is None:
+            raise CommandError(f'unknown command: {request["cmd"]}')
+        args = request.get('args') or {}
+        if not isinstance(args, dict):
+            raise CommandError('"args" must be an object')
+        response.update(ok=True, result=handler(**args))
+    except (CommandError, TypeError, ValueError) as e:
+        response.update(ok=False, error=str(e))
+    return response
+
+
+def handle_line(handlers: Dict[str, CommandHandler], line: bytes) -> bytes:
+    """ 处理一行请求 (单个或批量)，返回一行响应 """
+    try:
+        payload = json.loads(line)
+    except ValueError as e:
+        return _encode({'id': None, 'ok': False, 'error': f'invalid json: {e}'})
+    if isinstance(payload, list):
+        return _encode([dispatch(handlers, request) for request in payload])
+    return _encode(dispatch(handlers, payload))
+
+
+def _encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode(ENCODING) + b'\n'
+
+
+def parse_argv(argv: List[str]) -> List[Request]:
+    """ 命令行参数转为命令，按出现顺序
+    --start [分钟]  --cycle [25/5/25/5/25/15]  --pause  --resume  --reset  --add-seconds 秒数  --query
+    其余参数忽略；没有命令时返回 [activate]，把已运行的窗口提到前台；参数值不合法时抛出 ValueError
+    """
+    commands: List[Request] = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        value = argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith('--') else None
+        if arg == '--start':
+            commands.append({'cmd': 'start', 'args': {} if value is None else {'minutes': _int_arg(arg, value)}})
+            i += value is not None
+        elif arg == '--cycle':
+            commands.append({'cmd': 'cycle', 'args': {} if value is None else {'schedule': value}})
+            i += value is not None
+        elif arg == '--add-seconds':
+            if value is None:
+                raise ValueError('--add-seconds requires a number of seconds')
+            commands.append({'cmd': 'add-seconds', 'args': {'seconds': _int_arg(arg, value)}})
+            i += 1
+        elif arg in ('--pause', '--resume', '--reset', '--query'):
+            commands.append({'cmd': arg[2:]})
+        i += 1
+    return commands or [{'cmd': 'activate'}]
+
+
+def _int_arg(arg: str, value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{arg} expects an integer, got {value!r}') from None
+# endregion 协议
+
+
+class InstanceClient:
+    """ 连接已运行实例的客户端，连接保持打开，可多次调用 """
+
+    def __init__(self, name: str = SERVER_NAME, timeout_s: float = 2.0) -> None:
+        address = server_address(name)
+        if platform.system() == 'Windows':
+            self._pipe = open(rf'\\.\pipe\{address}', 'r+b', buffering=0)
+            self._sock = None
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout_s)
+            try:
+                self._sock.connect(address)
+            except OSError:
+                self._sock.close()
+                raise
+            self._pipe = self._sock.makefile('rwb', buffering=0)
+        self._id = 0
+
+    def call(self, commands: Union[Request, List[Request]]) -> Union[Response, List[Response]]:
+        """ 发送一个或一批命令，等待对应的响应 """
+        batch = commands if isinstance(commands, list) else [commands]
+        for command in batch:
+            self._id += 1
+            command.setdefault('id', self._id)
+        self._pipe.write(_encode(batch if isinstance(commands, list) else commands))
+        line = self._pipe.readline()
+        if not line:
+            raise ConnectionError('instance closed the connection')
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise ConnectionError(f'invalid response from instance: {e}') from None
+
+    def close(self) -> None:
+        self._pipe.close()
+        if self._sock is not None:
+            self._sock.close()
+
+    def __enter__(self) -> 'InstanceClient':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def forward_argv(argv: List[str], name: str = SERVER_NAME, timeout_s: float = 2.0) -> Optional[List[Response]]:
+    """ 有实例在运行时把参数转发过去并返回响应；没有实例或实例没有响应时返回 None，由调用方自己成为服务端
+    参数不合法时在连接之前抛出 ValueError，由调用方提示用法
+    """
+    commands = parse_argv(argv)
+    try:
+        with InstanceClient(name, timeout_s) as client:
+            return client.call(commands)
+    except OSError:  # 连接失败、对方卡住超时 (socket.timeout)、中途断开
+        return None
+
+
+def forward_and_report(argv: List[str], name: str = SERVER_NAME) -> Optional[int]:
+    """ 命令行入口：把参数转发给已运行的实例，响应逐行打印到 stdout，返回进程退出码
+    没有可用的实例时返回 None；参数不合法时在 stderr 提示用法并返回 2
+    """
+    try:
+        forwarded = forward_argv(argv, name)
+    except ValueError as e:
+        if sys.stderr is not None:
+            print(f'error: {e}\n{USAGE}', file=sys.stderr)
+        return 2
+    if forwarded is None:
+        return None
+    if sys.stdout is not None:
+        for response in forwarded:
+            print(json.dumps(response, ensure_ascii=False))
+    return 0 if all(response['ok'] for response in forwarded) else 1
+
+
+class InstanceServer:
+    """ 在 Qt 事件循环中处理本地连接，每收到一行就在主线程上执行对应命令并立即回写
+    QtNetwork 在这里才导入，只转发参数的第二个进程不加载它
+    """
+
+    def __init__(self, handlers: Dict[str, CommandHandler], name: str = SERVER_NAME, parent=None) -> None:
+        from PyQt5.QtNetwork import QLocalServer
+
+        self.handlers = handlers
+        self.address = server_address(name)
+        self.server = QLocalServer(parent)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        """ 开始监听；地址被占用时先尝试连接，连不上才是上一次异常退出残留的套接字文件，清理后重试
+        连得上说明另一个实例刚刚开始监听 (两个进程几乎同时启动)，不抢占它的地址，返回 False
+        """
+        from PyQt5.QtNetwork import QAbstractSocket, QLocalServer
+
+        if self.server.listen(self.address):
+            return True
+        if self.server.serverError() != QAbstractSocket.SocketError.AddressInUseError or self.is_address_alive():
+            return False
+        QLocalServer.removeServer(self.address)
+        return self.server.listen(self.address)
+
+    def is_address_alive(self) -> bool:
+        """ 地址上是否有进程在接受连接 """
+        from PyQt5.QtNetwork import QLocalSocket
+
+        probe = QLocalSocket()
+        probe.connectToServer(self.address)
+        alive = probe.waitForConnected(PROBE_TIMEOUT_MS)
+        probe.abort()
+        return alive
+
+    def error_string(self) -> str:
+        return self.server.errorString()
+
+    def close(self) -> None:
+        self.server.close()
+
+    def _on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            conn = self.server.nextPendingConnection()
+            conn.readyRead.connect(lambda conn=conn: self._on_ready_read(conn))
+            conn.disconnected.connect(conn.deleteLater)
+
+    def _on_ready_read(self, conn) -> None:
+        while conn.canReadLine():
+            line = bytes(conn.readLine())
+            if line.strip():
+                conn.write(handle_line(self.handlers, line))
+        conn.flush()
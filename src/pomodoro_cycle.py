@@ -0,0 +1,95 @@
+import bisect
+import itertools
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_SCHEDULE = '25/5/25/5/25/15'
+
+
+class PhaseKindEnum(str, Enum):
+    FOCUS = 'focus'
+    SHORT_BREAK = 'short_break'
+    LONG_BREAK = 'long_break'
+
+
+@dataclass(frozen=True)
+class Phase:
+    kind: PhaseKindEnum
+    ms: int
+
+
+class PomodoroCycle:
+    """ 番茄钟循环：创建时一次算好所有阶段的累计结束偏移，之后按已过时长二分查找所在阶段
+    阶段之间首尾相接，下一阶段的开始时刻就是上一阶段的结束时刻，整个循环只有一个时间原点，切换阶段不会累积误差
+    """
+
+    def __init__(self, phases: Iterable[Phase]) -> None:
+        self.phases: Tuple[Phase, ...] = tuple(phases)
+        if not self.phases:
+            raise ValueError('a cycle needs at least one phase')
+        if any(phase.ms <= 0 for phase in self.phases):
+            raise ValueError('phase durations must be positive')
+        # ends_ms[i]：第 i 个阶段结束时距循环开始的毫秒数
+        self.ends_ms: List[int] = list(itertools.accumulate(phase.ms for phase in self.phases))
+
+    def __len__(self) -> int:
+        return len(self.phases)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PomodoroCycle) and self.phases == other.phases
+
+    def __repr__(self) -> str:
+        return f'PomodoroCycle({self.spec()!r})'
+
+    @property
+    def ms_total(self) -> int:
+        return self.ends_ms[-1]
+
+    def start_ms(self, index: int) -> int:
+        return self.ends_ms[index - 1] if index > 0 else 0
+
+    def end_ms(self, index: int) -> int:
+        return self.ends_ms[index]
+
+    def locate(self, ms_elapsed: int) -> Optional[Tuple[int, int]]:
+        """ 循环开始后 ms_elapsed 毫秒所在的 (阶段序号, 阶段内已过毫秒)，整个循环已结束时返回 None """
+        index = bisect.bisect_right(self.ends_ms, max(ms_elapsed, 0))
+        if index >= len(self.phases):
+            return None
+        return index, max(ms_elapsed, 0) - self.start_ms(index)
+
+    # region 构造与持久化
+    @classmethod
+    def from_minutes(cls, minutes: Sequence[int]) -> 'PomodoroCycle':
+        """ 专注与休息交替，第一个阶段为专注；比最短休息更长的休息视为长休息 """
+        breaks = minutes[1::2]
+        short = min(breaks) if breaks else 0
+        phases = []
+        for i, minute in enumerate(minutes):
+            if i % 2 == 0:
+                kind = PhaseKindEnum.FOCUS
+            else:
+                kind = PhaseKindEnum.LONG_BREAK if minute > short else PhaseKindEnum.SHORT_BREAK
+            phases.append(Phase(kind, int(minute) * 60 * 1000))
+        return cls(phases)
+
+    @classmethod
+    def parse(cls, spec: str = DEFAULT_SCHEDULE) -> 'PomodoroCycle':
+        """ '25/5/25/5/25/15' 形式的分钟序列 """
+        try:
+            minutes = [int(part) for part in spec.replace(',', '/').split('/') if part.strip()]
+        except ValueError:
+            raise ValueError(f'invalid cycle schedule: {spec!r}') from None
+        return cls.from_minutes(minutes)
+
+    def spec(self) -> str:
+        return '/'.join(f'{phase.ms / 60000:g}' for phase in self.phases)
+
+    def to_dict(self) -> Dict:
+        return {'phases': [[phase.kind.value, phase.ms] for phase in self.phases]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PomodoroCycle':
+        return cls(Phase(PhaseKindEnum(kind), int(ms)) for kind, ms in data['phases'])
+    # endregion 构造与持久化
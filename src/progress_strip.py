@@ -0,0 +1,218 @@
+import weakref
+from typing import Optional, Protocol
+
+from PyQt5.QtCore import QCoreApplication, QObject, QRect, QRectF, QSize, Qt, QTimer
+from PyQt5.QtGui import QGuiApplication, QPainter, QPainterPath, QPaintEvent
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+from simple_timer import DEFAULT_CLOCK, NS_PER_MS, NS_PER_SEC, Clock
+from tick_scheduler import ns_to_next_step
+from timer_style import DEFAULT_THEME, TimerTheme, qcolor
+
+
+class FrameClient(Protocol):
+    def on_frame(self) -> Optional[int]:
+        """ 绘制一帧，返回下一次需要绘制的时刻 (ns)，None 表示动画结束 """
+        ...
+
+
+class FrameDriver(QObject):
+    """ 应用级动画驱动：所有动画共用一个按显示器刷新率对齐的单次 QTimer
+    每帧询问各动画下一次可见变化的时刻，最早的变化还远于一帧时直接睡到那一帧，没有动画时完全停止
+    """
+    _instance: Optional['FrameDriver'] = None
+
+    def __init__(self, clock: Clock = DEFAULT_CLOCK, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.clock = clock
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.dispatch)
+        self._clients: 'weakref.WeakSet[FrameClient]' = weakref.WeakSet()
+        self.ns_frame = NS_PER_SEC // 60
+        self.frame_count = 0
+
+    @classmethod
+    def instance(cls) -> 'FrameDriver':
+        if cls._instance is None:
+            cls._instance = cls(parent=QCoreApplication.instance())
+        return cls._instance
+
+    def refresh_rate(self) -> float:
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return rate if rate >= 10 else 60.0
+
+    def start(self, client: FrameClient) -> None:
+        """ 动画开始或状态变化，下一帧绘制 """
+        self._clients.add(client)
+        if not self._timer.isActive():
+            self.ns_frame = int(NS_PER_SEC / self.refresh_rate())
+            self._timer.start(0)
+        elif self._timer.remainingTime() * NS_PER_MS > self.ns_frame:
+            self._timer.start(0)  # 正在等待较远的一帧，新的动画状态可能更早需要绘制
+
+    def stop(self, client: FrameClient) -> None:
+        self._clients.discard(client)
+        if not self._clients:
+            self._timer.stop()
+
+    def dispatch(self) -> None:
+        self.frame_count += 1
+        ns_next = None
+        for client in list(self._clients):
+            ns_client = client.on_frame()
+            if ns_client is None:
+                self._clients.discard(client)
+            elif ns_next is None or ns_client < ns_next:
+                ns_next = ns_client
+        if ns_next is None:
+            return
+        # 至少间隔一帧，远于一帧的变化按帧周期向上取整
+        ns_delay = max(ns_next - self.clock.now_ns(), self.ns_frame)
+        frames = -(-ns_delay // self.ns_frame)
+        self._timer.start(max(frames * self.ns_frame // NS_PER_MS, 1))
+
+
+class ProgressStrip(QWidget):
+    """ 自绘的倒计时进度条，替代 QProgressBar
+    - 只记录锚点 (时刻, 剩余纳秒, 是否运行)，每帧按时间线性插值，不依赖计时器的刷新频率
+    - 填充宽度按设备像素量化，只有跨过一个设备像素时才重绘新旧边界之间的区域
+    - 暂停、重置、控件隐藏时退出 FrameDriver，不再唤醒
+    """
+
+    def __init__(self, clock: Clock = DEFAULT_CLOCK, theme: TimerTheme = DEFAULT_THEME, radius: int = 12,
+                 driver: Optional[FrameDriver] = None, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.clock = clock
+        self.driver = driver
+        self.radius = radius
+        self.color_track = qcolor(theme.color_track)
+        self.color_chunk = qcolor(theme.color_chunk)
+        self._ns_anchor = 0
+        self._ns_remain = 0
+        self._ns_total = 0
+        self._running = False
+        # 所在窗口最小化或被遮挡时由外部设置，暂停逐帧动画
+        self.suspended = False
+        # 当前已绘制的填充宽度 (设备像素)，None 表示处于 reset 状态，只画底色
+        self._filled: Optional[int] = None
+        self._clip: Optional[QPainterPath] = None
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+    def frame_driver(self) -> FrameDriver:
+        if self.driver is None:
+            self.driver = FrameDriver.instance()
+        return self.driver
+
+    # region 状态
+    def set_progress(self, ns_remain: int, ns_total: int, running: bool, ns_now: Optional[int] = None) -> bool:
+        """ 更新锚点，返回是否需要重绘 """
+        self._ns_anchor = self.clock.now_ns() if ns_now is None else ns_now
+        self._ns_remain = ns_remain
+        self._ns_total = ns_total
+        self._running = running
+        changed = self._repaint_fill(self.filled_at(self._ns_anchor))
+        if running and self.isVisible() and not self.suspended:
+            self.frame_driver().start(self)
+        elif self.driver is not None:
+            self.driver.stop(self)
+        return changed
+
+    def set_suspended(self, suspended: bool) -> None:
+        self.suspended = suspended
+        if suspended:
+            if self.driver is not None:
+                self.driver.stop(self)
+        elif self._running and self.isVisible():
+            self.frame_driver().start(self)
+
+    def reset(self) -> bool:
+        self._running = False
+        if self.driver is not None:
+            self.driver.stop(self)
+        if self._filled is None:
+            return False
+        self._filled = None
+        self.update()
+        return True
+
+    def device_width(self) -> int:
+        return max(int(self.width() * self.devicePixelRatioF()), 1)
+
+    def ns_remain_at(self, ns_now: int) -> int:
+        ns_passed = ns_now - self._ns_anchor if self._running else 0
+        return max(self._ns_remain - ns_passed, 0)
+
+    def filled_at(self, ns_now: int) -> int:
+        if self._ns_total <= 0:
+            return 0
+        steps = self.device_width()
+        return min(self.ns_remain_at(ns_now) * steps // self._ns_total, steps)
+    # endregion 状态
+
+    # region 动画与绘制
+    def on_frame(self) -> Optional[int]:
+        if not self._running or self.suspended or not self.isVisible():
+            return None
+        ns_now = self.clock.now_ns()
+        self._repaint_fill(self.filled_at(ns_now))
+        ns_step = ns_to_next_step(self.ns_remain_at(ns_now), self._ns_total, self.device_width())
+        return None if ns_step is None else ns_now + ns_step
+
+    def _repaint_fill(self, filled: int) -> bool:
+        old = self._filled
+        if filled == old:
+            return False
+        self._filled = filled
+        if old is None:
+            self.update()
+            return True
+        dpr = self.devicePixelRatioF()
+        left = int(min(old, filled) / dpr)
+        right = int(max(old, filled) / dpr + 0.999)
+        # 左右各多一个像素，覆盖抗锯齿的圆角边缘
+        self.update(QRect(left - 1, 0, right - left + 2, self.height()))
+        return True
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self._running and not self.suspended:
+            self.frame_driver().start(self)
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        if self.driver is not None:
+            self.driver.stop(self)
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._clip = None
+        if self._filled is not None:
+            self._filled = self.filled_at(self.clock.now_ns())
+
+    def sizeHint(self) -> QSize:
+        return QSize(100, 12)
+
+    def clip_path(self) -> QPainterPath:
+        """ 只有底部两个角是圆角，与上方的数字拼成一个整体 """
+        if self._clip is None:
+            rect = QRectF(self.rect())
+            path = QPainterPath()
+            path.addRoundedRect(rect, self.radius, self.radius)
+            top = QPainterPath()
+            top.addRect(QRectF(rect.left(), rect.top(), rect.width(), rect.height() / 2))
+            self._clip = path.united(top)
+        return self._clip
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setClipPath(self.clip_path(), Qt.ClipOperation.IntersectClip)
+        painter.fillRect(self.rect(), self.color_track)
+        if self._filled:
+            width = self._filled / self.devicePixelRatioF()
+            painter.fillRect(QRectF(0, 0, width, self.height()), self.color_chunk)
+        painter.end()
+    # endregion 动画与绘制
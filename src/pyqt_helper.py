@@ -1,20 +1,50 @@
-from PyQt5.QtCore import Qt
+import time
+from typing import Callable, Optional
+
+from PyQt5.QtCore import Qt, QEvent, QObject, QTimer
 from PyQt5.QtGui import QKeyEvent, QKeySequence
 
+from trace_log import TRACE
+
 
-def print_key_event(msg: str, event: QKeyEvent):
+def format_key(key: int, modifiers: int) -> str:
+    """ 按键的可读名字，如 Ctrl+S、Shift、F11 """
     modifiers_mask = {
-        Qt.KeyboardModifier.AltModifier, Qt.KeyboardModifier.ControlModifier, Qt.KeyboardModifier.MetaModifier,
-        Qt.KeyboardModifier.ShiftModifier
+        int(Qt.KeyboardModifier.AltModifier), int(Qt.KeyboardModifier.ControlModifier),
+        int(Qt.KeyboardModifier.MetaModifier), int(Qt.KeyboardModifier.ShiftModifier)
     }
     keys_mask = {Qt.Key.Key_Alt, Qt.Key.Key_Control, Qt.Key.Key_Meta, Qt.Key.Key_Shift}
-    if event.modifiers() in modifiers_mask:
-        if event.key() not in keys_mask:
-            print(f'{msg} {QKeySequence(int(event.modifiers()) + event.key()).toString()}')
-        else:
-            print(f'{msg} {QKeySequence(int(event.modifiers())).toString()[:-1]}')
-    else:
-        if event.key() not in keys_mask:
-            print(f'{msg} {QKeySequence(event.key()).toString(QKeySequence.SequenceFormat.NativeText)}')
-        else:
-            print(f'{msg} {event.key()}')
+    if modifiers in modifiers_mask:
+        if key not in keys_mask:
+            return QKeySequence(modifiers + key).toString()
+        return QKeySequence(modifiers).toString()[:-1]
+    if key not in keys_mask:
+        return QKeySequence(key).toString(QKeySequence.SequenceFormat.NativeText)
+    return str(key)
+
+
+def trace_key_event(event_name: str, event: QKeyEvent) -> None:
+    """ 记录按键 (DEBUG)；只保存按键值，QKeySequence 名字在 dump 时才生成。调用方先判断 TRACE.debug_on """
+    TRACE.debug(event_name, format_key, event.key(), int(event.modifiers()))
+
+
+class FirstFrameProbe(QObject):
+    """ 记录从 t0_ns 到目标控件第一次绘制完成的耗时 (time.perf_counter_ns 基准) """
+
+    def __init__(self, target: QObject, t0_ns: int, on_first_frame: Callable[[float], None]) -> None:
+        super().__init__(target)
+        self.t0_ns = t0_ns
+        self.on_first_frame = on_first_frame
+        self.elapsed_ms: Optional[float] = None
+        target.installEventFilter(self)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint and self.elapsed_ms is None:
+            obj.removeEventFilter(self)
+            # 排到事件循环里，等这次绘制结束后再计时
+            QTimer.singleShot(0, self._report)
+        return False
+
+    def _report(self) -> None:
+        self.elapsed_ms = (time.perf_counter_ns() - self.t0_ns) / 1e6
+        self.on_first_frame(self.elapsed_ms)
@@ -0,0 +1,137 @@
+""" timer_service 压力测试客户端
+
+python service_load_test.py --spawn --subscribers 2000 --timers 500 --duration 10
+
+建立一个控制连接创建并启动计时器，再建立 subscribers 个订阅连接，统计每个订阅者收到的消息数和推送延迟
+(服务端消息时间戳 t 到客户端收到的墙上时间之差)；--spawn 时在子进程中启动服务
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+HEADER = re.compile(rb'\{"ev":"(\w+)","t":(\d+),')
+
+
+class SubscriberStats:
+    __slots__ = ('messages', 'snapshots', 'latencies_ns')
+
+    def __init__(self) -> None:
+        self.messages = 0
+        self.snapshots = 0
+        self.latencies_ns: List[int] = []
+
+
+async def call(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, commands) -> object:
+    writer.write(json.dumps(commands).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def run_subscriber(host: str, port: int, stats: SubscriberStats, stop: asyncio.Event) -> None:
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 22)
+    response = await call(reader, writer, {'cmd': 'subscribe'})
+    assert response['ok'], response
+    try:
+        while not stop.is_set():
+            try:
+                line = await asyncio.wait_for(reader.readline(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            if not line:
+                break
+            ns_recv = time.time_ns()
+            stats.messages += 1
+            # 只解析消息头 {"ev":"...","t":...,，客户端不成为瓶颈
+            match = HEADER.match(line)
+            if match is None:
+                continue
+            if match.group(1) == b'snapshot':
+                stats.snapshots += 1
+            elif match.group(1) == b'tick':
+                stats.latencies_ns.append(ns_recv - int(match.group(2)))
+    finally:
+        writer.close()
+
+
+async def load_test(args) -> Dict:
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    batch = [
+        {'cmd': 'create', 'args': {'name': f'load-{os.getpid()}-{i}', 'minutes': 1 + i % 30, 'start': True}}
+        for i in range(args.timers)]
+    t0 = time.perf_counter_ns()
+    responses = await call(reader, writer, batch)
+    ns_batch = time.perf_counter_ns() - t0
+    assert all(r['ok'] for r in responses), [r for r in responses if not r['ok']][:3]
+    rtt = []
+    for _ in range(200):
+        t0 = time.perf_counter_ns()
+        await call(reader, writer, {'cmd': 'query', 'args': {'name': batch[0]['args']['name']}})
+        rtt.append(time.perf_counter_ns() - t0)
+
+    stop = asyncio.Event()
+    stats = [SubscriberStats() for _ in range(args.subscribers)]
+    tasks = []
+    for i in range(0, args.subscribers, 200):  # 分批建立连接，避免超过 backlog
+        tasks += [asyncio.ensure_future(run_subscriber(args.host, args.port, s, stop)) for s in stats[i:i + 200]]
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for response in responses:
+        name = next(iter(response['result']))
+        writer.write(json.dumps({'cmd': 'remove', 'args': {'name': name}}).encode() + b'\n')
+    await writer.drain()
+    writer.close()
+
+    latencies = sorted(ns for s in stats for ns in s.latencies_ns)
+    messages = [s.messages for s in stats]
+    return {
+        'subscribers': args.subscribers,
+        'timers': args.timers,
+        'duration_s': args.duration,
+        'create_batch_ms': ns_batch / 1e6,
+        'query_rtt_median_us': statistics.median(rtt) / 1000,
+        'messages_per_subscriber_min': min(messages),
+        'messages_per_subscriber_mean': statistics.fmean(messages),
+        'snapshots_total': sum(s.snapshots for s in stats),
+        'latency_median_ms': latencies[len(latencies) // 2] / 1e6 if latencies else None,
+        'latency_p99_ms': latencies[int(len(latencies) * 0.99)] / 1e6 if latencies else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--timers', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=5.0, help='订阅持续秒数')
+    parser.add_argument('--rate', type=float, default=1.0, help='--spawn 时服务端的推送频率')
+    parser.add_argument('--spawn', action='store_true', help='在子进程中启动 timer_service')
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        service = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'timer_service.py')
+        proc = subprocess.Popen(
+            [sys.executable, service, '--host', args.host, '--port', str(args.port), '--http-port', '0',
+             '--rate', str(args.rate)], stdout=subprocess.PIPE)
+        proc.stdout.readline()  # 等待开始监听
+    try:
+        print(json.dumps(asyncio.run(load_test(args)), indent=2))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
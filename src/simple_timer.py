@@ -1,61 +1,149 @@
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterator, Optional, Protocol
+
+NS_PER_MS = 1_000_000
+NS_PER_SEC = 1_000_000_000
+
+
+class Clock(Protocol):
+    def now_ns(self) -> int:
+        ...
+
+
+class MonotonicClock:
+    """ 单调时钟，不受 NTP 校时、手动改系统时间影响
+    Linux 下优先使用 CLOCK_BOOTTIME，休眠/唤醒期间同样计时，倒计时不会因休眠被拉长
+    """
+    __slots__ = ('_clock_id', )
+
+    def __init__(self) -> None:
+        self._clock_id = getattr(time, 'CLOCK_BOOTTIME', None)
+
+    def now_ns(self) -> int:
+        if self._clock_id is not None:
+            return time.clock_gettime_ns(self._clock_id)
+        return time.monotonic_ns()
+
+
+class VirtualClock:
+    """ 可手动拨动的时钟，用于测试 """
+    __slots__ = ('ns', )
+
+    def __init__(self, ns: int = 0) -> None:
+        self.ns = ns
+
+    def now_ns(self) -> int:
+        return self.ns
+
+    def advance(self, ms: int = 0, ns: int = 0) -> int:
+        self.ns += ms * NS_PER_MS + ns
+        return self.ns
+
+
+DEFAULT_CLOCK = MonotonicClock()
+
+
+def ns_to_ms(ns: int) -> int:
+    """ 纳秒转毫秒，向零取整 (与 int(timedelta.total_seconds() * 1000) 一致) """
+    return ns // NS_PER_MS if ns >= 0 else -(-ns // NS_PER_MS)
 
 
 @dataclass
 class SimpleTimer:
-    dt_start: Optional[datetime] = None
-    dt_stop: Optional[datetime] = None
-    dt_pause_start: Optional[datetime] = field(default_factory=datetime.now)
+    ns_start: Optional[int] = None
+    ns_stop: Optional[int] = None
+    ns_pause_start: Optional[int] = None
+    clock: Clock = field(default=DEFAULT_CLOCK, repr=False, compare=False)
+    # snapshot() 块内的时间快照，块内所有查询共用，避免重复取时间；块外为 None，查询每次重新取时间
+    ns_now: Optional[int] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_duration(cls, ms_total: int, clock: Clock = DEFAULT_CLOCK, ns_now: Optional[int] = None) -> 'SimpleTimer':
+        ns_now = clock.now_ns() if ns_now is None else ns_now
+        return cls(ns_now, ns_now + ms_total * NS_PER_MS, clock=clock)
+
+    def now_ns(self, ns_now: Optional[int] = None) -> int:
+        """ 本次操作的当前时刻：显式给出的时刻，其次是所在 snapshot 块的快照，都没有时取一次时钟 """
+        if ns_now is not None:
+            return ns_now
+        return self.clock.now_ns() if self.ns_now is None else self.ns_now
+
+    @contextmanager
+    def snapshot(self, ns_now: Optional[int] = None) -> Iterator[int]:
+        """ 块内的查询共用同一个时间快照，退出时恢复，快照不会在块外过期
+        嵌套时内层沿用外层的快照，除非显式给出时刻
+        """
+        outer = self.ns_now
+        self.ns_now = self.now_ns(ns_now)
+        try:
+            yield self.ns_now
+        finally:
+            self.ns_now = outer
+
+    def _now(self) -> int:
+        ns_now = self.clock.now_ns() if self.ns_now is None else self.ns_now
+        # 暂停中的计时器停在暂停时刻
+        if self.ns_pause_start is not None and self.ns_pause_start < ns_now:
+            return self.ns_pause_start
+        return ns_now
+
+    def is_paused(self) -> bool:
+        return self.ns_pause_start is not None
 
     def is_time_set(self) -> bool:
-        return self.dt_start is not None and self.dt_stop is not None
+        return self.ns_start is not None and self.ns_stop is not None
 
     def is_time_up(self) -> bool:
         if not self.is_time_set():
             return False
-        return datetime.now() >= self.dt_stop
+        return self._now() >= self.ns_stop
 
     def ms_passed(self) -> int:
         if not self.is_time_set():
             return 0
-        return int((datetime.now() - self.dt_start).total_seconds() * 1000)
+        return ns_to_ms(self._now() - self.ns_start)
 
     def ms_remain(self) -> int:
         if not self.is_time_set():
             return 0
-        return int((self.dt_stop - datetime.now()).total_seconds() * 1000)
+        return ns_to_ms(self.ns_remain())
 
-    def ms_total(self) -> int:
+    def ns_remain(self) -> int:
         if not self.is_time_set():
             return 0
-        return int((self.dt_stop - self.dt_start).total_seconds() * 1000)
+        return self.ns_stop - self._now()
 
-    def pause(self) -> None:
+    def ms_total(self) -> int:
         if not self.is_time_set():
-            return
-        self.dt_pause_start = datetime.now()
-        # print(f'Timer.pause dt_pause_start:{self.dt_pause_start}')
+            return 0
+        return ns_to_ms(self.ns_stop - self.ns_start)
 
-    def reset(self) -> None:
-        # print(f'Timer.reset')
-        if not self.is_time_set():
-            return
-        ms_total = self.ms_total()
-        self.dt_start = datetime.now()
-        self.dt_stop = self.dt_start + timedelta(milliseconds=ms_total)
+    # 以下操作返回本次使用的时刻，调用方接着用它做调度，不再从计时器上读取
+    def pause(self, ns_now: Optional[int] = None) -> int:
+        ns_now = self.now_ns(ns_now)
+        if self.is_time_set() and not self.is_paused():
+            self.ns_pause_start = ns_now
+        return ns_now
 
-    def resume(self) -> None:
-        # print(f'Timer.resume dt_end_old:{self.dt_stop}')
-        if not self.is_time_set():
-            return
-        dt_now = datetime.now()
-        self.dt_pause_start = dt_now if self.dt_pause_start < self.dt_start else self.dt_pause_start
-        timedelta_pause: timedelta = dt_now - self.dt_pause_start
-        self.dt_stop += timedelta_pause
-        self.dt_start += timedelta_pause
-        # print(f'Timer.resume dt_end_new:{self.dt_stop}')
+    def reset(self, ns_now: Optional[int] = None) -> int:
+        ns_now = self.now_ns(ns_now)
+        if self.is_time_set():
+            ns_total = self.ns_stop - self.ns_start
+            self.ns_start = ns_now
+            self.ns_stop = self.ns_start + ns_total
+            self.ns_pause_start = None
+        return ns_now
+
+    def resume(self, ns_now: Optional[int] = None) -> int:
+        ns_now = self.now_ns(ns_now)
+        if self.is_time_set() and self.is_paused():
+            ns_pause = max(ns_now - self.ns_pause_start, 0)
+            self.ns_stop += ns_pause
+            self.ns_start += ns_pause
+            self.ns_pause_start = None
+        return ns_now
 
     def sec_remain(self):
         if not self.is_time_set():
@@ -0,0 +1,166 @@
+import time
+import weakref
+from typing import Optional, Protocol
+
+from PyQt5.QtCore import QCoreApplication, QObject, Qt, QTimer
+
+from deadline_queue import DeadlineQueue
+from simple_timer import DEFAULT_CLOCK, NS_PER_MS, Clock
+from tick_metrics import METRICS
+from tick_scheduler import TickPlan
+
+
+class TickClient(Protocol):
+    def plan_tick(self, ns_now: int) -> Optional[TickPlan]:
+        """ 以 ns_now 为基准返回下一次需要唤醒的时刻，None 表示当前无需唤醒 """
+        ...
+
+    def on_hub_tick(self, ns_now: int) -> None:
+        ...
+
+    def hub_pause(self, ns_now: int) -> bool:
+        ...
+
+    def hub_resume(self, ns_now: int) -> bool:
+        ...
+
+
+class TickHub(QObject):
+    """ 应用级 tick 驱动：所有计时器共用一个单次触发的 QTimer 和同一个时间快照
+    只分发给有待处理 deadline 的计时器，非精确的 deadline 会在 align_ms 内合并为一次唤醒
+    deadline 保存在两个最小堆中 (精确 / 非精确)，设置、取消和取出到期项都是 O(log n)，与计时器总数无关
+    """
+    _instance: Optional['TickHub'] = None
+
+    def __init__(self, clock: Clock = DEFAULT_CLOCK, align_ms: int = 50, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.clock = clock
+        self.align_ns = align_ms * NS_PER_MS
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.dispatch)
+        # 已注册的计时器，不持有强引用，控件销毁后自动移除
+        self._clients: 'weakref.WeakSet[TickClient]' = weakref.WeakSet()
+        # 堆中以弱引用作为 key，计时器销毁时回调 _forget 从堆中移除
+        self._refs: 'weakref.WeakKeyDictionary[TickClient, weakref.ref]' = weakref.WeakKeyDictionary()
+        self._coarse: DeadlineQueue[weakref.ref] = DeadlineQueue()
+        self._precise: DeadlineQueue[weakref.ref] = DeadlineQueue()
+        self._dispatching = False
+        # 最近一次设置定时器的目标时刻和精度，用于统计实际触发的偏差
+        self._ns_armed: Optional[int] = None
+        self._armed_precise = False
+
+    @classmethod
+    def instance(cls) -> 'TickHub':
+        if cls._instance is None:
+            cls._instance = cls(parent=QCoreApplication.instance())
+        return cls._instance
+
+    def register(self, client: TickClient) -> None:
+        self._clients.add(client)
+
+    def unregister(self, client: TickClient) -> None:
+        self._clients.discard(client)
+        ref = self._refs.pop(client, None)
+        if ref is not None:
+            self._forget(ref)
+        self._arm()
+
+    def is_active(self, client: TickClient) -> bool:
+        ref = self._refs.get(client)
+        return ref is not None and (ref in self._coarse or ref in self._precise)
+
+    def active_count(self) -> int:
+        return len(self._coarse) + len(self._precise)
+
+    def _ref(self, client: TickClient) -> weakref.ref:
+        ref = self._refs.get(client)
+        if ref is None:
+            ref = self._refs[client] = weakref.ref(client, self._forget)
+        return ref
+
+    def _forget(self, ref: weakref.ref) -> None:
+        self._coarse.cancel(ref)
+        self._precise.cancel(ref)
+
+    def reschedule(self, client: TickClient, ns_now: Optional[int] = None) -> None:
+        """ 计时器状态变化后调用，重新计算其下一次唤醒时刻 """
+        ns_now = self.clock.now_ns() if ns_now is None else ns_now
+        self._plan(client, ns_now)
+        self._arm()
+
+    def _plan(self, client: TickClient, ns_now: int) -> None:
+        plan = client.plan_tick(ns_now)
+        ref = self._ref(client)
+        if plan is None:
+            self._forget(ref)
+            return
+        queue, other = (self._precise, self._coarse) if plan.precise else (self._coarse, self._precise)
+        other.cancel(ref)
+        queue.schedule(ref, ns_now + plan.delay_ms * NS_PER_MS)
+
+    def _arm(self) -> None:
+        if self._dispatching:
+            return
+        ns_coarse, ns_precise = self._coarse.peek(), self._precise.peek()
+        if ns_coarse is None and ns_precise is None:
+            self._timer.stop()
+            self._ns_armed = None
+            return
+        if ns_coarse is None or (ns_precise is not None and ns_precise <= ns_coarse):
+            ns_target, precise = ns_precise, True
+        else:
+            # 合并 align 窗口内的显示刷新，窗口内如有精确 deadline 则以它为准 (同一时刻也按精确定时)
+            ns_target, precise = self._coarse.latest_before(ns_coarse + self.align_ns), False
+            if ns_precise is not None and ns_precise <= ns_target:
+                ns_target, precise = ns_precise, True
+        self._ns_armed, self._armed_precise = ns_target, precise
+        ns_delay = max(ns_target - self.clock.now_ns(), 0)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer if precise else Qt.TimerType.CoarseTimer)
+        self._timer.start(-(-ns_delay // NS_PER_MS))
+
+    def dispatch(self, ns_now: Optional[int] = None) -> None:
+        """ 用同一个时间快照处理所有到期的计时器 """
+        if ns_now is None:
+            ns_now = self.clock.now_ns()
+            if METRICS.enabled and self._ns_armed is not None:
+                # 定时器触发时刻与计划时刻之差：事件循环繁忙时为正
+                name = 'hub.jitter.precise' if self._armed_precise else 'hub.jitter.coarse'
+                METRICS.record(name, ns_now - self._ns_armed)
+        t0 = time.perf_counter_ns() if METRICS.enabled else 0
+        due = self._precise.pop_due(ns_now) + self._coarse.pop_due(ns_now)
+        self._dispatching = True
+        try:
+            for ref in due:
+                client = ref()
+                if client is None:
+                    continue
+                client.on_hub_tick(ns_now)
+                self._plan(client, ns_now)
+        finally:
+            self._dispatching = False
+        self._arm()
+        if t0:
+            METRICS.record('hub.dispatch', time.perf_counter_ns() - t0)
+
+    def pause_all(self) -> int:
+        """ 以同一时刻暂停所有运行中的计时器，返回暂停的个数 """
+        return self._apply_all('hub_pause')
+
+    def resume_all(self) -> int:
+        """ 以同一时刻继续所有暂停中的计时器，返回继续的个数 """
+        return self._apply_all('hub_resume')
+
+    def _apply_all(self, method: str) -> int:
+        ns_now = self.clock.now_ns()
+        count = 0
+        self._dispatching = True
+        try:
+            for client in list(self._clients):
+                if getattr(client, method)(ns_now):
+                    count += 1
+                self._plan(client, ns_now)
+        finally:
+            self._dispatching = False
+        self._arm()
+        return count
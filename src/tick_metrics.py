@@ -0,0 +1,217 @@
+import functools
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QPoint, Qt, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QLabel, QWidget
+
+# 直方图按 2 的幂划分微秒区间：[0, 1us) [1us, 2us) [2us, 4us) ... 最后一格包含更大的值
+HIST_BUCKETS = 24
+
+
+class RingBuffer:
+    """ 定长环形缓冲区，只保留最近 size 个样本 """
+    __slots__ = ('data', 'size', 'idx', 'count')
+
+    def __init__(self, size: int) -> None:
+        self.data: List[int] = [0] * size
+        self.size = size
+        self.idx = 0
+        self.count = 0
+
+    def append(self, value: int) -> None:
+        self.data[self.idx] = value
+        self.idx = (self.idx + 1) % self.size
+        self.count += 1
+
+    def values(self) -> List[int]:
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.idx:] + self.data[:self.idx]
+
+
+class Series:
+    """ 一项指标：最近样本的环形缓冲区 + 全部样本的直方图，单位纳秒 """
+    __slots__ = ('ring', 'hist', 'count', 'total', 'max')
+
+    def __init__(self, ring_size: int) -> None:
+        self.ring = RingBuffer(ring_size)
+        self.hist = [0] * HIST_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max: Optional[int] = None
+
+    def add(self, ns: int) -> None:
+        self.ring.append(ns)
+        self.hist[min((max(ns, 0) // 1000).bit_length(), HIST_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += ns
+        if self.max is None or ns > self.max:
+            self.max = ns
+
+    def percentile(self, q: float) -> float:
+        """ 最近样本的分位数 (纳秒) """
+        samples = sorted(self.ring.values())
+        if not samples:
+            return 0.0
+        return samples[min(int(len(samples) * q), len(samples) - 1)]
+
+
+def _fmt_ms(ns: float) -> str:
+    return f'{ns / 1e6:8.3f}'
+
+
+def _bucket_label(idx: int) -> str:
+    upper_us = 1 << idx
+    return f'<{upper_us}us' if upper_us < 1000 else f'<{upper_us / 1000:g}ms'
+
+
+class TickMetrics:
+    """ 计时器运行指标：tick 实际与计划时刻的偏差、各处理函数耗时、事件循环延迟
+    关闭时 (默认) 各记录点只多一次属性判断；可用环境变量 PYQTTIMER_METRICS=1 在启动时打开
+    """
+
+    def __init__(self, enabled: bool = False, ring_size: int = 1024) -> None:
+        self.enabled = enabled
+        self.ring_size = ring_size
+        self.series: Dict[str, Series] = {}
+        self.ns_enabled = time.monotonic_ns()
+
+    def set_enabled(self, enabled: bool) -> None:
+        if enabled and not self.enabled:
+            self.ns_enabled = time.monotonic_ns()
+        self.enabled = enabled
+
+    def clear(self) -> None:
+        self.series.clear()
+        self.ns_enabled = time.monotonic_ns()
+
+    def record(self, name: str, ns: int) -> None:
+        if not self.enabled:
+            return
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = Series(self.ring_size)
+        series.add(ns)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """ 装饰器：记录函数耗时到 name """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                t0 = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter_ns() - t0)
+            return wrapper
+        return decorator
+
+    def report(self, with_histogram: bool = True) -> str:
+        """ 文本报告：每项指标的样本数、均值、分位数 (最近 ring_size 个样本) 和直方图 (全部样本)，单位毫秒 """
+        elapsed_s = (time.monotonic_ns() - self.ns_enabled) / 1e9
+        lines = [
+            f'# PyQtTimer metrics  {time.strftime("%Y-%m-%d %H:%M:%S")}  '
+            f'enabled={self.enabled}  window={elapsed_s:.1f}s',
+            f'{"name":<24}{"count":>8}{"mean":>9}{"p50":>9}{"p95":>9}{"p99":>9}{"max":>9}  (ms)',
+        ]
+        for name in sorted(self.series):
+            series = self.series[name]
+            mean = series.total / series.count if series.count else 0
+            lines.append(
+                f'{name:<24}{series.count:>8} {_fmt_ms(mean)} {_fmt_ms(series.percentile(0.5))} '
+                f'{_fmt_ms(series.percentile(0.95))} {_fmt_ms(series.percentile(0.99))} {_fmt_ms(series.max or 0)}')
+        if with_histogram:
+            for name in sorted(self.series):
+                hist = self.series[name].hist
+                cells = [f'{_bucket_label(i)}:{cnt}' for i, cnt in enumerate(hist) if cnt]
+                lines.append(f'hist {name:<19} ' + ' '.join(cells))
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report())
+        return path
+
+
+METRICS = TickMetrics(enabled=os.environ.get('PYQTTIMER_METRICS') == '1')
+
+
+class LoopLagProbe(QObject):
+    """ 事件循环延迟探针：按固定间隔精确定时，记录实际触发比预期晚了多少 (loop.lag) """
+    _instance: Optional['LoopLagProbe'] = None
+
+    def __init__(self, interval_ms: int = 100, metrics: TickMetrics = METRICS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.interval_ns = interval_ms * 1_000_000
+        self.metrics = metrics
+        self.ns_expected = 0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @classmethod
+    def instance(cls) -> 'LoopLagProbe':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def start(self) -> None:
+        if not self._timer.isActive():
+            self.ns_expected = time.monotonic_ns() + self.interval_ns
+            self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _on_timeout(self) -> None:
+        if not self.metrics.enabled:
+            self.stop()
+            return
+        ns_now = time.monotonic_ns()
+        self.metrics.record('loop.lag', max(ns_now - self.ns_expected, 0))
+        self.ns_expected = ns_now + self.interval_ns
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """ 打开或关闭指标记录，同时启停事件循环延迟探针 """
+    METRICS.set_enabled(enabled)
+    if enabled:
+        LoopLagProbe.instance().start()
+    elif LoopLagProbe._instance is not None:
+        LoopLagProbe._instance.stop()
+
+
+class MetricsOverlay(QLabel):
+    """ 指标浮窗，显示时每 refresh_ms 刷新一次，隐藏时不占用任何定时器 """
+
+    def __init__(self, anchor: QWidget, refresh_ms: int = 500) -> None:
+        super().__init__(anchor, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint)
+        self.anchor = anchor
+        self.setFont(QFont('Consolas', 9))
+        self.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.setStyleSheet('QLabel { background: rgba(0, 0, 0, 200); color: white; padding: 6px; }')
+        self._timer = QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self.refresh)
+
+    def refresh(self) -> None:
+        self.setText(METRICS.report(with_histogram=False).rstrip('\n'))
+        self.adjustSize()
+
+    def toggle(self) -> None:
+        if self.isVisible():
+            self._timer.stop()
+            self.hide()
+            return
+        enable_metrics(True)
+        self.refresh()
+        self.move(self.anchor.mapToGlobal(QPoint(0, self.anchor.height())))
+        self.show()
+        self._timer.start()
@@ -0,0 +1,44 @@
+from typing import NamedTuple, Optional
+
+from simple_timer import NS_PER_MS, NS_PER_SEC, SimpleTimer
+
+
+class TickPlan(NamedTuple):
+    delay_ms: int
+    # True: 下一次唤醒是倒计时结束，需要精确定时；False: 只是刷新显示，可用粗略定时
+    precise: bool
+
+
+def ns_to_next_second(ns_remain: int) -> int:
+    """ 距离 mm:ss 显示变化的纳秒数，显示值为 ns_remain 向下取整到秒 """
+    return ns_remain % NS_PER_SEC + 1
+
+
+def ns_to_next_step(ns_remain: int, ns_total: int, steps: int) -> Optional[int]:
+    """ 距离进度条下一个像素变化的纳秒数，进度条显示 floor(ns_remain * steps / ns_total) 个像素 """
+    if steps <= 0 or ns_total <= 0:
+        return None
+    step = ns_remain * steps // ns_total
+    if step <= 0:
+        return None
+    ns_remain_next = (step * ns_total - 1) // steps
+    return ns_remain - ns_remain_next
+
+
+def plan_next_tick(timer: SimpleTimer, progress_steps: int = 0) -> Optional[TickPlan]:
+    """ 计算下一次需要刷新界面的时刻：下一秒边界、进度条下一个像素，或倒计时结束
+    使用 timer 当前的时间快照，返回 None 表示无需再唤醒
+    """
+    if not timer.is_time_set() or timer.is_paused():
+        return None
+    ns_remain = timer.ns_remain()
+    if ns_remain <= 0:
+        return TickPlan(0, True)
+    ns_delay = ns_to_next_second(ns_remain)
+    ns_step = ns_to_next_step(ns_remain, timer.ns_stop - timer.ns_start, progress_steps)
+    if ns_step is not None and ns_step < ns_delay:
+        ns_delay = ns_step
+    if ns_remain <= ns_delay:
+        # 倒计时结束早于下一次显示变化，精确定时到结束时刻
+        return TickPlan(-(-ns_remain // NS_PER_MS), True)
+    return TickPlan(-(-ns_delay // NS_PER_MS), False)
@@ -0,0 +1,192 @@
+from typing import List, Optional
+
+import numpy as np
+
+from simple_timer import DEFAULT_CLOCK, NS_PER_MS, NS_PER_SEC, Clock, SimpleTimer
+
+# int64 数组中表示 None (未设置 / 未暂停)
+UNSET = np.iinfo(np.int64).min
+
+
+def _to_ns(value: Optional[int]) -> int:
+    return UNSET if value is None else value
+
+
+def _from_ns(value) -> Optional[int]:
+    value = int(value)
+    return None if value == UNSET else value
+
+
+class TimerBank:
+    """ 大量计时器的紧凑存储：开始、结束、暂停时刻各是一个连续的 int64 数组，每个计时器占一个槽位
+    剩余时间、进度、是否结束都可以对全部 (或指定的) 槽位一次向量化计算，语义与 SimpleTimer 相同
+    """
+
+    def __init__(self, capacity: int = 64, clock: Clock = DEFAULT_CLOCK) -> None:
+        self.clock = clock
+        self.ns_start = np.full(capacity, UNSET, dtype=np.int64)
+        self.ns_stop = np.full(capacity, UNSET, dtype=np.int64)
+        self.ns_pause_start = np.full(capacity, UNSET, dtype=np.int64)
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self.ns_start) - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.ns_start)
+
+    # region 槽位
+    def allocate(self, ms_total: Optional[int] = None, ns_now: Optional[int] = None) -> int:
+        """ 分配一个槽位，给出 ms_total 时与 SimpleTimer.from_duration 一样从 ns_now 开始计时 """
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self.ns_pause_start[slot] = UNSET
+        if ms_total is None:
+            self.ns_start[slot] = self.ns_stop[slot] = UNSET
+        else:
+            ns_now = self.clock.now_ns() if ns_now is None else ns_now
+            self.ns_start[slot] = ns_now
+            self.ns_stop[slot] = ns_now + ms_total * NS_PER_MS
+        return slot
+
+    def release(self, slot: int) -> None:
+        self.ns_start[slot] = self.ns_stop[slot] = self.ns_pause_start[slot] = UNSET
+        self._free.append(slot)
+
+    def view(self, slot: int, ns_now: Optional[int] = None) -> 'BankTimer':
+        return BankTimer(self, slot, ns_now)
+
+    def _grow(self) -> None:
+        old = self.capacity
+        new = max(old * 2, 16)
+        for name in ('ns_start', 'ns_stop', 'ns_pause_start'):
+            arr = np.full(new, UNSET, dtype=np.int64)
+            arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+        self._free.extend(range(new - 1, old - 1, -1))
+    # endregion 槽位
+
+    # region 向量化计算
+    def _select(self, slots):
+        if slots is None:
+            return self.ns_start, self.ns_stop, self.ns_pause_start
+        slots = np.asarray(slots, dtype=np.intp)
+        return self.ns_start[slots], self.ns_stop[slots], self.ns_pause_start[slots]
+
+    def _effective_now(self, ns_now: Optional[int], ns_pause_start):
+        """ 每个计时器的当前时刻，暂停中的停在暂停时刻 (同 SimpleTimer._now) """
+        ns_now = self.clock.now_ns() if ns_now is None else ns_now
+        paused = (ns_pause_start != UNSET) & (ns_pause_start < ns_now)
+        return np.where(paused, ns_pause_start, ns_now)
+
+    def ns_remain(self, ns_now: Optional[int] = None, slots=None):
+        ns_start, ns_stop, ns_pause_start = self._select(slots)
+        is_set = (ns_start != UNSET) & (ns_stop != UNSET)
+        ns_remain = ns_stop - self._effective_now(ns_now, ns_pause_start)
+        return np.where(is_set, ns_remain, 0)
+
+    def ms_remain(self, ns_now: Optional[int] = None, slots=None):
+        """ 剩余毫秒数，向零取整 (同 ns_to_ms) """
+        ns_remain = self.ns_remain(ns_now, slots)
+        return np.where(ns_remain >= 0, ns_remain // NS_PER_MS, -(-ns_remain // NS_PER_MS))
+
+    def sec_remain(self, ns_now: Optional[int] = None, slots=None):
+        return np.maximum(self.ms_remain(ns_now, slots) // 1000, 0)
+
+    def progress(self, ns_now: Optional[int] = None, slots=None):
+        """ 剩余比例，1.0 为刚开始，0.0 为已结束；未设置的计时器为 0.0 """
+        ns_start, ns_stop, _ = self._select(slots)
+        ns_total = np.where((ns_start != UNSET) & (ns_stop != UNSET), ns_stop - ns_start, 0)
+        ns_remain = self.ns_remain(ns_now, slots)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(ns_total > 0, ns_remain / np.maximum(ns_total, 1), 0.0)
+        return np.clip(fraction, 0.0, 1.0)
+
+    def progress_steps(self, steps: int, ns_now: Optional[int] = None, slots=None):
+        """ 进度条的像素数 floor(ns_remain * steps / ns_total)，与 TimerRenderer 的量化一致 """
+        ns_start, ns_stop, _ = self._select(slots)
+        ns_total = np.where((ns_start != UNSET) & (ns_stop != UNSET), ns_stop - ns_start, 0)
+        ns_remain = np.maximum(self.ns_remain(ns_now, slots), 0)
+        filled = ns_remain * steps // np.maximum(ns_total, 1)
+        return np.where(ns_total > 0, np.minimum(filled, steps), 0)
+
+    def ns_to_next_change(self, steps: int, ns_now: Optional[int] = None, slots=None):
+        """ 距离下一次显示变化 (mm:ss 或进度条像素) 的纳秒数，同 tick_scheduler.plan_next_tick，只对运行中的计时器有意义 """
+        ns_start, ns_stop, _ = self._select(slots)
+        ns_total = ns_stop - ns_start
+        ns_remain = self.ns_remain(ns_now, slots)
+        ns_delay = ns_remain % NS_PER_SEC + 1
+        if steps > 0:
+            step = ns_remain * steps // np.maximum(ns_total, 1)
+            ns_step = ns_remain - (step * ns_total - 1) // steps
+            ns_delay = np.where((step > 0) & (ns_total > 0), np.minimum(ns_delay, ns_step), ns_delay)
+        return ns_delay
+
+    def expired(self, ns_now: Optional[int] = None, slots=None):
+        """ 已到结束时刻的掩码，未设置的计时器为 False (同 SimpleTimer.is_time_up) """
+        ns_start, ns_stop, ns_pause_start = self._select(slots)
+        is_set = (ns_start != UNSET) & (ns_stop != UNSET)
+        return is_set & (self._effective_now(ns_now, ns_pause_start) >= ns_stop)
+    # endregion 向量化计算
+
+
+class BankTimer:
+    """ TimerBank 中一个槽位的 SimpleTimer 视图，读写直接落在数组上，本身只占几个槽位引用 """
+    __slots__ = ('bank', 'slot', 'ns_now')
+
+    def __init__(self, bank: TimerBank, slot: int, ns_now: Optional[int] = None) -> None:
+        self.bank = bank
+        self.slot = slot
+        self.ns_now = ns_now
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}(slot={self.slot}, ns_start={self.ns_start}, ns_stop={self.ns_stop}, '
+            f'ns_pause_start={self.ns_pause_start})')
+
+    @property
+    def clock(self) -> Clock:
+        return self.bank.clock
+
+    @property
+    def ns_start(self) -> Optional[int]:
+        return _from_ns(self.bank.ns_start[self.slot])
+
+    @ns_start.setter
+    def ns_start(self, value: Optional[int]) -> None:
+        self.bank.ns_start[self.slot] = _to_ns(value)
+
+    @property
+    def ns_stop(self) -> Optional[int]:
+        return _from_ns(self.bank.ns_stop[self.slot])
+
+    @ns_stop.setter
+    def ns_stop(self, value: Optional[int]) -> None:
+        self.bank.ns_stop[self.slot] = _to_ns(value)
+
+    @property
+    def ns_pause_start(self) -> Optional[int]:
+        return _from_ns(self.bank.ns_pause_start[self.slot])
+
+    @ns_pause_start.setter
+    def ns_pause_start(self, value: Optional[int]) -> None:
+        self.bank.ns_pause_start[self.slot] = _to_ns(value)
+
+    # 计时逻辑与 SimpleTimer 完全一致，直接复用其方法
+    now_ns = SimpleTimer.now_ns
+    snapshot = SimpleTimer.snapshot
+    _now = SimpleTimer._now
+    is_paused = SimpleTimer.is_paused
+    is_time_set = SimpleTimer.is_time_set
+    is_time_up = SimpleTimer.is_time_up
+    ms_passed = SimpleTimer.ms_passed
+    ms_remain = SimpleTimer.ms_remain
+    ns_remain = SimpleTimer.ns_remain
+    ms_total = SimpleTimer.ms_total
+    pause = SimpleTimer.pause
+    reset = SimpleTimer.reset
+    resume = SimpleTimer.resume
+    sec_remain = SimpleTimer.sec_remain
+    sec_total = SimpleTimer.sec_total
@@ -0,0 +1,342 @@
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QObject, QPoint, QRect, QSize, Qt
+from PyQt5.QtGui import QColor, QFont, QKeyEvent, QMouseEvent, QPainter, QPalette
+from PyQt5.QtWidgets import QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem, QWidget
+
+from alarm_state import AlarmPolicy, AlarmStateMachine
+from deadline_queue import DeadlineQueue
+from simple_timer import NS_PER_MS, Clock
+from tick_hub import TickHub
+from tick_scheduler import TickPlan
+from timer_bank import BankTimer, TimerBank
+from timer_style import FONT_CN
+
+COLOR_ROW_BG = QColor('white')
+COLOR_ROW_BG_DONE = QColor('mistyrose')
+COLOR_TRACK = QColor(217, 217, 217, 115)
+COLOR_CHUNK = QColor.fromHsl(210, 115, 115)
+
+
+class TimerRowStatusEnum(Enum):
+    IDLE = auto()
+    RUNNING = auto()
+    PAUSED = auto()
+    DONE = auto()
+
+
+@dataclass(eq=False)
+class TimerRow:
+    name: str
+    timer: BankTimer
+    status: TimerRowStatusEnum = TimerRowStatusEnum.IDLE
+    # 上次绘制时的 (剩余秒数, 进度像素)，用于判断是否需要重绘
+    rendered: Optional[Tuple[int, int]] = None
+
+
+class TimerListModel(QAbstractListModel):
+    """ 多计时器数据模型，每个计时器一行，只保存计时状态，不创建任何控件
+    计时状态存放在 TimerBank 的数组中，可见行的剩余时间和进度一次向量化算出
+    """
+    TimerRowRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, clock: Clock, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.clock = clock
+        self.bank = TimerBank(clock=clock)
+        self.rows: List[TimerRow] = []
+        # 运行中各行的结束时刻，结束检测只看堆顶
+        self.deadlines: DeadlineQueue[TimerRow] = DeadlineQueue()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row.name
+        if role == self.TimerRowRole:
+            return row
+        return None
+
+    def notify_rows(self, first: int, last: int) -> None:
+        self.dataChanged.emit(self.index(first), self.index(last), [self.TimerRowRole])
+
+    def _touch(self, row_idx: int) -> None:
+        self.notify_rows(row_idx, row_idx)
+
+    # region 计时控制
+    def add_timer(self, name: str, ms_total: int, start: bool = False) -> int:
+        row_idx = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row_idx, row_idx)
+        self.rows.append(TimerRow(name, self.bank.view(self.bank.allocate(ms_total))))
+        self.endInsertRows()
+        self.reset(row_idx)
+        if start:
+            self.start(row_idx)
+        return row_idx
+
+    def remove_row(self, row_idx: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row_idx, row_idx)
+        row = self.rows.pop(row_idx)
+        self.deadlines.cancel(row)
+        self.bank.release(row.timer.slot)
+        self.endRemoveRows()
+
+    def start(self, row_idx: int, ns_now: Optional[int] = None) -> None:
+        row = self.rows[row_idx]
+        row.timer.reset(ns_now)
+        row.status = TimerRowStatusEnum.RUNNING
+        self.deadlines.schedule(row, row.timer.ns_stop)
+        self._touch(row_idx)
+
+    def pause(self, row_idx: int, ns_now: Optional[int] = None) -> bool:
+        row = self.rows[row_idx]
+        if row.status != TimerRowStatusEnum.RUNNING:
+            return False
+        ns_now = row.timer.pause(ns_now)
+        row.status = TimerRowStatusEnum.PAUSED
+        self.deadlines.pause(row, ns_now)
+        self._touch(row_idx)
+        return True
+
+    def resume(self, row_idx: int, ns_now: Optional[int] = None) -> bool:
+        row = self.rows[row_idx]
+        if row.status != TimerRowStatusEnum.PAUSED:
+            return False
+        ns_now = row.timer.resume(ns_now)
+        row.status = TimerRowStatusEnum.RUNNING
+        self.deadlines.resume(row, ns_now)
+        self._touch(row_idx)
+        return True
+
+    def reset(self, row_idx: int, ns_now: Optional[int] = None) -> None:
+        row = self.rows[row_idx]
+        row.timer.pause(row.timer.reset(ns_now))  # 重置后停在满格，等待开始
+        row.status = TimerRowStatusEnum.IDLE
+        self.deadlines.cancel(row)
+        self._touch(row_idx)
+
+    def running_in(self, first: int, last: int) -> Tuple[List[int], List[int]]:
+        """ [first, last] 范围内运行中的行号和对应的 bank 槽位 """
+        indices = [i for i in range(first, last + 1) if self.rows[i].status == TimerRowStatusEnum.RUNNING]
+        return indices, [self.rows[i].timer.slot for i in indices]
+
+    def complete_due(self, ns_now: int) -> List[TimerRow]:
+        """ 取出到 ns_now 为止结束的行 (同一时刻结束的一起返回)，标记为已结束，不发信号 """
+        done = self.deadlines.pop_due(ns_now)
+        for row in done:
+            row.timer.pause(ns_now)
+            row.status = TimerRowStatusEnum.DONE
+            row.rendered = None  # 背景色变化，可见时需要重绘
+        return done
+
+    def toggle(self, row_idx: int, ns_now: Optional[int] = None) -> None:
+        """ 开始 / 暂停 / 继续；已结束的计时器重置 """
+        status = self.rows[row_idx].status
+        if status == TimerRowStatusEnum.IDLE:
+            self.start(row_idx, ns_now)
+        elif status == TimerRowStatusEnum.RUNNING:
+            self.pause(row_idx, ns_now)
+        elif status == TimerRowStatusEnum.PAUSED:
+            self.resume(row_idx, ns_now)
+        else:
+            self.reset(row_idx, ns_now)
+    # endregion 计时控制
+
+
+class TimerRowDelegate(QStyledItemDelegate):
+    """ 直接绘制一行计时器：名字、mm:ss、进度条，不为每行创建控件 """
+    ROW_HEIGHT = 56
+    MARGIN = 8
+    STRIP_HEIGHT = 6
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.font_name = QFont(FONT_CN, 12, QFont.Weight.Bold)
+        self.font_time = QFont('calibri', 24, QFont.Weight.Bold)
+        # 视图本次绘制的时刻，同一次绘制的所有行共用；不在视图的绘制过程中时为 None
+        self.ns_paint: Optional[int] = None
+
+    @classmethod
+    def strip_rect(cls, rect: QRect) -> QRect:
+        return QRect(
+            rect.left() + cls.MARGIN, rect.bottom() - cls.MARGIN - cls.STRIP_HEIGHT + 1,
+            rect.width() - 2 * cls.MARGIN, cls.STRIP_HEIGHT)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        model: TimerListModel = index.model()
+        row: TimerRow = model.data(index, TimerListModel.TimerRowRole)
+        rect = option.rect
+        painter.save()
+        is_done = row.status == TimerRowStatusEnum.DONE
+        painter.fillRect(rect, COLOR_ROW_BG_DONE if is_done else COLOR_ROW_BG)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(rect, option.palette.color(QPalette.ColorRole.Highlight).lighter(170))
+
+        with row.timer.snapshot(model.clock.now_ns() if self.ns_paint is None else self.ns_paint):
+            seconds, ns_remain = row.timer.sec_remain(), row.timer.ns_remain()
+        text_rect = rect.adjusted(self.MARGIN, 0, -self.MARGIN, -self.STRIP_HEIGHT - self.MARGIN)
+        painter.setPen(QColor('gray') if row.status == TimerRowStatusEnum.PAUSED else QColor('black'))
+        painter.setFont(self.font_name)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, row.name)
+        painter.setFont(self.font_time)
+        painter.drawText(
+            text_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            f'{seconds // 60:02}:{seconds % 60:02}')
+
+        strip = self.strip_rect(rect)
+        painter.fillRect(strip, COLOR_TRACK)
+        ns_total = row.timer.ns_stop - row.timer.ns_start
+        if ns_total > 0:
+            filled = min(max(ns_remain, 0) * strip.width() // ns_total, strip.width())
+            painter.fillRect(QRect(strip.left(), strip.top(), filled, strip.height()), COLOR_CHUNK)
+            row.rendered = (seconds, filled)
+        painter.restore()
+
+
+class TimerDashboardView(QListView):
+    """ 多计时器看板：只有可见行参与刷新和绘制，内存和重绘开销与屏幕上的行数相关，与计时器总数无关
+    作为 TickHub 的客户端：可见行按下一次可见变化唤醒，全部运行中的行按结束时刻精确唤醒
+    """
+
+    def __init__(self, model: TimerListModel, hub: Optional[TickHub] = None, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.hub = TickHub.instance() if hub is None else hub
+        self.setUniformItemSizes(True)
+        self.setItemDelegate(TimerRowDelegate(self))
+        self.setModel(model)
+        self.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.alarm = AlarmStateMachine(AlarmPolicy(repeat_interval_ms=1600), parent=self)
+        model.rowsInserted.connect(self.reschedule)
+        model.rowsRemoved.connect(self.reschedule)
+        model.dataChanged.connect(self.reschedule)
+        self.hub.register(self)
+
+    def model(self) -> TimerListModel:
+        return super().model()
+
+    def reschedule(self, *args) -> None:
+        self.hub.reschedule(self)
+
+    def visible_range(self) -> Optional[Tuple[int, int]]:
+        rows = self.model().rowCount()
+        if not rows:
+            return None
+        first = self.indexAt(QPoint(0, 0)).row()
+        last = self.indexAt(QPoint(0, self.viewport().height() - 1)).row()
+        return max(first, 0), rows - 1 if last < 0 else last
+
+    def strip_width(self) -> int:
+        return TimerRowDelegate.strip_rect(QRect(0, 0, self.viewport().width(), TimerRowDelegate.ROW_HEIGHT)).width()
+
+    # region TickHub 回调
+    def plan_tick(self, ns_now: int) -> Optional[TickPlan]:
+        model = self.model()
+        # 结束检测：所有运行中的行里最早的结束时刻
+        ns_deadline = model.deadlines.peek()
+        precise = ns_deadline is not None
+        # 显示刷新：只看可见的行
+        visible = self.visible_range() if self.isVisible() else None
+        if visible is not None:
+            _, slots = model.running_in(*visible)
+            if slots:
+                ns_remain = model.bank.ns_remain(ns_now, slots)
+                ns_delay = model.bank.ns_to_next_change(self.strip_width(), ns_now, slots)
+                # 结束早于下一次显示变化的行由结束时刻负责唤醒
+                ns_delay = ns_delay[ns_delay < ns_remain]
+                if len(ns_delay):
+                    ns_row = ns_now + int(ns_delay.min())
+                    if ns_deadline is None or ns_row < ns_deadline:
+                        ns_deadline, precise = ns_row, False
+        ns_alarm = self.alarm.next_deadline_ns()
+        if ns_alarm is not None and (ns_deadline is None or ns_alarm < ns_deadline):
+            ns_deadline, precise = ns_alarm, False
+        if ns_deadline is None:
+            return None
+        return TickPlan(max(-(-(ns_deadline - ns_now) // NS_PER_MS), 0), precise)
+
+    def on_hub_tick(self, ns_now: int) -> None:
+        model = self.model()
+        done = model.complete_due(ns_now)
+        if done and not self.alarm.is_ringing():
+            self.alarm.start(ns_now)
+        elif self.alarm.is_ringing():
+            self.alarm.on_tick(ns_now)
+
+        visible = self.visible_range() if self.isVisible() else None
+        if visible is None:
+            return
+        first, last = visible
+        dirty = [
+            i for i in range(first, last + 1)
+            if model.rows[i].status == TimerRowStatusEnum.DONE and model.rows[i].rendered is None]
+        indices, slots = model.running_in(first, last)
+        if slots:
+            seconds = model.bank.sec_remain(ns_now, slots).tolist()
+            filled = model.bank.progress_steps(self.strip_width(), ns_now, slots).tolist()
+            dirty.extend(i for i, key in zip(indices, zip(seconds, filled)) if model.rows[i].rendered != key)
+        if dirty:
+            self.viewport().update(self.visualRect(model.index(min(dirty))).united(
+                self.visualRect(model.index(max(dirty)))))
+
+    def hub_pause(self, ns_now: int) -> bool:
+        model = self.model()
+        return any([model.pause(i, ns_now) for i in range(len(model.rows))])
+
+    def hub_resume(self, ns_now: int) -> bool:
+        model = self.model()
+        return any([model.resume(i, ns_now) for i in range(len(model.rows))])
+    # endregion TickHub 回调
+
+    def acknowledge_done(self) -> None:
+        """ 把所有已结束的行重置，停止提醒 """
+        model = self.model()
+        for i, row in enumerate(model.rows):
+            if row.status == TimerRowStatusEnum.DONE:
+                model.reset(i)
+        self.alarm.stop()
+
+    def paintEvent(self, event) -> None:
+        # 每次绘制 (tick、滚动、缩放、重新露出) 取一次当前时间，不沿用上一次 tick 的时刻
+        delegate: TimerRowDelegate = self.itemDelegate()
+        delegate.ns_paint = self.model().clock.now_ns()
+        try:
+            super().paintEvent(event)
+        finally:
+            delegate.ns_paint = None
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        super().scrollContentsBy(dx, dy)
+        self.reschedule()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.reschedule()
+
+    def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            self.model().toggle(index.row())
+            if not any(row.status == TimerRowStatusEnum.DONE for row in self.model().rows):
+                self.alarm.stop()
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        index = self.currentIndex()
+        if event.key() == Qt.Key.Key_Escape:
+            self.acknowledge_done()
+        elif index.isValid() and event.key() == Qt.Key.Key_Delete:
+            self.model().remove_row(index.row())
+        elif index.isValid() and event.key() == Qt.Key.Key_R:
+            self.model().reset(index.row())
+        elif index.isValid() and event.key() in {Qt.Key.Key_Space, Qt.Key.Key_Return}:
+            self.model().toggle(index.row())
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,219 @@
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, fields
+from enum import Enum
+from operator import attrgetter
+from typing import Iterable, List, Optional, Tuple
+
+from timer_journal import default_data_dir
+
+HISTORY_FILE = 'history.sqlite3'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    timer TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    started_at INTEGER NOT NULL,  -- 墙上时间，毫秒
+    ended_at INTEGER NOT NULL,
+    planned_ms INTEGER NOT NULL,
+    focus_ms INTEGER NOT NULL,    -- 实际计时时长，不含暂停
+    pause_cnt INTEGER NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_started_at ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_label ON sessions (label, started_at);
+
+-- 按 (本地日期, 提醒内容) 预聚合，写入时由触发器维护，统计只读这张表，读取量与记录条数无关
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT NOT NULL,            -- 开始时间所在的本地日期 YYYY-MM-DD，按写入时的时区 (含夏令时) 换算
+    label TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    focus_ms INTEGER NOT NULL,
+    pause_cnt INTEGER NOT NULL,
+    PRIMARY KEY (day, label)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS sessions_daily_stats AFTER INSERT ON sessions BEGIN
+    INSERT INTO daily_stats (day, label, sessions, completed, focus_ms, pause_cnt)
+    VALUES (
+        date(NEW.started_at / 1000, 'unixepoch', 'localtime'), NEW.label, 1, NEW.outcome = 'completed',
+        NEW.focus_ms, NEW.pause_cnt)
+    ON CONFLICT (day, label) DO UPDATE SET
+        sessions = sessions + 1, completed = completed + excluded.completed,
+        focus_ms = focus_ms + excluded.focus_ms, pause_cnt = pause_cnt + excluded.pause_cnt;
+END;
+'''
+
+REBUILD_DAILY_STATS = '''
+DELETE FROM daily_stats;
+INSERT INTO daily_stats (day, label, sessions, completed, focus_ms, pause_cnt)
+SELECT date(started_at / 1000, 'unixepoch', 'localtime') AS day, label, COUNT(*), SUM(outcome = 'completed'),
+       SUM(focus_ms), SUM(pause_cnt)
+FROM sessions GROUP BY day, label;
+'''
+DAILY_COLUMNS = ('day', 'label', 'sessions', 'completed', 'focus_ms', 'pause_cnt')
+
+
+class SessionOutcomeEnum(str, Enum):
+    COMPLETED = 'completed'
+    RESET = 'reset'
+    CLEARED = 'cleared'
+
+
+@dataclass
+class SessionRecord:
+    timer: str
+    label: str
+    started_at: int
+    ended_at: int
+    planned_ms: int
+    focus_ms: int
+    pause_cnt: int
+    outcome: str
+
+
+SESSION_COLUMNS = tuple(f.name for f in fields(SessionRecord))
+_session_row = attrgetter(*SESSION_COLUMNS)
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def local_day(ms: int) -> str:
+    """ 毫秒时间戳所在的本地日期，与 daily_stats.day 的换算一致 """
+    return time.strftime('%Y-%m-%d', time.localtime(ms // 1000))
+
+
+class HistoryStore:
+    """ 倒计时历史记录 (SQLite)，按开始时间和提醒内容建索引 """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            os.makedirs(default_data_dir(), exist_ok=True)
+            path = os.path.join(default_data_dir(), HISTORY_FILE)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        # 旧版本创建的数据库还没有日汇总，补算一次
+        sql = 'SELECT NOT EXISTS (SELECT 1 FROM daily_stats) AND EXISTS (SELECT 1 FROM sessions)'
+        if self.conn.execute(sql).fetchone()[0]:
+            self.rebuild_daily_stats()
+
+    def add(self, record: SessionRecord) -> None:
+        self.add_many((record, ))
+
+    def add_many(self, records: Iterable[SessionRecord]) -> None:
+        """ 一个事务内批量写入 """
+        placeholders = ', '.join('?' * len(SESSION_COLUMNS))
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT INTO sessions ({", ".join(SESSION_COLUMNS)}) VALUES ({placeholders})',
+                map(_session_row, records))
+
+    def fetch(
+            self, since_ms: Optional[int] = None, until_ms: Optional[int] = None, label: Optional[str] = None,
+            after_id: int = 0, columns: Tuple[str, ...] = ('id', ) + SESSION_COLUMNS) -> List[tuple]:
+        """ 按条件批量读取，时间范围和 label 条件走索引 """
+        where, params = ['id > ?'], [after_id]
+        if label is not None:
+            where.append('label = ?')
+            params.append(label)
+        if since_ms is not None:
+            where.append('started_at >= ?')
+            params.append(since_ms)
+        if until_ms is not None:
+            where.append('started_at < ?')
+            params.append(until_ms)
+        sql = f'SELECT {", ".join(columns)} FROM sessions WHERE {" AND ".join(where)} ORDER BY id'
+        return self.conn.execute(sql, params).fetchall()
+
+    def fetch_daily(self, since_day: Optional[str] = None, label: Optional[str] = None) -> List[tuple]:
+        """ 读取日汇总 (DAILY_COLUMNS)，按日期排序 """
+        where, params = ['1'], []
+        if since_day is not None:
+            where.append('day >= ?')
+            params.append(since_day)
+        if label is not None:
+            where.append('label = ?')
+            params.append(label)
+        sql = f'SELECT {", ".join(DAILY_COLUMNS)} FROM daily_stats WHERE {" AND ".join(where)} ORDER BY day, label'
+        return self.conn.execute(sql, params).fetchall()
+
+    def rebuild_daily_stats(self) -> None:
+        """ 从 sessions 重新计算全部日汇总 """
+        self.conn.executescript(f'BEGIN;{REBUILD_DAILY_STATS}COMMIT;')
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class HistoryAnalytics:
+    """ 番茄钟统计：只把 SQLite 写入时维护的日汇总 (daily_stats) 批量载入 pandas，统计是对日汇总的向量化聚合
+    载入量是天数 × 提醒内容种数，与记录条数无关，百万条记录时冷启动载入和查询也在 100 ms 以内 (benchmark.py 的 history.*)
+    时间范围按本地日期取整：since_ms 所在的那天起，到 until_ms 之前最后一刻所在的那天为止
+    """
+
+    def __init__(self, store: HistoryStore, since_ms: Optional[int] = None) -> None:
+        import pandas as pd
+        self.pd = pd
+        self.store = store
+        self.since_day = None if since_ms is None else local_day(since_ms)
+        self.frame = self._to_frame([])
+        self.refresh()
+
+    def _to_frame(self, rows: List[tuple]):
+        frame = self.pd.DataFrame.from_records(rows, columns=DAILY_COLUMNS)
+        frame['day'] = self.pd.to_datetime(frame['day'])
+        return frame
+
+    def refresh(self) -> int:
+        """ 新记录只会改变最后一天及之后的汇总：保留更早的天，重新读取最后一天起的汇总，返回读取的行数 """
+        if self.frame.empty:
+            rows = self.store.fetch_daily(self.since_day)
+            kept = None
+        else:
+            last_day = self.frame['day'].iloc[-1]
+            rows = self.store.fetch_daily(last_day.strftime('%Y-%m-%d'))
+            kept = self.frame[self.frame['day'].to_numpy() < last_day.to_datetime64()]
+        new_frame = self._to_frame(rows)
+        self.frame = new_frame if kept is None or kept.empty else self.pd.concat((kept, new_frame), ignore_index=True)
+        return len(rows)
+
+    def _select(self, since_ms: Optional[int] = None, until_ms: Optional[int] = None, label: Optional[str] = None):
+        frame = self.frame
+        day = frame['day'].to_numpy()
+        mask = None
+        for cond in (
+            None if since_ms is None else day >= self.pd.Timestamp(local_day(since_ms)).to_datetime64(),
+            None if until_ms is None else day <= self.pd.Timestamp(local_day(until_ms - 1)).to_datetime64(),
+            None if label is None else frame['label'].to_numpy() == label,
+        ):
+            if cond is not None:
+                mask = cond if mask is None else mask & cond
+        return frame if mask is None else frame[mask]
+
+    def daily_focus_totals(self, since_ms: Optional[int] = None, until_ms: Optional[int] = None, label=None):
+        """ 每日专注总时长 (分钟) """
+        frame = self._select(since_ms, until_ms, label)
+        return (frame['focus_ms'] / 60_000).groupby(frame['day']).sum().rename('focus_min')
+
+    def completion_rate(self, since_ms: Optional[int] = None, until_ms: Optional[int] = None, by_label: bool = False):
+        """ 完成率：正常走完的倒计时占全部倒计时的比例，by_label 时按提醒内容分组 """
+        frame = self._select(since_ms, until_ms)
+        if by_label:
+            sums = frame[['completed', 'sessions']].groupby(frame['label']).sum()
+            return (sums['completed'] / sums['sessions']).rename('completion_rate')
+        sessions = int(frame['sessions'].sum())
+        return int(frame['completed'].sum()) / sessions if sessions else 0.0
+
+    def interruption_counts(self, since_ms: Optional[int] = None, until_ms: Optional[int] = None, label=None):
+        """ 每日中断次数：暂停次数 + 未完成就重置/清除的次数 """
+        frame = self._select(since_ms, until_ms, label)
+        interruptions = frame['pause_cnt'] + frame['sessions'] - frame['completed']
+        return interruptions.groupby(frame['day']).sum().rename('interruptions')
@@ -0,0 +1,196 @@
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, IO, Optional
+
+JOURNAL_FILE = 'journal.jsonl'
+SNAPSHOT_FILE = 'snapshot.json'
+
+
+def default_data_dir() -> str:
+    """ 计时器数据目录，可用环境变量 PYQTTIMER_DATA_DIR 指定 """
+    env_dir = os.environ.get('PYQTTIMER_DATA_DIR')
+    if env_dir:
+        return env_dir
+    if platform.system() == 'Windows':
+        return os.path.join(os.environ.get('APPDATA', os.path.expanduser('~')), 'PyQtTimer')
+    return os.path.join(os.environ.get('XDG_DATA_HOME', os.path.expanduser('~/.local/share')), 'pyqttimer')
+
+
+class TimerStatusEnum:
+    IDLE = 'idle'
+    RUNNING = 'running'
+    PAUSED = 'paused'
+
+
+@dataclass
+class TimerState:
+    """ 某个计时器在日志中的最新状态，时间用墙上时间 (time.time_ns)，重启后仍然有效 """
+    name: str
+    status: str = TimerStatusEnum.IDLE
+    ms_total: int = 0
+    # RUNNING: 结束时刻；PAUSED: 暂停时的剩余时长
+    wall_stop_ns: int = 0
+    ms_remain: int = 0
+    hint: str = ''
+    # 番茄钟循环：PomodoroCycle.to_dict() 加当前阶段序号 index，不在循环中时为 None
+    cycle: Optional[Dict] = None
+
+    def remaining_ms(self, wall_now_ns: Optional[int] = None) -> int:
+        if self.status == TimerStatusEnum.RUNNING:
+            wall_now_ns = time.time_ns() if wall_now_ns is None else wall_now_ns
+            return (self.wall_stop_ns - wall_now_ns) // 1_000_000
+        if self.status == TimerStatusEnum.PAUSED:
+            return self.ms_remain
+        return self.ms_total
+
+
+def apply_event(state: TimerState, event: Dict) -> TimerState:
+    """ 把一条日志事件应用到计时器状态上，记录和回放共用 """
+    ev = event['ev']
+    ms_total = event.get('ms_total', state.ms_total)
+    ms_remain = event.get('ms_remain', ms_total)
+    hint = event.get('hint', state.hint)
+    cycle = event.get('cycle', state.cycle)
+    if ev in ('start', 'resume', 'phase'):
+        return replace(
+            state, status=TimerStatusEnum.RUNNING, ms_total=ms_total, ms_remain=ms_remain,
+            wall_stop_ns=event['t'] + ms_remain * 1_000_000, hint=hint, cycle=cycle)
+    if ev == 'pause':
+        return replace(
+            state, status=TimerStatusEnum.PAUSED, ms_total=ms_total, ms_remain=ms_remain, hint=hint, cycle=cycle)
+    if ev == 'reset':
+        # 循环中重置只是把当前阶段恢复到完整时长，循环本身保留
+        return replace(
+            state, status=TimerStatusEnum.IDLE, ms_total=ms_total, ms_remain=ms_total, hint=hint, cycle=cycle)
+    if ev == 'complete':
+        return replace(state, status=TimerStatusEnum.IDLE, ms_total=ms_total, ms_remain=ms_total, hint=hint, cycle=None)
+    if ev == 'clear':
+        return replace(state, status=TimerStatusEnum.IDLE, ms_total=0, ms_remain=0, hint=hint, cycle=None)
+    return state
+
+
+class TimerJournal:
+    """ 计时器操作的追加写日志，崩溃或重启后恢复所有计时器
+    - 每条事件立即写入文件，每 fsync_every 条或 fsync_interval_ms 毫秒批量 fsync 一次；
+      设置了 schedule_sync 时，一批事件的最后几条也会在 fsync_interval_ms 后由定时器 fsync，不必等下一条事件
+    - 恢复时跳过损坏的行，崩溃时写了一半的最后一行被截掉，之后追加的事件不会接在残行后面
+    - 日志超过 compact_every 条时压缩成快照并清空日志，保证回放量有上限
+    """
+
+    def __init__(
+            self, data_dir: Optional[str] = None, fsync_every: int = 32, fsync_interval_ms: int = 1000,
+            compact_every: int = 500,
+            schedule_sync: Optional[Callable[[int, Callable[[], None]], None]] = None) -> None:
+        self.data_dir = default_data_dir() if data_dir is None else data_dir
+        self.journal_path = os.path.join(self.data_dir, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        self.fsync_every = fsync_every
+        self.fsync_interval_ns = fsync_interval_ms * 1_000_000
+        self.compact_every = compact_every
+        # schedule_sync(delay_ms, callback)：由调用方的事件循环在 delay_ms 后调用 callback，例如 QTimer.singleShot
+        self.schedule_sync = schedule_sync
+        self.states: Dict[str, TimerState] = {}
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._journal_lines = 0
+        self._unsynced = 0
+        self._ns_last_sync = time.monotonic_ns()
+        self._file: Optional[IO[str]] = None
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.restore()
+
+    # region 恢复
+    def restore(self) -> Dict[str, TimerState]:
+        """ 读取快照并回放其后的日志，返回每个计时器的最新状态 """
+        self.states = {}
+        self.seq = self.snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.seq = self.snapshot_seq = snapshot['seq']
+            self.states = {name: TimerState(**state) for name, state in snapshot['timers'].items()}
+        self._journal_lines = 0
+        if os.path.exists(self.journal_path):
+            self._replay_journal()
+        return self.states
+
+    def _replay_journal(self) -> None:
+        # 最后一个以换行结尾的行之后的位置，之后的内容是崩溃时写了一半的残行
+        good_end = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                good_end += len(line)
+                try:
+                    event = json.loads(line)
+                    seq = event['seq']
+                except (ValueError, KeyError, TypeError):
+                    continue  # 损坏的行跳过，后面的事件仍然有效
+                self._journal_lines += 1
+                if seq <= self.snapshot_seq:
+                    continue  # 压缩时已写入快照、日志还没来得及清空
+                self._apply(event)
+        if os.path.getsize(self.journal_path) > good_end:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good_end)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _apply(self, event: Dict) -> None:
+        name = event['timer']
+        self.states[name] = apply_event(self.states.get(name) or TimerState(name), event)
+        self.seq = max(self.seq, event['seq'])
+    # endregion 恢复
+
+    # region 记录
+    def record(self, timer: str, ev: str, **data) -> None:
+        self.seq += 1
+        event = {'seq': self.seq, 't': time.time_ns(), 'timer': timer, 'ev': ev, **data}
+        self._apply(event)
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+        self._file.flush()
+        self._journal_lines += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic_ns() - self._ns_last_sync >= self.fsync_interval_ns:
+            self.sync()
+        elif self._unsynced == 1 and self.schedule_sync is not None:
+            # 这一批的第一条未同步事件，保证最迟 fsync_interval_ms 后落盘
+            self.schedule_sync(self.fsync_interval_ns // 1_000_000, self.sync)
+        if self._journal_lines >= self.compact_every:
+            self.compact()
+
+    def sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._ns_last_sync = time.monotonic_ns()
+
+    def compact(self) -> None:
+        """ 把当前状态写成快照 (先写临时文件再原子替换)，然后清空日志 """
+        snapshot = {'seq': self.seq, 'timers': {name: asdict(state) for name, state in self.states.items()}}
+        tmp_path = f'{self.snapshot_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_seq = self.seq
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.journal_path, 'w', encoding='utf-8')
+        self._journal_lines = 0
+        self._unsynced = 0
+
+    def close(self) -> None:
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    # endregion 记录
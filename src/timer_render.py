@@ -0,0 +1,70 @@
+from typing import Optional
+
+from digit_display import DigitDisplay
+from progress_strip import ProgressStrip
+
+
+class TimerRenderer:
+    """ 倒计时显示层：缓存上一次渲染的状态，只更新可见输出真正变化的控件
+    进度条只在状态变化时更新锚点，逐帧插值和按设备像素量化的局部重绘由 ProgressStrip 自己完成
+    """
+
+    def __init__(self, mm_edit: DigitDisplay, ss_edit: DigitDisplay, progress: ProgressStrip) -> None:
+        self.mm_edit = mm_edit
+        self.ss_edit = ss_edit
+        self.progress = progress
+        self.mm_text = mm_edit.text()
+        self.ss_text = ss_edit.text()
+        # 当前显示的总秒数，开始计时、加减时长直接使用，不再解析文字
+        self.seconds = self.parse_seconds()
+        self._rendering = False
+        self.render_count = 0
+        self.skip_count = 0
+        # 键盘输入等直接修改文字的路径也同步到缓存
+        mm_edit.textChanged.connect(self._on_mm_text_changed)
+        ss_edit.textChanged.connect(self._on_ss_text_changed)
+
+    def _on_mm_text_changed(self, text: str) -> None:
+        self.mm_text = text
+        if not self._rendering:
+            self.seconds = self.parse_seconds()
+
+    def _on_ss_text_changed(self, text: str) -> None:
+        self.ss_text = text
+        if not self._rendering:
+            self.seconds = self.parse_seconds()
+
+    def parse_seconds(self) -> int:
+        """ 只在键盘直接输入数字时调用 """
+        return int(self.mm_text or 0) * 60 + int(self.ss_text or 0)
+
+    def render_time(self, seconds: int) -> None:
+        self.seconds = seconds
+        mm_text = f'{seconds // 60:02}'
+        ss_text = f'{seconds % 60:02}'
+        self._rendering = True
+        try:
+            if mm_text != self.mm_text:
+                self.mm_edit.setText(mm_text)
+                self.render_count += 1
+            else:
+                self.skip_count += 1
+            if ss_text != self.ss_text:
+                self.ss_edit.setText(ss_text)
+                self.render_count += 1
+            else:
+                self.skip_count += 1
+        finally:
+            self._rendering = False
+
+    def render_progress(self, ns_remain: int, ns_total: int, running: bool, ns_now: Optional[int] = None) -> None:
+        if self.progress.set_progress(ns_remain, ns_total, running, ns_now):
+            self.render_count += 1
+        else:
+            self.skip_count += 1
+
+    def reset_progress(self) -> None:
+        if self.progress.reset():
+            self.render_count += 1
+        else:
+            self.skip_count += 1
@@ -0,0 +1,348 @@
+""" 无界面的倒计时服务 (asyncio，不依赖 PyQt5)
+
+python timer_service.py --port 8765 --http-port 8766 --rate 1
+
+- TCP (JSON Lines)：命令格式与 instance_ipc 相同，另有 subscribe / unsubscribe 订阅推送
+    {"cmd": "create", "args": {"name": "tea", "minutes": 3, "start": true}}
+    {"cmd": "subscribe"}
+- HTTP：/ 为简单的状态页面，/events 为 SSE 推送，/state 为当前全部状态
+推送按 rate 对齐定时合并发送：每个 tick 只生成一份消息 (每种格式序列化一次)，发给所有订阅者
+消息只包含状态有变化或剩余整秒数有变化的计时器
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Set
+
+from deadline_queue import DeadlineQueue
+from instance_ipc import CommandError, CommandHandler, handle_line
+from simple_timer import DEFAULT_CLOCK, NS_PER_SEC, Clock, SimpleTimer
+from timer_journal import TimerStatusEnum
+
+STATUS_DONE = 'done'
+# 写缓冲超过该值的订阅者本次跳过，之后补发一次完整快照
+MAX_WRITE_BUFFER = 256 * 1024
+
+
+class Broadcast:
+    """ 一次推送的内容，按格式惰性序列化并缓存，所有订阅者共用同一份字节串 """
+    __slots__ = ('payload', '_line', '_sse')
+
+    def __init__(self, payload: Dict) -> None:
+        self.payload = payload
+        self._line: Optional[bytes] = None
+        self._sse: Optional[bytes] = None
+
+    def line(self) -> bytes:
+        if self._line is None:
+            self._line = json.dumps(self.payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        return self._line
+
+    def sse(self) -> bytes:
+        if self._sse is None:
+            self._sse = b'data: ' + self.line()[:-1] + b'\n\n'
+        return self._sse
+
+
+class Subscriber:
+    """ 一个订阅连接；写缓冲积压时跳过增量推送，恢复后先补发完整快照 """
+    __slots__ = ('writer', 'sse', 'needs_snapshot', 'skipped')
+
+    def __init__(self, writer: asyncio.StreamWriter, sse: bool = False) -> None:
+        self.writer = writer
+        self.sse = sse
+        self.needs_snapshot = True
+        self.skipped = 0
+
+    def send(self, broadcast: Broadcast) -> bool:
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.skipped += 1
+            self.needs_snapshot = True
+            return False
+        self.writer.write(broadcast.sse() if self.sse else broadcast.line())
+        return True
+
+
+class TimerService:
+    """ 托管多个 SimpleTimer，对外提供命令和合并后的定时推送 """
+
+    def __init__(self, clock: Clock = DEFAULT_CLOCK, rate_hz: float = 1.0) -> None:
+        self.clock = clock
+        self.period_ns = int(NS_PER_SEC / rate_hz)
+        self.timers: Dict[str, SimpleTimer] = {}
+        self.status: Dict[str, str] = {}
+        self.deadlines: DeadlineQueue[str] = DeadlineQueue()
+        self.subscribers: Set[Subscriber] = set()
+        # 上次推送之后状态有变化 (命令、结束) 的计时器
+        self._dirty: Set[str] = set()
+        # 运行中的计时器上次推送时的剩余整秒数，整秒没有变化的不再推送
+        self._pushed_sec: Dict[str, int] = {}
+        self.tick_cnt = 0
+        self.handlers: Dict[str, CommandHandler] = {
+            'create': self.create,
+            'start': self.start,
+            'pause': self.pause,
+            'resume': self.resume,
+            'reset': self.reset,
+            'remove': self.remove,
+            'add-seconds': self.add_seconds,
+            'query': self.query,
+        }
+
+    # region 命令
+    def _get(self, name: str) -> SimpleTimer:
+        timer = self.timers.get(name)
+        if timer is None:
+            raise CommandError(f'no such timer: {name}')
+        return timer
+
+    def _state(self, name: str, ns_now: int) -> List:
+        """ [状态, 剩余毫秒, 总毫秒] """
+        timer = self.timers[name]
+        with timer.snapshot(ns_now):
+            return [self.status[name], max(timer.ms_remain(), 0), timer.ms_total()]
+
+    def create(self, name: str, minutes: int = 0, seconds: int = 0, start: bool = False) -> Dict:
+        if name in self.timers:
+            raise CommandError(f'timer already exists: {name}')
+        ms_total = (int(minutes) * 60 + int(seconds)) * 1000
+        if ms_total <= 0:
+            raise CommandError('duration must be positive')
+        ns_now = self.clock.now_ns()
+        timer = SimpleTimer.from_duration(ms_total, clock=self.clock, ns_now=ns_now)
+        timer.pause(ns_now)
+        self.timers[name] = timer
+        self.status[name] = TimerStatusEnum.IDLE
+        self._dirty.add(name)
+        return self.start(name) if start else self.query(name)
+
+    def start(self, name: str) -> Dict:
+        timer = self._get(name)
+        if self.status[name] != TimerStatusEnum.IDLE:
+            raise CommandError(f'timer is not idle: {name}')
+        timer.reset()
+        self.status[name] = TimerStatusEnum.RUNNING
+        self.deadlines.schedule(name, timer.ns_stop)
+        self._dirty.add(name)
+        return self.query(name)
+
+    def pause(self, name: str) -> Dict:
+        timer = self._get(name)
+        if self.status[name] != TimerStatusEnum.RUNNING:
+            raise CommandError(f'timer is not running: {name}')
+        self.deadlines.pause(name, timer.pause())
+        self.status[name] = TimerStatusEnum.PAUSED
+        self._dirty.add(name)
+        return self.query(name)
+
+    def resume(self, name: str) -> Dict:
+        timer = self._get(name)
+        if self.status[name] != TimerStatusEnum.PAUSED:
+            raise CommandError(f'timer is not paused: {name}')
+        self.deadlines.resume(name, timer.resume())
+        self.status[name] = TimerStatusEnum.RUNNING
+        self._dirty.add(name)
+        return self.query(name)
+
+    def reset(self, name: str) -> Dict:
+        timer = self._get(name)
+        timer.pause(timer.reset())
+        self.deadlines.cancel(name)
+        self.status[name] = TimerStatusEnum.IDLE
+        self._dirty.add(name)
+        return self.query(name)
+
+    def add_seconds(self, name: str, seconds: int) -> Dict:
+        timer = self._get(name)
+        if self.status[name] != TimerStatusEnum.IDLE:
+            raise CommandError('duration can only be changed before start')
+        if timer.ns_stop - timer.ns_start + int(seconds) * NS_PER_SEC <= 0:
+            raise CommandError('duration must be positive')
+        timer.ns_stop += int(seconds) * NS_PER_SEC
+        self._dirty.add(name)
+        return self.query(name)
+
+    def remove(self, name: str) -> Dict:
+        self._get(name)
+        del self.timers[name], self.status[name]
+        self._pushed_sec.pop(name, None)
+        self.deadlines.cancel(name)
+        self._dirty.add(name)
+        return {'removed': name}
+
+    def query(self, name: Optional[str] = None) -> Dict:
+        ns_now = self.clock.now_ns()
+        if name is not None:
+            self._get(name)
+            return {name: self._state(name, ns_now)}
+        return {name: self._state(name, ns_now) for name in self.timers}
+    # endregion 命令
+
+    # region 推送
+    def tick(self, ns_now: Optional[int] = None) -> Optional[Broadcast]:
+        """ 处理到期的计时器，并把本周期内的变化合并成一条消息推送给所有订阅者 """
+        ns_now = self.clock.now_ns() if ns_now is None else ns_now
+        self.tick_cnt += 1
+        for name in self.deadlines.pop_due(ns_now):
+            self.timers[name].pause(ns_now)
+            self.status[name] = STATUS_DONE
+            self._dirty.add(name)
+        if not self.subscribers:
+            self._dirty.clear()
+            return None
+        changed, self._dirty = self._dirty, set()
+        for name, status in self.status.items():
+            if status == TimerStatusEnum.RUNNING:
+                sec_remain = max(self.timers[name].ns_stop - ns_now, 0) // NS_PER_SEC
+                if self._pushed_sec.get(name) != sec_remain:
+                    self._pushed_sec[name] = sec_remain
+                    changed.add(name)
+        timers = {name: self._state(name, ns_now) if name in self.timers else None for name in changed}
+        broadcast = Broadcast({'ev': 'tick', 't': time.time_ns(), 'timers': timers}) if timers else None
+        snapshot: Optional[Broadcast] = None
+        for subscriber in list(self.subscribers):
+            if subscriber.writer.is_closing():
+                self.subscribers.discard(subscriber)
+                continue
+            if subscriber.needs_snapshot:
+                if snapshot is None:
+                    snapshot = self.snapshot(ns_now)
+                if subscriber.send(snapshot):
+                    subscriber.needs_snapshot = False
+            elif broadcast is not None:
+                subscriber.send(broadcast)
+        return broadcast
+
+    def snapshot(self, ns_now: Optional[int] = None) -> Broadcast:
+        ns_now = self.clock.now_ns() if ns_now is None else ns_now
+        timers = {name: self._state(name, ns_now) for name in self.timers}
+        return Broadcast({'ev': 'snapshot', 't': time.time_ns(), 'timers': timers})
+
+    async def run_ticks(self) -> None:
+        """ 按周期对齐地调用 tick，所有计时器、所有订阅者共用一次唤醒 """
+        while True:
+            ns_now = self.clock.now_ns()
+            await asyncio.sleep((self.period_ns - ns_now % self.period_ns) / NS_PER_SEC)
+            self.tick()
+    # endregion 推送
+
+    # region 连接
+    async def handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscriber = Subscriber(writer)
+
+        def subscribe() -> Dict:
+            subscriber.needs_snapshot = True
+            self.subscribers.add(subscriber)
+            return {'subscribed': True, 'rate_hz': NS_PER_SEC / self.period_ns}
+
+        def unsubscribe() -> Dict:
+            self.subscribers.discard(subscriber)
+            return {'subscribed': False}
+
+        handlers = dict(self.handlers, subscribe=subscribe, unsubscribe=unsubscribe)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(handle_line(handlers, line))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            writer.close()
+
+    async def handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # 忽略请求头
+            parts = request_line.decode('latin-1').split()
+            path = parts[1] if len(parts) >= 2 else '/'
+            if path == '/events':
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n'
+                    b'Connection: keep-alive\r\n\r\n')
+                subscriber = Subscriber(writer, sse=True)
+                self.subscribers.add(subscriber)
+                try:
+                    await reader.read()  # 等待浏览器断开
+                finally:
+                    self.subscribers.discard(subscriber)
+                return
+            if path == '/state':
+                body, content_type = self.snapshot().line(), b'application/json'
+            elif path == '/':
+                body, content_type = STATUS_PAGE.encode('utf-8'), b'text/html; charset=utf-8'
+            else:
+                body, content_type = b'not found\n', b'text/plain'
+            status = b'404 Not Found' if body == b'not found\n' else b'200 OK'
+            writer.write(
+                b'HTTP/1.1 ' + status + b'\r\nContent-Type: ' + content_type
+                + b'\r\nContent-Length: ' + str(len(body)).encode() + b'\r\nConnection: close\r\n\r\n' + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    # endregion 连接
+
+
+STATUS_PAGE = '''<!doctype html>
+<meta charset="utf-8">
+<title>番茄计时器</title>
+<style>body { font-family: sans-serif; } td { padding: 2px 12px; } .done { color: #c00; }</style>
+<table id="timers"></table>
+<script>
+const timers = {};
+function fmt(ms) { const s = Math.floor(ms / 1000); return String(Math.floor(s / 60)).padStart(2, '0') + ':' + String(s % 60).padStart(2, '0'); }
+// 计时器名称由任意客户端创建，只能作为文本写入，不能拼接成 HTML
+function render() {
+  const rows = Object.keys(timers).sort().map(name => {
+    const [status, remain] = timers[name];
+    const tr = document.createElement('tr');
+    tr.className = status;
+    for (const text of [name, status, fmt(remain)]) tr.insertCell().textContent = text;
+    return tr;
+  });
+  document.getElementById('timers').replaceChildren(...rows);
+}
+new EventSource('/events').onmessage = (e) => {
+  const msg = JSON.parse(e.data);
+  if (msg.ev === 'snapshot') { for (const k in timers) delete timers[k]; }
+  for (const [name, state] of Object.entries(msg.timers)) { if (state === null) delete timers[name]; else timers[name] = state; }
+  render();
+};
+</script>
+'''
+
+
+async def serve(host: str, port: int, http_port: Optional[int], rate_hz: float) -> None:
+    service = TimerService(rate_hz=rate_hz)
+    servers = [await asyncio.start_server(service.handle_tcp, host, port, limit=1 << 20)]
+    if http_port:
+        servers.append(await asyncio.start_server(service.handle_http, host, http_port))
+    for server in servers:
+        for sock in server.sockets:
+            print(f'listening on {sock.getsockname()}', flush=True)
+    await service.run_ticks()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='TCP 命令与推送端口')
+    parser.add_argument('--http-port', type=int, default=8766, help='HTTP 页面与 SSE 端口，0 表示不开启')
+    parser.add_argument('--rate', type=float, default=1.0, help='推送频率 (次/秒)')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.http_port, args.rate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication
+
+FONT_CN = 'Microsoft YaHei'
+
+# TimerWidget 上的动态属性，两种布局的样式差异通过属性选择器区分
+PROP_DISP_DIRECTION = 'dispDirection'
+PROP_STYLE_INSTALLED = 'timerStyleInstalled'
+
+# 应用样式表中计时器部分的首尾标记
+STYLE_BEGIN = '/* timer_style begin */'
+STYLE_END = '/* timer_style end */'
+
+
+@dataclass(frozen=True)
+class TimerTheme:
+    font_cn: str = FONT_CN
+    color_text: str = 'black'
+    color_hint: str = 'gray'
+    color_disabled: str = 'gray'
+    color_focus: str = 'gainsboro'
+    color_track: str = 'hsla(5, 0%, 85%, 45%)'
+    color_chunk: str = 'hsl(210, 45%, 45%)'
+
+
+DEFAULT_THEME = TimerTheme()
+
+CSS_HSL = re.compile(r'hsla?\(\s*([\d.]+)\s*,\s*([\d.]+)%\s*,\s*([\d.]+)%\s*(?:,\s*([\d.]+)(%?)\s*)?\)')
+
+
+def qcolor(value: str) -> QColor:
+    """ 主题颜色转为 QColor，自绘控件使用；除 QColor 能识别的格式外还支持样式表的 hsl() / hsla() """
+    match = CSS_HSL.fullmatch(value.strip())
+    if match is None:
+        return QColor(value)
+    h, s, l, a, is_percent = match.groups()
+    alpha = 1.0 if a is None else float(a) / (100 if is_percent else 1)
+    return QColor.fromHslF(float(h) % 360 / 360, float(s) / 100, float(l) / 100, alpha)
+
+
+@lru_cache(maxsize=None)
+def build_stylesheet(theme: TimerTheme = DEFAULT_THEME) -> str:
+    """ 生成两种布局共用的应用级样式表，每个主题只生成一次 """
+    font = f'font-family: {theme.font_cn}; font-weight: bold;'
+    regular = f'TimerWidget[{PROP_DISP_DIRECTION}="regular"]'
+    horizontal = f'TimerWidget[{PROP_DISP_DIRECTION}="horizontal"]'
+    return f'''
+        TimerWidget #timer_mm_edit, TimerWidget #timer_ss_edit, TimerWidget #timer_sep_label {{
+            background-color: transparent;
+            border: 0px;
+        }}
+        TimerWidget #timer_mm_edit {{ border-top-left-radius: 12px; }}
+        TimerWidget #timer_ss_edit {{ border-top-right-radius: 12px; }}
+        TimerWidget #timer_mm_edit::focus, TimerWidget #timer_ss_edit::focus {{ background-color: {theme.color_focus}; }}
+        TimerWidget #timer_hint_label, TimerWidget #add_time_label {{
+            color: {theme.color_hint}; {font} font-size: 20px;
+        }}
+        TimerWidget TimerCtrlButton {{ background-color: transparent; border: 0px; }}
+
+        {regular} #hint_head_label {{ {font} font-size: 20px; }}
+        {regular} #hint_line_edit {{
+            background: {theme.color_track};
+            border-radius: 15px;
+            {font} font-size: 20px;
+            padding: 3px 12px;
+        }}
+        {regular} TimerAddTimeButton {{
+            height: 36px;
+            {font} font-size: 20px;
+            border: 3px solid; border-radius: 12px;
+        }}
+        {regular} TimerAddTimeButton:disabled {{ border-color: {theme.color_disabled}; }}
+
+        {horizontal} #hint_head_label {{ color: {theme.color_text}; {font} font-size: 20px; }}
+        {horizontal} #text_edit_hint {{
+            {font} font-size: 18px;
+            background-color: transparent;
+            border: 3px solid {theme.color_hint}; border-radius: 12px;
+            padding: 5px;
+        }}
+        {horizontal} TimerAddTimeButton {{
+            height: 64px; width: 75px;
+            {font} font-size: 22px;
+            background-color: transparent;
+            border: 3px solid {theme.color_text};
+        }}
+        {horizontal} #minute_1_button {{ border-top-left-radius: 12px; }}
+        {horizontal} #minute_3_button {{ border-top-right-radius: 12px; }}
+        {horizontal} #minute_5_button {{ border-bottom-left-radius: 12px; }}
+        {horizontal} #minute_10_button {{ border-bottom-right-radius: 12px; }}
+        {horizontal} TimerAddTimeButton:disabled {{ border-color: {theme.color_disabled}; }}
+        {horizontal} TimerAddTimeButton:hover {{ background-color: {theme.color_focus}; }}
+    '''
+
+
+def _without_timer_section(sheet: str) -> str:
+    """ 去掉之前装入的计时器样式，保留应用自己的样式表 """
+    begin = sheet.find(STYLE_BEGIN)
+    if begin < 0:
+        return sheet
+    end = sheet.find(STYLE_END, begin)
+    rest = '' if end < 0 else sheet[end + len(STYLE_END):]
+    return sheet[:begin].rstrip('\n') + rest
+
+
+def install_stylesheet(theme: TimerTheme = DEFAULT_THEME) -> None:
+    """ 把计时器样式表装到 QApplication，整个应用只解析一次；切换主题时替换上一次装入的部分，而不是再追加一份 """
+    app = QApplication.instance()
+    if app is None or app.property(PROP_STYLE_INSTALLED) == str(theme):
+        return
+    base = _without_timer_section(app.styleSheet())
+    section = f'{STYLE_BEGIN}{build_stylesheet(theme)}{STYLE_END}'
+    app.setStyleSheet(f'{base}\n{section}' if base else section)
+    app.setProperty(PROP_STYLE_INSTALLED, str(theme))
@@ -1,21 +1,38 @@
 import os
-import platform
 import sys
-from datetime import datetime, timedelta
+import time
 from enum import Enum, auto
 from functools import partial
-from PyQt5.QtCore import Qt, QEvent, QSize, QTimer, QObject
-from PyQt5.QtGui import QColor, QFont, QIcon, QIntValidator, QPalette, QKeyEvent, QMouseEvent, QWheelEvent
+from typing import Callable, Dict, Optional
+from PyQt5.QtCore import Qt, QEvent, QFile, QSize, QObject, QTimer
+from PyQt5.QtGui import QColor, QFont, QPalette, QKeyEvent, QMouseEvent, QPaintEvent, QWheelEvent
 from PyQt5.QtWidgets import (
     QApplication, QGridLayout, QTextEdit, QWidget,
     QFrame, QHBoxLayout, QVBoxLayout,
-    QLabel, QLayout, QLineEdit, QProgressBar, QPushButton
+    QLabel, QLayout, QLineEdit, QPushButton
     )
 
-from pyqt_helper import print_key_event
-from simple_timer import SimpleTimer
-
-FONT_CN = 'Microsoft YaHei'
+from alarm_audio import get_alarm_engine
+from alarm_state import AlarmPolicy, AlarmStateMachine
+from digit_display import DigitDisplay
+from icon_registry import ICON_REGISTRY
+from input_coalescer import FrameCoalescer, WheelAccumulator
+from instance_ipc import CommandError
+from pomodoro_cycle import DEFAULT_SCHEDULE, PomodoroCycle
+from progress_strip import ProgressStrip
+from pyqt_helper import trace_key_event
+from simple_timer import NS_PER_MS, SimpleTimer
+from tick_hub import TickHub
+from tick_metrics import METRICS, MetricsOverlay, enable_metrics
+from tick_scheduler import TickPlan, plan_next_tick
+from timer_history import HistoryStore, SessionOutcomeEnum, SessionRecord, now_ms
+from timer_journal import TimerJournal, TimerState, TimerStatusEnum, default_data_dir
+from timer_render import TimerRenderer
+from timer_style import PROP_DISP_DIRECTION, install_stylesheet
+from trace_log import TRACE
+
+# 可能改变 TimerWidget 是否可见的事件，来自自身、顶层窗口或原生窗口
+VISIBILITY_EVENTS = {QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange, QEvent.Type.Expose}
 
 
 def resource_path(relative_path):
@@ -28,11 +45,31 @@ def resource_path(relative_path):
 # 使用这个函数来获取图片路径
 RES_FOLDER = resource_path('res/')
 
-ICON_CLEAR = f'{RES_FOLDER}trash.png'
-ICON_START = f'{RES_FOLDER}play-circle.png'
-ICON_PAUSE = f'{RES_FOLDER}pause-circle.png'
-ICON_RESET = f'{RES_FOLDER}rotate-left.png'
-ICON_TOMATO = f'{RES_FOLDER}pomodoro-icon.png'
+try:
+    # build_resources.py 生成的 Qt 资源模块，图标编译在程序内，启动时注册一次，之后读取不访问磁盘
+    import res_rc  # noqa: F401
+    RES_COMPILED = True
+except ImportError:
+    if hasattr(sys, '_MEIPASS'):
+        # 打包后的程序没有 res/ 目录可回退，缺少资源模块说明打包前没有运行 build_resources.py
+        raise ImportError(
+            'res_rc is missing from the frozen build, run build_resources.py before pyinstaller') from None
+    RES_COMPILED = False
+
+
+def res_path(name: str) -> str:
+    """ 图标路径：优先使用内存中的 :/res/ 资源，资源模块未生成或缺少该文件时回退到磁盘上的 res/ 目录 """
+    if RES_COMPILED and QFile.exists(f':/res/{name}'):
+        return f':/res/{name}'
+    return f'{RES_FOLDER}{name}'
+
+
+ICON_CLEAR = res_path('trash.png')
+ICON_START = res_path('play-circle.png')
+ICON_PAUSE = res_path('pause-circle.png')
+ICON_RESET = res_path('rotate-left.png')
+ICON_TOMATO = res_path('pomodoro-icon.png')
+ICONS_CTRL = (ICON_CLEAR, ICON_START, ICON_PAUSE, ICON_RESET)
 
 COLOR_WINDOW_BG = QColor('white')
 COLOR_WINDOW_BG_ALARM = QColor('mistyrose')
@@ -57,91 +94,23 @@ class TimerCtrlStateEnum(str, Enum):
 
 
 class TimerCtrlButton(QPushButton):
+    STATE_ICONS = {
+        TimerCtrlStateEnum.START: ICON_START,
+        TimerCtrlStateEnum.RESUME: ICON_START,
+        TimerCtrlStateEnum.PAUSE: ICON_PAUSE,
+    }
+
     def __init__(self, ctrl_state=TimerCtrlStateEnum.UNKNOWN, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.curr_state: TimerCtrlStateEnum = ctrl_state
 
     def set_curr_state(self, state: TimerCtrlStateEnum) -> None:
-        self.curr_state = state
-        if state in {TimerCtrlStateEnum.START, TimerCtrlStateEnum.RESUME}:
-            self.setIcon(QIcon(ICON_START))
-        elif state == TimerCtrlStateEnum.PAUSE:
-            self.setIcon(QIcon(ICON_PAUSE))
-
-
-class TimerNumberLineEdit(QLineEdit):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.setReadOnly(True)
-        self.__is_edit_allowed: bool = True
-
-    def refresh_display(self):
-        if not self.__is_edit_allowed:
-            self.clearFocus()
-
-    @property
-    def is_edit_allowed(self) -> bool:
-        return self.__is_edit_allowed
-
-    @is_edit_allowed.setter
-    def is_edit_allowed(self, is_allowed: bool) -> None:
-        self.__is_edit_allowed = is_allowed
-        self.refresh_display()
-
-    def changeEvent(self, event: QEvent):
-        super().changeEvent(event)
-        if event.type() in (event.Type.FontChange, event.Type.StyleChange):
-            self.updateGeometry()
-
-    def sizeHint(self):
-        hint = super().sizeHint()
-        charWidth = self.fontMetrics().horizontalAdvance('0')
-        width_prefered = int((charWidth * 2 * 1.25 + 10))
-        hint.setWidth(width_prefered)
-        self.setMaximumWidth(width_prefered)
-        self.setMinimumWidth(width_prefered)
-        return hint
-
-    def contextMenuEvent(self, event):
-        # 禁用右键菜单，不调用父类的 contextMenuEvent，
-        pass
-
-    def keyPressEvent(self, event: QKeyEvent) -> None:
-        print_key_event(msg='TimerNumberLineEdit.keyPressEvent', event=event)
-        if not self.is_edit_allowed:
-            self.refresh_display()
+        if state == self.curr_state:
             return
-        elif event.key() == Qt.Key.Key_Escape:
-            self.clearFocus()
-        elif event.key() in {
-            Qt.Key.Key_0, Qt.Key.Key_1, Qt.Key.Key_2, Qt.Key.Key_3, Qt.Key.Key_4,
-            Qt.Key.Key_5, Qt.Key.Key_6, Qt.Key.Key_7, Qt.Key.Key_8, Qt.Key.Key_9,
-        }:
-            text = f'{self.text()}{chr(event.key())}'[-2:]
-            self.setReadOnly(False)
-            self.setText(f'{text:02}')
-            self.setReadOnly(True)
-            return
-        elif event.key() == Qt.Key.Key_Backspace:
-            text = self.text()[:-1]
-            self.setReadOnly(False)
-            self.setText(f'{int(text):02}')
-            self.setReadOnly(True)
-            return
-        super().keyPressEvent(event)
-
-    def mouseDoubleClickEvent(self, a0: QMouseEvent) -> None:
-        # print(f'TimerNumberLineEdit.mouseDoubleClickEvent {self.is_edit_allowed}')
-        self.refresh_display()
-        return
-
-    def mousePressEvent(self, event: QMouseEvent) -> None:
-        print(f'TimerNumberLineEdit.mousePressEvent {self.is_edit_allowed}')
-        self.refresh_display()
-        if self.is_edit_allowed and event.button() == Qt.MouseButton.LeftButton:
-            self.setFocus()
-        elif self.is_edit_allowed and event.button() == Qt.MouseButton.RightButton:
-            self.setFocus()
+        icon_path = self.STATE_ICONS.get(state)
+        if icon_path is not None and icon_path != self.STATE_ICONS.get(self.curr_state):
+            self.setIcon(ICON_REGISTRY.icon(icon_path))  # 共享已解码的图标，切换状态不再读盘
+        self.curr_state = state
 
 
 class TimerAddTimeButton(QPushButton):
@@ -152,37 +121,68 @@ class TimerAddTimeButton(QPushButton):
 
 
 class TimerWidget(QWidget):
-    def __init__(self, name: str = '', disp_direction: DispDirectionEnum = DispDirectionEnum.HORIZONTAL) -> None:
+    def __init__(
+            self, name: str = '', disp_direction: DispDirectionEnum = DispDirectionEnum.HORIZONTAL,
+            hub: Optional[TickHub] = None) -> None:
         super().__init__()
         # 倒计时名字
         self.name = name
-        # UI 刷新计时
-        self.update_timer = QTimer()
-        self.update_timer_step_ms = 100
-        self.complete_notice_timer = QTimer()
+        # UI 刷新与结束提醒都由应用级 TickHub 驱动，只在下一个可见变化 (秒、倒计时结束) 时唤醒，界面不可见时只保留结束唤醒
+        self.hub = TickHub.instance() if hub is None else hub
+        self.clock = self.hub.clock
+        # 结束提醒状态机，重复间隔、退避、自动停止由 AlarmPolicy 配置
+        self.alarm = AlarmStateMachine(AlarmPolicy(repeat_interval_ms=1600), parent=self)
+        self.alarm.flash.connect(self.set_alarm_palette)
+        self.alarm.auto_stopped.connect(self.reset)
+        self.is_counting = False
+        # 操作日志，崩溃或重启后据此恢复，未设置时不记录
+        self.journal: Optional[TimerJournal] = None
+        # 历史记录，每次倒计时结束、重置、清除时写入一条，未设置时不记录
+        self.history: Optional[HistoryStore] = None
+        self.session_started_ms: Optional[int] = None
+        self.session_pause_cnt = 0
+        # 番茄钟循环，阶段结束时在同一个计时器上接着计时下一阶段；None 表示普通倒计时
+        self.cycle: Optional[PomodoroCycle] = None
+        self.phase_index = 0
         # 计时器时间输入
-        self.timer_mm_edit = TimerNumberLineEdit('00', self)
-        self.timer_ss_edit = TimerNumberLineEdit('00', self)
-        self.timer_sep_label = QLabel(':', self)
-        self.timer_progress = QProgressBar()
+        # 字形预渲染后按字符格贴图，每秒只重绘变化的数字
+        self.timer_mm_edit = DigitDisplay('00', self, focus_corner=Qt.Corner.TopLeftCorner)
+        self.timer_ss_edit = DigitDisplay('00', self, focus_corner=Qt.Corner.TopRightCorner)
+        self.timer_sep_label = DigitDisplay(':', self, max_length=1)
+        self.timer_sep_label.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.timer_sep_label.is_edit_allowed = False
+        # 自绘进度条，运行时按显示器刷新率平滑插值，只重绘填充边界附近的区域
+        self.timer_progress = ProgressStrip(self.clock)
+        self.renderer = TimerRenderer(self.timer_mm_edit, self.timer_ss_edit, self.timer_progress)
+        # 滚轮输入：按格累积 angleDelta，同一帧内的多格合并为一次时长修改
+        self.wheel_accumulators = {'mm': WheelAccumulator(), 'ss': WheelAccumulator()}
+        self.wheel_coalescer = FrameCoalescer(self.apply_wheel_steps, parent=self)
         # 计时器控制按钮
-        self.start_pause_button = TimerCtrlButton(TimerCtrlStateEnum.START, QIcon(ICON_START), '', self)
-        self.reset_button = TimerCtrlButton(TimerCtrlStateEnum.NA, QIcon(ICON_RESET), '', self)
-        self.clear_button = TimerCtrlButton(TimerCtrlStateEnum.NA, QIcon(ICON_CLEAR), '', self)
+        self.start_pause_button = TimerCtrlButton(TimerCtrlStateEnum.START, ICON_REGISTRY.icon(ICON_START), '', self)
+        self.reset_button = TimerCtrlButton(TimerCtrlStateEnum.NA, ICON_REGISTRY.icon(ICON_RESET), '', self)
+        self.clear_button = TimerCtrlButton(TimerCtrlStateEnum.NA, ICON_REGISTRY.icon(ICON_CLEAR), '', self)
         # 计时器加减时间按钮
         self.minute_1_button = TimerAddTimeButton(1 * 60, '1分', self)
         self.minute_3_button = TimerAddTimeButton(3 * 60, '3分', self)
         self.minute_5_button = TimerAddTimeButton(5 * 60, '5分', self)
         self.minute_10_button = TimerAddTimeButton(10 * 60, '10分', self)
-        self.timer = SimpleTimer()
-        self.dt_pause_start, self.dt_pause_stop = datetime.now(), datetime.now()
-        # 说明文字
+        self.timer = SimpleTimer(clock=self.clock)
+        # 说明文字，CLEAN 模式下隐藏的部分在第一次切到 FULL 模式时才创建
         self.disp_mode = DispModeEnum.CLEAN
-        self.hint_head_label = QLabel('计时提醒 :')
-        self.timer_hint_label = QLabel('鼠标点击数字+键盘 / 鼠标悬停+滚轮')
-        self.add_time_label = QLabel('左键加时长，右键减时长')
-        # 展示方向
+        self.hint_head_label: Optional[QLabel] = None
+        self.timer_hint_label: Optional[QLabel] = None
+        self.add_time_label: Optional[QLabel] = None
+        self.is_full_mode_built = False
+        self.is_deferred_setup_done = False
+        # 窗口隐藏、最小化或不可见 (被遮挡、锁屏) 时暂停界面刷新，只保留倒计时结束的精确唤醒
+        self.render_suspended = False
+        self.watched_window_handle: Optional[QObject] = None
+        # 运行指标浮窗，第一次按 F12 时创建
+        self.metrics_overlay: Optional[MetricsOverlay] = None
+        # 展示方向，样式表通过 dispDirection 属性区分两种布局
         self.disp_direction = disp_direction
+        self.setProperty(PROP_DISP_DIRECTION, disp_direction.name.lower())
+        install_stylesheet()
 
         if self.disp_direction == DispDirectionEnum.HORIZONTAL:
             self.initUiHorizontal()
@@ -202,22 +202,15 @@ class TimerWidget(QWidget):
         hbox_align_center.addStretch(1)
 
         hbox_hint = QHBoxLayout()
-        self.hint_head_label.setStyleSheet(f'font-family: {FONT_CN}; font-size: 20px; font-weight: bold;')
-        hint_line_edit = QLineEdit()
-        hint_line_edit.setStyleSheet(f'''
-                                     background: hsla(5, 0%, 85%, 45%);
-                                     border-radius: 15px;
-                                     font-family: {FONT_CN}; font-size: 20px; font-weight: bold;
-                                     padding: 3px 12px;
-                                     ''')
+        self.hint_head_label = QLabel('计时提醒 :')
+        self.hint_head_label.setObjectName('hint_head_label')
+        self.hint_edit = QLineEdit()
+        self.hint_edit.setObjectName('hint_line_edit')
         hbox_hint.addWidget(self.hint_head_label)
-        hbox_hint.addWidget(hint_line_edit)
+        hbox_hint.addWidget(self.hint_edit)
         vbox.addLayout(hbox_hint)
-
-        self.timer_hint_label = QLabel('鼠标选中数字+键盘 / 鼠标移到数字+滚轮')
-        self.timer_hint_label.setStyleSheet(f'color:gray; font-family:{FONT_CN}; font-size: 20px; font-weight: bold;')
-        self.timer_hint_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        vbox.addWidget(self.timer_hint_label)
+        self.layout_timer_hint = vbox  # timer_hint_label 在 FULL 模式时插入到 hbox_hint 之后
+        self.timer_hint_text = '鼠标选中数字+键盘 / 鼠标移到数字+滚轮'
 
         # region 元素：时间展示区
         vbox_timer_w_progress = QVBoxLayout()
@@ -239,12 +232,6 @@ class TimerWidget(QWidget):
         # endregion 元素：时间展示区
 
         self.timer_progress.setObjectName('timer_progress')
-        self.timer_progress.setTextVisible(False)
-        timer_progress_border = 'border: 1px; border-bottom-left-radius:12px; border-bottom-right-radius:12px;'
-        self.timer_progress.setStyleSheet(f'''
-                                        #timer_progress{{ background-color: hsla(5, 0%, 85%, 45%); {timer_progress_border} }}
-                                        #timer_progress::chunk{{ background-color: hsl(210, 45%, 45%); {timer_progress_border} }}
-                                        ''')  # noqa
         self.timer_progress.setFixedHeight(12)
 
         # region 元素：控制按钮
@@ -261,10 +248,7 @@ class TimerWidget(QWidget):
 
         vbox_add_time = QVBoxLayout()
         vbox_add_time.setContentsMargins(0, 0, 0, 0)
-
-        self.add_time_label.setStyleSheet(f'color:gray; font-family:{FONT_CN}; font-size: 20px; font-weight: bold;')
-        self.add_time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        vbox_add_time.addWidget(self.add_time_label)
+        self.layout_add_time = vbox_add_time
 
         hbox_add_time = QHBoxLayout()
         hbox_add_time.setSpacing(10)
@@ -279,8 +263,6 @@ class TimerWidget(QWidget):
         # endregion 元素：控制按钮
 
         # 时间展示与输入
-        self.timer_mm_edit.setValidator(QIntValidator(1, 99, self))
-        self.timer_ss_edit.setValidator(QIntValidator(1, 99, self))
         self.timer_mm_edit.wheelEvent = partial(self.handle_wheel_event_timer_edit, 'mm')
         self.timer_ss_edit.wheelEvent = partial(self.handle_wheel_event_timer_edit, 'ss')
         self.timer_sep_label.setFocus()
@@ -289,13 +271,8 @@ class TimerWidget(QWidget):
         self.timer_mm_edit.setFont(timer_font)
         self.timer_ss_edit.setFont(timer_font)
         self.timer_sep_label.setFont(timer_font)
-        self.timer_mm_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.timer_ss_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.timer_sep_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.timer_mm_edit.setText('00')
         self.timer_ss_edit.setText('00')
-        self.timer_mm_edit.setMaxLength(2)
-        self.timer_ss_edit.setMaxLength(2)
         self.timer_mm_edit.setFocus()
 
         self.timer_mm_edit.setObjectName('timer_mm_edit')
@@ -314,22 +291,6 @@ class TimerWidget(QWidget):
         p = self.palette()
         p.setColor(QPalette.ColorRole.Background, COLOR_WINDOW_BG)
         self.setPalette(p)
-        self.setStyleSheet(f'''
-                            #timer_mm_edit, #timer_ss_edit, #timer_sep_label{{
-                                background-color: transparent;
-                                border: 0px;
-                            }}
-                            #timer_mm_edit{{ border-top-left-radius: 12px; }}
-                            #timer_ss_edit{{ border-top-right-radius: 12px; }}
-                            #timer_mm_edit::focus, #timer_ss_edit::focus{{ background-color: gainsboro; }}
-                            TimerCtrlButton{{ background-color: transparent; border: 0px; }}
-                            TimerAddTimeButton{{
-                                height: 36px;
-                                font-family: {FONT_CN}; font-size: 20px; font-weight: bold;
-                                border: 3px solid; border-radius: 12px;
-                            }}
-                            TimerAddTimeButton:disabled{{ border-color: gray; }}
-                           ''')
 
         # 按钮控制
         self.start_pause_button.clicked.connect(self.start_pause)
@@ -341,8 +302,7 @@ class TimerWidget(QWidget):
         self.minute_5_button.mousePressEvent = partial(self.handle_mouse_press_event_add_time_btn, self.minute_5_button)
         self.minute_10_button.mousePressEvent = partial(self.handle_mouse_press_event_add_time_btn, self.minute_10_button)  # noqa
 
-        self.update_timer.timeout.connect(self.on_timer_timeout)
-        self.complete_notice_timer.timeout.connect(self.handle_timer_complete)
+        self.hub.register(self)
 
         self.installEventFilter(self)
         self.keyPressEvent = self.handle_key_press
@@ -368,10 +328,8 @@ class TimerWidget(QWidget):
         hbox_timer_display.addWidget(self.timer_sep_label)
         hbox_timer_display.addWidget(self.timer_ss_edit)
 
-        self.timer_hint_label.setStyleSheet(f'color:gray; font-family:{FONT_CN}; font-size: 20px; font-weight: bold;')
-        self.timer_hint_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        vbox_timer_w_progress.addWidget(self.timer_hint_label)
+        self.layout_timer_hint = vbox_timer_w_progress
+        self.timer_hint_text = '鼠标点击数字+键盘 / 鼠标悬停+滚轮'
         vbox_timer_w_progress.addLayout(hbox_timer_display)
         vbox_timer_w_progress.addWidget(self.timer_progress)
 
@@ -379,12 +337,6 @@ class TimerWidget(QWidget):
         # endregion 元素：时间展示区
 
         self.timer_progress.setObjectName('timer_progress')
-        self.timer_progress.setTextVisible(False)
-        timer_progress_border = 'border: 1px; border-bottom-left-radius:12px; border-bottom-right-radius:12px;'
-        self.timer_progress.setStyleSheet(f'''
-                                        #timer_progress{{ background-color: hsla(5, 0%, 85%, 45%); {timer_progress_border} }}
-                                        #timer_progress::chunk{{ background-color: hsl(210, 45%, 45%); {timer_progress_border} }}
-                                        ''')  # noqa
         self.timer_progress.setFixedHeight(12)
 
         # region 元素：控制按钮
@@ -403,10 +355,7 @@ class TimerWidget(QWidget):
         vbox_add_time = QVBoxLayout()
         vbox_add_time.setSpacing(0)
         vbox_add_time.setContentsMargins(0, 0, 0, 0)
-
-        self.add_time_label.setStyleSheet(f'color:gray; font-family:{FONT_CN}; font-size: 20px; font-weight: bold;')
-        self.add_time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        vbox_add_time.addWidget(self.add_time_label)
+        self.layout_add_time = vbox_add_time
 
         grid_add_time = QGridLayout()
         grid_add_time.setSpacing(5)
@@ -424,30 +373,18 @@ class TimerWidget(QWidget):
         vbox_timer_hint = QVBoxLayout()
         vbox_timer_hint.setSpacing(0)
         vbox_timer_hint.setContentsMargins(0, 0, 0, 0)
+        self.layout_hint_head = vbox_timer_hint
 
-        self.hint_head_label.setStyleSheet(f'color:black; font-family:{FONT_CN}; font-size: 20px; font-weight: bold;')
-        vbox_timer_hint.addWidget(self.hint_head_label)
-
-        text_edit_hint = QTextEdit()
-        text_edit_hint.setObjectName('text_edit_hint')
-        text_edit_hint.setPlaceholderText('提醒内容')
-        text_edit_hint.setStyleSheet(f'''
-            #text_edit_hint{{
-                font-family:{FONT_CN}; font-size: 18px; font-weight: bold;
-                background-color: transparent;
-                border: 3px solid gray; border-radius: 12px;
-                padding: 5px;
-            }}
-        ''')
-        text_edit_hint.setMaximumHeight(145)
-        vbox_timer_hint.addWidget(text_edit_hint)
+        self.hint_edit = QTextEdit()
+        self.hint_edit.setObjectName('text_edit_hint')
+        self.hint_edit.setPlaceholderText('提醒内容')
+        self.hint_edit.setMaximumHeight(145)
+        vbox_timer_hint.addWidget(self.hint_edit)
 
         hbox_align_center.addLayout(vbox_timer_hint)
         # endregion 元素：提醒输入
 
         # 时间展示与输入
-        self.timer_mm_edit.setValidator(QIntValidator(1, 99, self))
-        self.timer_ss_edit.setValidator(QIntValidator(1, 99, self))
         self.timer_mm_edit.wheelEvent = partial(self.handle_wheel_event_timer_edit, 'mm')
         self.timer_ss_edit.wheelEvent = partial(self.handle_wheel_event_timer_edit, 'ss')
         self.timer_sep_label.setFocus()
@@ -456,13 +393,8 @@ class TimerWidget(QWidget):
         self.timer_mm_edit.setFont(timer_font)
         self.timer_ss_edit.setFont(timer_font)
         self.timer_sep_label.setFont(timer_font)
-        self.timer_mm_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.timer_ss_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.timer_sep_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.timer_mm_edit.setText('00')
         self.timer_ss_edit.setText('00')
-        self.timer_mm_edit.setMaxLength(2)
-        self.timer_ss_edit.setMaxLength(2)
         self.timer_mm_edit.setFocus()
 
         self.timer_mm_edit.setObjectName('timer_mm_edit')
@@ -489,33 +421,6 @@ class TimerWidget(QWidget):
         p = self.palette()
         p.setColor(QPalette.ColorRole.Background, COLOR_WINDOW_BG)
         self.setPalette(p)
-        self.setStyleSheet(f'''
-                            #timer_mm_edit, #timer_ss_edit, #timer_sep_label{{
-                                background-color: transparent;
-                                border: 0px;
-                            }}
-                            #timer_mm_edit{{ border-top-left-radius: 12px; }}
-                            #timer_ss_edit{{ border-top-right-radius: 12px; }}
-                            #timer_mm_edit::focus, #timer_ss_edit::focus{{ background-color: gainsboro; }}
-
-                            #start_pause_button{{ background-color: transparent; border: 1px; }}
-                            #reset_button{{ background-color: transparent; border: 1px; }}
-                            #clear_button{{ background-color: transparent; border: 1px; }}
-
-                            TimerCtrlButton{{ background-color: transparent; border: 0px; }}
-                            TimerAddTimeButton{{
-                                height: 64px; width: 75px;
-                                font-family: {FONT_CN}; font-size: 22px; font-weight: bold;
-                                background-color: transparent;
-                                border: 3px solid black;
-                            }}
-                            #minute_1_button{{ border-top-left-radius: 12px; }}
-                            #minute_3_button{{ border-top-right-radius: 12px; }}
-                            #minute_5_button{{ border-bottom-left-radius: 12px; }}
-                            #minute_10_button{{ border-bottom-right-radius: 12px; }}
-                            TimerAddTimeButton:disabled{{ border-color: gray; }}
-                            TimerAddTimeButton:hover{{ background-color: gainsboro; }}
-                        ''')
 
         # 按钮控制
         self.start_pause_button.clicked.connect(self.start_pause)
@@ -527,15 +432,43 @@ class TimerWidget(QWidget):
         self.minute_5_button.mousePressEvent = partial(self.handle_mouse_press_event_add_time_btn, self.minute_5_button)
         self.minute_10_button.mousePressEvent = partial(self.handle_mouse_press_event_add_time_btn, self.minute_10_button)  # noqa
 
-        self.update_timer.timeout.connect(self.on_timer_timeout)
-        self.complete_notice_timer.timeout.connect(self.handle_timer_complete)
+        self.hub.register(self)
 
         self.installEventFilter(self)
         self.keyPressEvent = self.handle_key_press
         self.set_disp_mode()
 
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+        if not self.is_deferred_setup_done:
+            self.is_deferred_setup_done = True
+            QTimer.singleShot(0, self.deferred_setup)
+
+    def deferred_setup(self):
+        """ 首帧绘制后再做的非关键初始化：预解码暂停图标、合成提示音并打开音频输出 """
+        ICON_REGISTRY.warm_up(ICONS_CTRL)
+        get_alarm_engine()
+        if METRICS.enabled:
+            enable_metrics()  # PYQTTIMER_METRICS=1 启动时打开，补上事件循环延迟探针
+        self.watch_window_visibility()
+
+    def watch_window_visibility(self) -> None:
+        """ 监听顶层窗口的显示状态和原生窗口的 Expose 事件，作为 TimerWidget 嵌入其他窗口时同样生效 """
+        window = self.window()
+        if window is not self:
+            window.installEventFilter(self)
+        handle = window.windowHandle()
+        if handle is not None and handle is not self.watched_window_handle:
+            handle.installEventFilter(self)
+            self.watched_window_handle = handle
+        self.update_render_suspended()
+
     def eventFilter(self, obj: QObject, event: QEvent):
-        if event.type() == QEvent.Type.MouseButtonPress:
+        if event.type() == QEvent.Type.Show:
+            self.watch_window_visibility()  # 原生窗口在第一次显示或窗口标志变化时才 (重新) 创建
+        elif event.type() in VISIBILITY_EVENTS:
+            self.update_render_suspended()
+        elif event.type() == QEvent.Type.MouseButtonPress:
             if obj in {self.timer_mm_edit, self.timer_ss_edit}:
                 return True
             self.timer_mm_edit.clearFocus()
@@ -545,12 +478,25 @@ class TimerWidget(QWidget):
     def handle_key_press(self, event: QKeyEvent):
         """ 处理 各种按键
         1. 计时器结束，正在播放提示时，可 Esc 停止
+        2. F11 切换显示模式
+        3. F12 显示/隐藏运行指标 (首次显示时开始记录)，Shift+F12 导出指标文本文件，Ctrl+F12 导出跟踪记录
+        4. 未开始时 P 开始默认番茄钟循环 (25/5/25/5/25/15)
         """
-        print_key_event(msg=f'TimerWidget{self.name}.handle_key_press', event=event)
-        if self.complete_notice_timer.isActive() and event.key() == Qt.Key.Key_Escape:
+        if TRACE.debug_on:
+            trace_key_event(f'TimerWidget{self.name}.handle_key_press', event)
+        if self.is_alarm_ringing() and event.key() == Qt.Key.Key_Escape:
             self.reset()
         if event.key() == Qt.Key.Key_F11:
             self.toggle_display_mode()
+        if event.key() == Qt.Key.Key_F12:
+            if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+                self.dump_trace()
+            elif event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self.export_metrics()
+            else:
+                self.toggle_metrics_overlay()
+        if event.key() == Qt.Key.Key_P and self.start_pause_button.curr_state == TimerCtrlStateEnum.START:
+            self.start_cycle(PomodoroCycle.parse(DEFAULT_SCHEDULE))
 
     def handle_mouse_press_event_add_time_btn(self, btn: TimerAddTimeButton, event: QMouseEvent):
         """ 处理 增减时间按钮 鼠标行为，左键加时长，右键减时长 """
@@ -563,20 +509,25 @@ class TimerWidget(QWidget):
 
     def handle_wheel_event_timer_edit(self, unit: str, event: QWheelEvent):
         """ 处理 计时器输入框 滚轮行为 """
-        # print('[handle_wheel_event_timer_edit]', event.angleDelta().y())
-        if self.update_timer.isActive() or self.complete_notice_timer.isActive():
+        if self.hub.is_active(self):
             return
-        delta = -1 if event.angleDelta().y() < 0 else 1
-        if unit == 'mm' and self.timer_mm_edit.is_edit_allowed:
-            self.add_to_total_seconds(minute=delta)
-        elif unit == 'ss' and self.timer_ss_edit.is_edit_allowed:
-            self.add_to_total_seconds(minute=0, second=delta)
+        edit = self.timer_mm_edit if unit == 'mm' else self.timer_ss_edit
+        if not edit.is_edit_allowed:
+            return
+        steps = self.wheel_accumulators[unit].add(event.angleDelta().y())
+        if steps:
+            self.wheel_coalescer.push(unit, steps)
+
+    def apply_wheel_steps(self, steps: Dict[str, int]) -> None:
+        """ 一帧内合并后的滚轮格数，超出范围时夹到 0 ~ 99 分钟 """
+        if self.hub.is_active(self):
+            return
+        total_seconds = self.edit_total_seconds() + steps.get('mm', 0) * 60 + steps.get('ss', 0)
+        self.refresh_timer_display(seconds=min(max(total_seconds, 0), 99 * 60))
 
     def add_to_total_seconds(self, minute: int, second: int = 0) -> None:
         """ 增加计时器时长 """
-        mm = 0 if not self.timer_mm_edit.text() else int(self.timer_mm_edit.text())
-        ss = 0 if not self.timer_ss_edit.text() else int(self.timer_ss_edit.text())
-        total_seconds = mm * 60 + ss + minute * 60 + second
+        total_seconds = self.edit_total_seconds() + minute * 60 + second
         if total_seconds < 0 or total_seconds > 99 * 60:
             return
         self.refresh_timer_display(seconds=total_seconds)
@@ -621,37 +572,51 @@ class TimerWidget(QWidget):
     # region 计时控制功能
     def start(self) -> bool:
         """ 倒计时开始 """
-        mm = 0 if not self.timer_mm_edit.text() else int(self.timer_mm_edit.text())
-        ss = 0 if not self.timer_ss_edit.text() else int(self.timer_ss_edit.text())
-        total_seconds = mm * 60 + ss
-        dt_start, dt_stop = datetime.now(), datetime.now() + timedelta(seconds=total_seconds)
-        # print(f'[start] mm: {mm}, ss: {ss}, total_second: {total_seconds}, curr_ts: {self.timer.dt_start.isoformat()}, ts: {self.timer.dt_stop.isoformat()}')  # noqa
-        if dt_start == dt_stop:
+        self.wheel_coalescer.flush()  # 还没处理的滚轮输入先生效
+        total_seconds = self.edit_total_seconds()
+        if total_seconds == 0:
             return False
-        self.timer = SimpleTimer(dt_start, dt_stop)
-        self.reset()  # 先重置显示
+        self.timer = SimpleTimer.from_duration(total_seconds * 1000, clock=self.clock)
+        self.reset_timer()  # 先重置显示，不记录 reset 事件
         self.enable_change_time(False)
-        self.update_timer.start(self.update_timer_step_ms)
+        self.is_counting = True
+        self.session_started_ms, self.session_pause_cnt = now_ms(), 0
+        self.refresh_timer_progress()
+        self.hub.reschedule(self, self.timer.ns_start)
+        self.journal_event('start')
         return True
 
-    def pause(self) -> bool:
+    def pause(self, ns_now: Optional[int] = None) -> bool:
         """ 倒计时暂停 """
-        self.timer.pause()
-        # self.dt_pause_start = datetime.now()
-        self.update_timer.stop()
-        self.complete_notice_timer.stop()
+        if self.is_counting and not self.timer.is_time_up():
+            self.session_pause_cnt += 1
+        ns_now = self.timer.pause(ns_now)
+        self.is_counting = False
+        self.alarm.stop()
+        self.refresh_timer_progress()
+        self.hub.reschedule(self, ns_now)
+        self.journal_event('pause')
         return True
 
-    def resume(self) -> bool:
+    def resume(self, ns_now: Optional[int] = None) -> bool:
         """ 倒计时继续 """
-        self.timer.resume()
-        self.update_timer.start(self.update_timer_step_ms)
+        ns_now = self.timer.resume(ns_now)
+        self.is_counting = True
+        self.refresh_timer_progress()
+        self.hub.reschedule(self, ns_now)
+        self.journal_event('resume')
         return True
 
     def reset(self):
         """ 倒计时重置 """
-        self.update_timer.stop()
-        self.complete_notice_timer.stop()
+        self.record_session(SessionOutcomeEnum.RESET)
+        self.reset_timer()
+        self.journal_event('reset')
+
+    def reset_timer(self):
+        """ 计时器恢复到完整时长并刷新显示，不写历史记录和操作日志 """
+        self.is_counting = False
+        self.alarm.stop()
         self.timer.reset()
         total_seconds = self.timer.sec_total()
         # print(f'[reset]: {total_seconds // 3600:02}:{total_seconds % 3600 // 60:02}:{total_seconds % 60:02}')
@@ -659,74 +624,346 @@ class TimerWidget(QWidget):
         self.start_pause_button.set_curr_state(TimerCtrlStateEnum.START)
         self.refresh_timer_display(total_seconds)
         self.refresh_timer_progress(0)
+        self.hub.reschedule(self)
 
     def clear(self):
         """ 倒计时清除 """
+        self.record_session(SessionOutcomeEnum.CLEARED)
         self.enable_change_time(True)
         self.start_pause_button.set_curr_state(TimerCtrlStateEnum.START)
-        self.update_timer.stop()
-        self.complete_notice_timer.stop()
-        self.timer = SimpleTimer()
+        self.is_counting = False
+        self.alarm.stop()
+        self.cycle, self.phase_index = None, 0
+        self.timer = SimpleTimer(clock=self.clock)
         self.refresh_timer_display(0)
         self.refresh_timer_progress(0)
+        self.hub.reschedule(self)
+        self.journal_event('clear')
     # endregion 计时控制功能
 
+    # region 番茄钟循环
+    def start_cycle(self, cycle: PomodoroCycle, index: int = 0) -> bool:
+        """ 从第 index 个阶段开始循环，之后的阶段自动接续，不需要再输入时长和点开始 """
+        if self.start_pause_button.curr_state != TimerCtrlStateEnum.START:
+            return False
+        self.refresh_timer_display(cycle.phases[index].ms // 1000)
+        # start() 写入的 start 事件要带上循环状态，先设置，启动失败时清除
+        self.cycle, self.phase_index = cycle, index
+        if not self.start():
+            self.cycle, self.phase_index = None, 0
+            return False
+        self.flip_start_pause_button()
+        return True
+
+    def cycle_state(self) -> Dict:
+        return {**self.cycle.to_dict(), 'index': self.phase_index}
+
+    def advance_phase(self, ns_now: int) -> bool:
+        """ 当前阶段结束，在同一条时间线上切到下一阶段：新阶段的开始时刻就是当前阶段的结束时刻，不取新的当前时间
+        错过了不止一个阶段 (系统睡眠、程序未运行) 时按累计偏移二分定位，直接跳到现在所在的阶段；循环已结束返回 False
+        """
+        cycle = self.cycle
+        ns_origin = self.timer.ns_stop - cycle.end_ms(self.phase_index) * NS_PER_MS
+        located = cycle.locate((ns_now - ns_origin) // NS_PER_MS)
+        if located is None:
+            return False
+        METRICS.record('timer.complete_late', ns_now - self.timer.ns_stop)
+        self.record_session(SessionOutcomeEnum.COMPLETED)
+        self.phase_index = located[0]
+        self.timer.ns_start = ns_origin + cycle.start_ms(self.phase_index) * NS_PER_MS
+        self.timer.ns_stop = ns_origin + cycle.end_ms(self.phase_index) * NS_PER_MS
+        self.session_started_ms, self.session_pause_cnt = now_ms() - located[1], 0
+        if TRACE.info_on:
+            TRACE.info('TimerWidget.cycle', 'name=%r phase=%d/%d %s', self.name, self.phase_index + 1, len(cycle),
+                       cycle.phases[self.phase_index].kind.value)
+        self.alarm.chime()
+        self.refresh_timer_display(self.timer.sec_remain())
+        self.refresh_timer_progress()
+        self.journal_event('phase')
+        self.hub.reschedule(self, ns_now)
+        return True
+    # endregion 番茄钟循环
+
+    # region 操作日志、历史记录与恢复
+    def hint_text(self) -> str:
+        if isinstance(self.hint_edit, QTextEdit):
+            return self.hint_edit.toPlainText()
+        return self.hint_edit.text()
+
+    def set_hint_text(self, text: str) -> None:
+        if isinstance(self.hint_edit, QTextEdit):
+            self.hint_edit.setPlainText(text)
+        else:
+            self.hint_edit.setText(text)
+
+    def journal_event(self, ev: str) -> None:
+        if self.journal is None:
+            return
+        cycle = {} if self.cycle is None else {'cycle': self.cycle_state()}
+        self.journal.record(
+            self.name, ev, ms_total=self.timer.ms_total(), ms_remain=max(self.timer.ms_remain(), 0),
+            hint=self.hint_text(), **cycle)
+
+    def record_session(self, outcome: SessionOutcomeEnum) -> None:
+        """ 本次倒计时结束 (完成、重置或清除)，写入历史记录 """
+        if self.session_started_ms is None:
+            return
+        started_ms, self.session_started_ms = self.session_started_ms, None
+        if self.history is None:
+            return
+        self.history.add(SessionRecord(
+            timer=self.name, label=self.hint_text().strip().split('\n', 1)[0][:100],
+            started_at=started_ms, ended_at=now_ms(),
+            planned_ms=self.timer.ms_total(), focus_ms=min(max(self.timer.ms_passed(), 0), self.timer.ms_total()),
+            pause_cnt=self.session_pause_cnt, outcome=outcome.value))
+
+    def restore_state(self, state: TimerState) -> None:
+        """ 按日志中的状态恢复计时器；运行中的计时器按墙上时间扣除程序未运行期间流逝的时长 """
+        journal, self.journal = self.journal, None  # 恢复过程不再重复记录
+        try:
+            self.set_hint_text(state.hint)
+            if state.cycle:
+                # 循环中途恢复：程序未运行期间错过的阶段在第一次 tick 时按累计偏移跳过
+                self.cycle, self.phase_index = PomodoroCycle.from_dict(state.cycle), int(state.cycle['index'])
+            self.timer = SimpleTimer.from_duration(state.ms_total, clock=self.clock)
+            self.reset()
+            if state.status == TimerStatusEnum.IDLE or state.ms_total <= 0:
+                return
+            ns_now = self.timer.now_ns()
+            self.timer.ns_stop = ns_now + state.remaining_ms() * NS_PER_MS
+            self.timer.ns_start = self.timer.ns_stop - state.ms_total * NS_PER_MS
+            self.enable_change_time(False)
+            self.session_started_ms = now_ms() - max(state.ms_total - state.remaining_ms(), 0)
+            self.session_pause_cnt = 0
+            if state.status == TimerStatusEnum.RUNNING:
+                self.start_pause_button.set_curr_state(TimerCtrlStateEnum.PAUSE)
+                self.is_counting = True
+            else:
+                self.timer.pause(ns_now)
+                self.start_pause_button.set_curr_state(TimerCtrlStateEnum.RESUME)
+            self.refresh_timer_display(self.timer.sec_remain())
+            self.refresh_timer_progress()
+            self.hub.reschedule(self, ns_now)
+        finally:
+            self.journal = journal
+    # endregion 操作日志、历史记录与恢复
+
+    # region 本地控制命令
+    def command_handlers(self) -> Dict[str, Callable[..., Optional[Dict]]]:
+        """ instance_ipc 命令表，命令在主线程执行，效果与点击对应按钮相同 """
+        return {
+            'start': self.command_start,
+            'pause': self.command_pause,
+            'resume': self.command_resume,
+            'reset': self.command_reset,
+            'add-seconds': self.command_add_seconds,
+            'query': self.query_state,
+            'activate': self.command_activate,
+            'cycle': self.command_cycle,
+        }
+
+    def query_state(self) -> Dict:
+        state = self.start_pause_button.curr_state
+        if state == TimerCtrlStateEnum.START:
+            ms_total = ms_remain = self.edit_total_seconds() * 1000
+        else:
+            with self.timer.snapshot():
+                ms_total, ms_remain = self.timer.ms_total(), max(self.timer.ms_remain(), 0)
+        return {
+            'name': self.name, 'state': state.value, 'ms_total': ms_total, 'ms_remain': ms_remain,
+            'ringing': self.is_alarm_ringing(), 'hint': self.hint_text(),
+            'cycle': None if self.cycle is None else {
+                'schedule': self.cycle.spec(), 'index': self.phase_index,
+                'phase': self.cycle.phases[self.phase_index].kind.value},
+        }
+
+    def edit_total_seconds(self) -> int:
+        """ 当前显示的秒数，由 renderer 保存为整数，不再解析输入框文字 """
+        return self.renderer.seconds
+
+    def command_start(self, minutes: Optional[int] = None, seconds: int = 0) -> Dict:
+        if self.start_pause_button.curr_state != TimerCtrlStateEnum.START:
+            raise CommandError('timer is already started, reset it first')
+        if minutes is not None:
+            total_seconds = int(minutes) * 60 + int(seconds)
+            if not 0 < total_seconds <= 99 * 60:
+                raise CommandError('duration must be between 1 second and 99 minutes')
+            self.refresh_timer_display(total_seconds)
+        self.start_pause()
+        if self.start_pause_button.curr_state == TimerCtrlStateEnum.START:
+            raise CommandError('duration is zero')
+        return self.query_state()
+
+    def command_cycle(self, schedule: str = DEFAULT_SCHEDULE) -> Dict:
+        if self.start_pause_button.curr_state != TimerCtrlStateEnum.START:
+            raise CommandError('timer is already started, reset it first')
+        self.start_cycle(PomodoroCycle.parse(schedule))
+        return self.query_state()
+
+    def command_pause(self) -> Dict:
+        if self.start_pause_button.curr_state != TimerCtrlStateEnum.PAUSE:
+            raise CommandError('timer is not running')
+        self.start_pause()
+        return self.query_state()
+
+    def command_resume(self) -> Dict:
+        if self.start_pause_button.curr_state != TimerCtrlStateEnum.RESUME:
+            raise CommandError('timer is not paused')
+        self.start_pause()
+        return self.query_state()
+
+    def command_reset(self) -> Dict:
+        self.reset()
+        return self.query_state()
+
+    def command_add_seconds(self, seconds: int) -> Dict:
+        if not self.timer_mm_edit.is_edit_allowed:
+            raise CommandError('duration can only be changed before start')
+        if not 0 <= self.edit_total_seconds() + int(seconds) <= 99 * 60:
+            raise CommandError('duration must be between 0 and 99 minutes')
+        self.add_to_total_seconds(minute=0, second=int(seconds))
+        return self.query_state()
+
+    def command_activate(self) -> Dict:
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        return self.query_state()
+    # endregion 本地控制命令
+
+    def toggle_metrics_overlay(self) -> None:
+        if self.metrics_overlay is None:
+            self.metrics_overlay = MetricsOverlay(self)
+        self.metrics_overlay.toggle()
+
+    def export_metrics(self, path: Optional[str] = None) -> str:
+        if path is None:
+            path = os.path.join(default_data_dir(), f'metrics-{time.strftime("%Y%m%d-%H%M%S")}.txt')
+        return METRICS.export(path)
+
+    def dump_trace(self, path: Optional[str] = None) -> str:
+        if path is None:
+            path = os.path.join(default_data_dir(), f'trace-{time.strftime("%Y%m%d-%H%M%S")}.log')
+        TRACE.dump(path)
+        return path
+
+    @METRICS.timed('widget.refresh_display')
     def refresh_timer_display(self, seconds: int = None) -> None:
         """ 倒计时剩余时间 显示更新 """
         seconds = self.timer.sec_total() if seconds is None else seconds
-        mm = seconds // 60
-        ss = seconds % 60
-        self.timer_mm_edit.setText(f'{mm:02}')
-        self.timer_ss_edit.setText(f'{ss:02}')
+        self.renderer.render_time(seconds)
 
+    @METRICS.timed('widget.refresh_progress')
     def refresh_timer_progress(self, millisec_remain: int = None):
-        """ 倒计时进度条 显示更新 """
-        millisec_remain = millisec_remain if millisec_remain is not None else self.timer.ms_remain()
-        if self.start_pause_button.curr_state == TimerCtrlStateEnum.START:
-            self.timer_progress.reset()
-        else:
-            self.timer_progress.setMaximum(self.timer.ms_total())
-            self.timer_progress.setValue(millisec_remain)
-            # print(f'[refresh_timer_progress] max:{self.timer_progress.maximum()} val:{self.timer_progress.value()}')
+        """ 倒计时进度条 更新锚点，两次更新之间由进度条自己逐帧插值 """
+        if self.start_pause_button.curr_state == TimerCtrlStateEnum.START and not self.is_counting:
+            self.renderer.reset_progress()
+            return
+        with self.timer.snapshot() as ns_now:
+            ns_remain = self.timer.ns_remain() if millisec_remain is None else millisec_remain * NS_PER_MS
+            self.renderer.render_progress(
+                ns_remain, self.timer.ns_stop - self.timer.ns_start, self.is_counting, ns_now)
 
-    def on_timer_timeout(self):
-        """ 倒计时结束 主线程行为 """
-        # print(f'[on_timer_timeout], {self.timer.dt_stop.isoformat()} {datetime.now().isoformat()} {self.timer.ms_remain()}')  # noqa
-        self.refresh_timer_display(self.timer.sec_remain())
-        self.refresh_timer_progress(self.timer.ms_remain())
-        if self.timer.is_time_up():
-            # 倒计时结束
-            self.pause()
-            self.start_pause_button.setEnabled(False)
-            self.handle_timer_complete()
-            self.complete_notice_timer.start(1600)
-            self.raise_()
-            self.show()
-            self.activateWindow()
-
-    def handle_timer_complete(self):
-        import threading
-        threading.Thread(target=self.timer_complete_worker).start()
-
-    def timer_complete_worker(self):
-        """ 倒计时结束 子线程行为 """
-        p = self.palette()
-        p.setColor(QPalette.ColorRole.Background, COLOR_WINDOW_BG_ALARM)
-        self.setPalette(p)
+    # region TickHub 回调
+    def is_running(self) -> bool:
+        return self.is_counting
 
-        duration = 200  # milliseconds
-        freq = 450  # Hz
-        repeat_cnt = 3
-        if platform.system() == 'Windows':
-            import winsound
-            for _ in range(repeat_cnt):
-                winsound.Beep(freq, duration)
-        else:
-            import os
-            for _ in range(repeat_cnt):
-                os.system('play -nq -t alsa synth {} sine {}'.format(duration, freq))
+    def is_alarm_ringing(self) -> bool:
+        return self.alarm.is_ringing()
 
-        p.setColor(QPalette.ColorRole.Background, COLOR_WINDOW_BG)
+    def plan_tick(self, ns_now: int) -> Optional[TickPlan]:
+        """ 下一次唤醒：结束提醒的下一声，或倒计时的下一秒；只有倒计时结束需要精确定时
+        进度条的逐像素变化由 ProgressStrip 在 FrameDriver 上自己驱动，这里不再为它唤醒
+        """
+        if self.is_alarm_ringing():
+            return TickPlan(max(-(-(self.alarm.next_deadline_ns() - ns_now) // NS_PER_MS), 0), False)
+        if not self.is_running():
+            return None
+        with self.timer.snapshot(ns_now):
+            if self.render_suspended:
+                # 界面不可见，只在倒计时结束时唤醒
+                ns_remain = self.timer.ns_remain()
+                return TickPlan(max(-(-ns_remain // NS_PER_MS), 0), True)
+            return plan_next_tick(self.timer)
+
+    def on_hub_tick(self, ns_now: int) -> None:
+        if self.is_alarm_ringing():
+            self.alarm.on_tick(ns_now)
+            return
+        if self.render_suspended:
+            with self.timer.snapshot(ns_now):
+                if not self.timer.is_time_up():
+                    return
+        self.on_timer_timeout(ns_now)
+
+    def hub_pause(self, ns_now: int) -> bool:
+        if not self.is_running():
+            return False
+        self.pause(ns_now)
+        self.flip_start_pause_button()
+        return True
+
+    def hub_resume(self, ns_now: int) -> bool:
+        if self.start_pause_button.curr_state != TimerCtrlStateEnum.RESUME:
+            return False
+        self.resume(ns_now)
+        self.flip_start_pause_button()
+        return True
+    # endregion TickHub 回调
+
+    # region 可见性
+    def is_render_visible(self) -> bool:
+        if not self.isVisible():
+            return False
+        window = self.window()
+        if window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def update_render_suspended(self) -> None:
+        """ 可见性变化时切换刷新模式；重新可见时按当前时间补一次渲染 """
+        suspended = not self.is_render_visible()
+        if suspended == self.render_suspended:
+            return
+        self.render_suspended = suspended
+        if TRACE.debug_on:
+            TRACE.debug('TimerWidget.visibility', 'name=%r suspended=%s', self.name, suspended)
+        self.timer_progress.set_suspended(suspended)
+        if not self.is_running():
+            return
+        with self.timer.snapshot() as ns_now:
+            if not suspended:
+                self.refresh_timer_display(self.timer.sec_remain())
+                self.refresh_timer_progress()
+            self.hub.reschedule(self, ns_now)
+    # endregion 可见性
+
+    @METRICS.timed('widget.on_timeout')
+    def on_timer_timeout(self, ns_now: Optional[int] = None):
+        """ 倒计时结束 主线程行为 """
+        with self.timer.snapshot(ns_now) as ns_now:  # 本次 tick 内的查询共用同一个时间快照
+            if self.cycle is not None and self.timer.is_time_up() and self.advance_phase(ns_now):
+                return
+            self.refresh_timer_display(self.timer.sec_remain())
+            self.refresh_timer_progress()
+            if self.timer.is_time_up():
+                # 倒计时结束，记录实际处理时刻比结束时刻晚了多少
+                METRICS.record('timer.complete_late', ns_now - self.timer.ns_stop)
+                self.pause(ns_now)
+                self.start_pause_button.setEnabled(False)
+                self.alarm.start(ns_now)
+                self.journal_event('complete')
+                self.record_session(SessionOutcomeEnum.COMPLETED)
+                self.cycle, self.phase_index = None, 0
+                self.hub.reschedule(self, ns_now)
+                self.raise_()
+                self.show()
+                self.activateWindow()
+
+    def set_alarm_palette(self, is_alarm: bool) -> None:
+        p = self.palette()
+        p.setColor(QPalette.ColorRole.Background, COLOR_WINDOW_BG_ALARM if is_alarm else COLOR_WINDOW_BG)
         self.setPalette(p)
 
     def set_disp_mode(self):
@@ -735,25 +972,47 @@ class TimerWidget(QWidget):
         elif self.disp_mode == DispModeEnum.FULL:
             self.set_disp_mode_full()
 
+    def build_full_mode_widgets(self):
+        """ 创建只在 FULL 模式显示的说明文字，第一次切到 FULL 模式时调用 """
+        if self.is_full_mode_built:
+            return
+        self.is_full_mode_built = True
+        self.timer_hint_label = QLabel(self.timer_hint_text, self)
+        self.timer_hint_label.setObjectName('timer_hint_label')
+        self.timer_hint_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.add_time_label = QLabel('左键加时长，右键减时长', self)
+        self.add_time_label.setObjectName('add_time_label')
+        self.add_time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.layout_add_time.insertWidget(0, self.add_time_label)
+        if self.disp_direction == DispDirectionEnum.HORIZONTAL:
+            self.layout_timer_hint.insertWidget(0, self.timer_hint_label)
+            self.hint_head_label = QLabel('计时提醒 :', self)
+            self.hint_head_label.setObjectName('hint_head_label')
+            self.layout_hint_head.insertWidget(0, self.hint_head_label)
+        else:
+            self.layout_timer_hint.insertWidget(1, self.timer_hint_label)
+
     def set_disp_mode_clean(self):
         self.disp_mode = DispModeEnum.CLEAN
-        self.timer_hint_label.hide()
-        self.add_time_label.hide()
+        if self.is_full_mode_built:
+            self.timer_hint_label.hide()
+            self.add_time_label.hide()
+            if self.disp_direction == DispDirectionEnum.HORIZONTAL:
+                self.hint_head_label.hide()
         self.adjustSize()
         # self.resize(self.layout().sizeHint())
         # self.setFixedSize(self.layout().sizeHint())
-        if self.disp_direction == DispDirectionEnum.HORIZONTAL:
-            self.hint_head_label.hide()
 
     def set_disp_mode_full(self):
         self.disp_mode = DispModeEnum.FULL
+        self.build_full_mode_widgets()
         self.timer_hint_label.show()
         self.add_time_label.show()
+        if self.disp_direction == DispDirectionEnum.HORIZONTAL:
+            self.hint_head_label.show()
         self.adjustSize()
         # self.resize(self.layout().sizeHint())
         # self.setFixedSize(self.layout().sizeHint())
-        if self.disp_direction == DispDirectionEnum.HORIZONTAL:
-            self.hint_head_label.show()
 
     def toggle_display_mode(self):
         if self.disp_mode == DispModeEnum.CLEAN:
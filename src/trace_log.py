@@ -0,0 +1,100 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Callable, Deque, IO, List, Optional, Tuple, Union
+
+
+class TraceLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+# (ns, level, thread, event, msg, args)：记录时只保存原始参数，dump 时才格式化
+TraceRecord = Tuple[int, TraceLevel, str, str, Union[str, Callable[..., str]], tuple]
+
+
+class Tracer:
+    """ 结构化事件跟踪
+    - 记录写入定长 deque (append 在 GIL 下是原子的，不需要加锁)，满了自动丢弃最旧的，需要时再 dump
+    - msg 可以是 % 格式字符串或返回字符串的函数，格式化推迟到 dump / echo 时
+    - 热路径先判断 debug_on 等布尔属性，关闭时只有一次属性读取
+    - echo 为 True 时同时写到 stderr (--noconsole 打包后 stderr 为 None，自动跳过)
+    """
+
+    def __init__(self, level: TraceLevel = TraceLevel.INFO, capacity: int = 4096, echo: bool = False) -> None:
+        self.records: Deque[TraceRecord] = deque(maxlen=capacity)
+        self.echo = echo
+        self.level = TraceLevel.OFF
+        self.debug_on = self.info_on = False
+        self.set_level(level)
+
+    def set_level(self, level: TraceLevel) -> None:
+        self.level = level
+        self.debug_on = level <= TraceLevel.DEBUG
+        self.info_on = level <= TraceLevel.INFO
+
+    def log(self, level: TraceLevel, event: str, msg: Union[str, Callable[..., str]] = '', *args) -> None:
+        if level < self.level:
+            return
+        record = (time.time_ns(), level, threading.current_thread().name, event, msg, args)
+        self.records.append(record)
+        if self.echo and sys.stderr is not None:
+            print(format_record(record), file=sys.stderr)
+
+    def debug(self, event: str, msg: Union[str, Callable[..., str]] = '', *args) -> None:
+        self.log(TraceLevel.DEBUG, event, msg, *args)
+
+    def info(self, event: str, msg: Union[str, Callable[..., str]] = '', *args) -> None:
+        self.log(TraceLevel.INFO, event, msg, *args)
+
+    def warning(self, event: str, msg: Union[str, Callable[..., str]] = '', *args) -> None:
+        self.log(TraceLevel.WARNING, event, msg, *args)
+
+    def error(self, event: str, msg: Union[str, Callable[..., str]] = '', *args) -> None:
+        self.log(TraceLevel.ERROR, event, msg, *args)
+
+    def lines(self) -> List[str]:
+        return [format_record(record) for record in list(self.records)]
+
+    def dump(self, target: Union[str, IO[str], None] = None) -> Optional[str]:
+        """ 把缓冲区内的记录写到文件路径或文本流，target 为 None 时返回字符串 """
+        text = ''.join(f'{line}\n' for line in self.lines())
+        if target is None:
+            return text
+        if isinstance(target, str):
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            target.write(text)
+        return None
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+def format_record(record: TraceRecord) -> str:
+    ns, level, thread, event, msg, args = record
+    try:
+        text = msg(*args) if callable(msg) else (msg % args if args else msg)
+    except Exception as e:  # 格式化失败不影响 dump 其余记录
+        text = f'<format error: {e!r}> {msg!r} {args!r}'
+    stamp = time.strftime('%H:%M:%S', time.localtime(ns // 1_000_000_000))
+    return f'{stamp}.{ns // 1_000_000 % 1000:03} {level.name:<7} [{thread}] {event} {text}'.rstrip()
+
+
+def _level_from_env(value: Optional[str]) -> TraceLevel:
+    try:
+        return TraceLevel[value.upper()] if value else TraceLevel.INFO
+    except KeyError:
+        return TraceLevel.INFO
+
+
+# PYQTTIMER_TRACE=debug|info|warning|error|off 设置级别，设置了就同时输出到 stderr
+TRACE = Tracer(_level_from_env(os.environ.get('PYQTTIMER_TRACE')), echo=bool(os.environ.get('PYQTTIMER_TRACE')))
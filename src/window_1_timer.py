@@ -1,36 +1,138 @@
-from functools import partial
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QIcon, QMouseEvent
-from PyQt5.QtWidgets import QApplication, QMainWindow
+import time
+T0_NS = time.perf_counter_ns()  # 启动计时起点，放在最前面以包含 PyQt5 的导入耗时
 
-from timer_widget import TimerWidget, ICON_TOMATO
+import sys  # noqa: E402
+if __name__ == '__main__':
+    # 单实例：已有实例在运行时，把参数转发给它后立即退出，不加载 PyQt5
+    from instance_ipc import forward_and_report
+    exit_code = forward_and_report(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+from functools import partial  # noqa: E402
+from typing import Optional  # noqa: E402
+from PyQt5.QtCore import Qt, QPoint, QTimer  # noqa: E402
+from PyQt5.QtGui import QMouseEvent  # noqa: E402
+from PyQt5.QtWidgets import (  # noqa: E402
+    QApplication, QHBoxLayout, QLineEdit, QMainWindow, QPushButton, QSpinBox, QVBoxLayout, QWidget)
+
+from icon_registry import ICON_REGISTRY  # noqa: E402
+from input_coalescer import FrameCoalescer  # noqa: E402
+from instance_ipc import InstanceServer, dispatch, forward_and_report, parse_argv  # noqa: E402
+from pyqt_helper import FirstFrameProbe  # noqa: E402
+from tick_hub import TickHub  # noqa: E402
+from timer_dashboard import TimerDashboardView, TimerListModel  # noqa: E402
+from timer_history import HistoryStore  # noqa: E402
+from timer_journal import TimerJournal  # noqa: E402
+from timer_widget import TimerWidget, ICON_TOMATO  # noqa: E402
+from trace_log import TRACE  # noqa: E402
 
 
 class OneTimerWindow(QMainWindow):
-    def __init__(self):
+    """ 多计时器看板：计时器是模型中的行，由委托绘制可见行，不为每个计时器创建 TimerWidget """
+
+    def __init__(self, hub: Optional[TickHub] = None):
         super().__init__()
+        self.hub = TickHub.instance() if hub is None else hub
+        self.model = TimerListModel(self.hub.clock, self)
         self.initUi()
 
     def initUi(self):
-        pass
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText('名称')
+        self.minutes_spin = QSpinBox()
+        self.minutes_spin.setRange(1, 999)
+        self.minutes_spin.setValue(25)
+        self.minutes_spin.setSuffix(' 分钟')
+        add_btn = QPushButton('添加')
+        add_btn.clicked.connect(self.add_timer_from_input)
+        pause_all_btn = QPushButton('全部暂停')
+        pause_all_btn.clicked.connect(self.hub.pause_all)
+        resume_all_btn = QPushButton('全部继续')
+        resume_all_btn.clicked.connect(self.hub.resume_all)
+
+        layout_ctrl = QHBoxLayout()
+        for widget in (self.name_edit, self.minutes_spin, add_btn, pause_all_btn, resume_all_btn):
+            layout_ctrl.addWidget(widget)
+        self.view = TimerDashboardView(self.model, self.hub)
+
+        layout = QVBoxLayout()
+        layout.addLayout(layout_ctrl)
+        layout.addWidget(self.view)
+        central = QWidget()
+        central.setLayout(layout)
+        self.setCentralWidget(central)
+        self.resize(480, 640)
+
+    def add_timer(self, name: str, minutes: int, start: bool = True) -> int:
+        return self.model.add_timer(name, minutes * 60_000, start=start)
+
+    def add_timer_from_input(self):
+        name = self.name_edit.text().strip() or f'计时器 {self.model.rowCount() + 1}'
+        self.add_timer(name, self.minutes_spin.value())
+        self.name_edit.clear()
+
+    def command_activate(self):
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        return {'timers': self.model.rowCount()}
+
+
+def listen_or_exit(server: InstanceServer) -> None:
+    """ 开始监听，失败时退出，保证只有一个实例
+    失败多半是同时启动的另一个进程抢先开始了监听：把参数转发给它后按它的响应退出；转发也失败时报错退出
+    """
+    if server.listen():
+        return
+    exit_code = forward_and_report(sys.argv[1:])
+    if exit_code is None:
+        TRACE.error('instance', 'listen on %s failed: %s', server.address, server.error_string())
+        if sys.stderr is not None:
+            print(f'error: cannot listen on {server.address}: {server.error_string()}', file=sys.stderr)
+        exit_code = 1
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
     '''
-    pyinstaller --clean -n "番茄计时器" --add-data "./res/*.png;./res/" -i ./res/pomodoro-icon.ico .\src\window_1_timer.py --onefile --noconsole
+    python .\src\build_resources.py
+    pyinstaller --clean -n "番茄计时器" -i ./res/pomodoro-icon.ico .\src\window_1_timer.py --onefile --noconsole
     rm -r build
     '''  # noqa
     import os
-    import sys
     # os.chdir(os.path.dirname(os.path.abspath(__file__)))
     os.environ["QT_SCALE_FACTOR"] = "1"
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
 
     app = QApplication(sys.argv)
+    if '--dashboard' in sys.argv:
+        # python window_1_timer.py --dashboard [计时器个数]
+        idx = sys.argv.index('--dashboard')
+        count = int(sys.argv[idx + 1]) if len(sys.argv) > idx + 1 and sys.argv[idx + 1].isdigit() else 0
+        dashboard = OneTimerWindow()
+        for i in range(count):
+            dashboard.add_timer(f'计时器 {i + 1}', 1 + i % 60)
+        dashboard.setWindowTitle('番茄计时器')
+        dashboard.setWindowIcon(ICON_REGISTRY.icon(ICON_TOMATO))
+        server = InstanceServer({'activate': dashboard.command_activate}, parent=app)
+        listen_or_exit(server)
+        dashboard.show()
+        sys.exit(app.exec_())
+
     window = TimerWidget()
+    # 操作日志：每次操作立即写入 (进程崩溃不丢)，fsync 批量进行，退出时补齐
+    # 一批操作的最后几条事件也在 fsync 间隔到期时落盘，不必等下一次操作
+    journal = TimerJournal(schedule_sync=QTimer.singleShot)
+    if window.name in journal.states:
+        window.restore_state(journal.states[window.name])
+    window.journal = journal
+    app.aboutToQuit.connect(journal.close)
+    window.history = HistoryStore()
+    app.aboutToQuit.connect(window.history.close)
     window.setWindowTitle('番茄计时器')
-    window.setWindowIcon(QIcon(ICON_TOMATO))
+    window.setWindowIcon(ICON_REGISTRY.icon(ICON_TOMATO))
     window_flags = (
         Qt.WindowType.Window | Qt.WindowType.WindowCloseButtonHint | Qt.WindowType.WindowStaysOnTopHint
         # | Qt.WindowType.FramelessWindowHint
@@ -46,18 +148,22 @@ if __name__ == '__main__':
             if event.type() == QMouseEvent.Type.MouseButtonPress:
                 QApplication.setOverrideCursor(Qt.CursorShape.ClosedHandCursor)
 
+    # 拖动时每帧最多移动一次窗口，一帧内的位移累加
+    drag_coalescer = FrameCoalescer(
+        lambda pending: window.move(window.frameGeometry().topLeft() + pending['offset']), parent=window)
+
     def mouseMoveEvent(self: TimerWidget, event: QMouseEvent):
         globalPos = event.globalPos()
-        # print('__main__.mouseMoveEvent', self.lastPos, globalPos)
         if event.buttons() & Qt.MouseButton.MiddleButton:  # 检查中键是否被按下
-            # 当前鼠标位置 - 之前鼠标位置 + 窗口左上角位置 = 移动后窗口左上角位置
-            self.move(globalPos - self.lastPos + self.frameGeometry().topLeft())
+            # 当前鼠标位置 - 之前鼠标位置 = 窗口左上角的位移
+            drag_coalescer.push('offset', globalPos - self.lastPos)
             self.lastPos = globalPos  # 保存当前鼠标位置
 
     def mouseReleaseEvent(self: TimerWidget, event: QMouseEvent):
         if (
             event.button() in {Qt.MouseButton.MiddleButton}
         ):
+            drag_coalescer.flush()  # 松开时把剩余位移一次性应用
             self.lastPos = QPoint()  # 松开鼠标重置位置信息
             QApplication.restoreOverrideCursor()
 
@@ -65,5 +171,15 @@ if __name__ == '__main__':
     window.mouseMoveEvent = partial(mouseMoveEvent, window)
     window.mouseReleaseEvent = partial(mouseReleaseEvent, window)
 
+    # 本地控制接口，同时保证单实例；本次启动自带的命令直接在本进程执行
+    handlers = window.command_handlers()
+    server = InstanceServer(handlers, parent=app)
+    listen_or_exit(server)
+    app.aboutToQuit.connect(server.close)
+    for command in parse_argv(sys.argv[1:]):
+        if command['cmd'] != 'activate':
+            dispatch(handlers, command)
+
+    first_frame_probe = FirstFrameProbe(window, T0_NS, partial(TRACE.info, 'startup', 'first frame in %.1f ms'))
     window.show()
     sys.exit(app.exec_())
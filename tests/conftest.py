@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 模块按 src 目录下的顶层模块导入 (与直接运行 window_1_timer.py 一致)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
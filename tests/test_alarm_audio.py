@@ -0,0 +1,55 @@
+import sys
+import wave
+
+import pytest
+
+from alarm_audio import AlarmEngine, BeepSpec, FileSink, synthesize_pcm
+
+SPEC = BeepSpec(freq_hz=440, duration_ms=100, repeat_cnt=2, gap_ms=20, sample_rate=8000)
+N_FRAMES = (8000 * 100 // 1000 + 8000 * 20 // 1000) * 2
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    # sys.modules 中为 None 时 import 抛出 ImportError，走纯 Python 的合成路径
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+
+
+def play_to_file(tmp_path) -> str:
+    path = str(tmp_path / 'alarm.wav')
+    engine = AlarmEngine(SPEC, sink=FileSink(path))
+    engine.play()
+    assert len(engine.sink.played_ns) == 1
+    assert engine.duration_ms() == 240
+    return path
+
+
+def check_wav(path: str) -> None:
+    with wave.open(path, 'rb') as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == SPEC.sample_rate
+        assert wav.getnframes() == N_FRAMES
+        assert len(wav.readframes(wav.getnframes())) == N_FRAMES * 2
+
+
+def test_file_sink_wav_without_numpy(tmp_path, no_numpy):
+    check_wav(play_to_file(tmp_path))
+
+
+def test_file_sink_wav_with_numpy(tmp_path):
+    pytest.importorskip('numpy')
+    check_wav(play_to_file(tmp_path))
+
+
+def test_numpy_and_fallback_match(monkeypatch):
+    pytest.importorskip('numpy')
+    vectorized = synthesize_pcm(SPEC)
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    fallback = synthesize_pcm(SPEC)
+    assert len(vectorized) == len(fallback)
+    # 淡入淡出的包络两种实现略有不同，只比较第一声中间的部分；浮点舍入可能使取整差 1
+    n_tone, n_ramp = SPEC.sample_rate * SPEC.duration_ms // 1000, SPEC.sample_rate * SPEC.ramp_ms // 1000
+    middle = slice(n_ramp, n_tone - n_ramp)
+    samples = zip(memoryview(vectorized).cast('h')[middle], memoryview(fallback).cast('h')[middle])
+    assert max(abs(a - b) for a, b in samples) <= 1
@@ -0,0 +1,150 @@
+import random
+
+from deadline_queue import DeadlineQueue
+
+
+class Model:
+    """ 用排好序的列表实现同样的语义，作为对照 """
+
+    def __init__(self) -> None:
+        self.entries = []  # [(deadline, seq, key)]，按 (deadline, seq) 排序
+        self.paused = {}
+        self.seq = 0
+
+    def schedule(self, key, deadline):
+        self.cancel(key)
+        self.seq += 1
+        self.entries.append((deadline, self.seq, key))
+        self.entries.sort()
+
+    def cancel(self, key):
+        self.entries = [e for e in self.entries if e[2] != key]
+        self.paused.pop(key, None)
+
+    def pause(self, key, ns_now):
+        for deadline, _, k in self.entries:
+            if k == key:
+                self.entries = [e for e in self.entries if e[2] != key]
+                self.paused[key] = deadline - ns_now
+                return True
+        return False
+
+    def resume(self, key, ns_now):
+        if key not in self.paused:
+            return False
+        self.schedule(key, ns_now + self.paused.pop(key))
+        return True
+
+    def peek(self):
+        return self.entries[0][0] if self.entries else None
+
+    def pop_due(self, ns_now):
+        due = [k for d, _, k in self.entries if d <= ns_now]
+        self.entries = [e for e in self.entries if e[0] > ns_now]
+        return due
+
+    def latest_before(self, ns_bound):
+        deadlines = [d for d, _, _ in self.entries if d <= ns_bound]
+        return max(deadlines) if deadlines else None
+
+
+def test_schedule_and_peek():
+    queue = DeadlineQueue()
+    assert queue.peek() is None
+    queue.schedule('a', 30)
+    queue.schedule('b', 10)
+    queue.schedule('c', 20)
+    assert queue.peek() == 10
+    assert len(queue) == 3
+    assert queue.deadline('c') == 20
+    queue.schedule('b', 40)  # 修改结束时刻，旧元素标记删除
+    assert queue.peek() == 20
+    assert len(queue) == 3
+
+
+def test_cancel_is_lazy():
+    queue = DeadlineQueue()
+    queue.schedule('a', 10)
+    queue.schedule('b', 20)
+    queue.cancel('a')
+    assert 'a' not in queue
+    assert queue.peek() == 20
+    assert queue.pop_due(100) == ['b']
+    assert queue.peek() is None
+
+
+def test_pop_due_ties_keep_schedule_order():
+    queue = DeadlineQueue()
+    for key in 'cab':
+        queue.schedule(key, 50)
+    queue.schedule('d', 40)
+    queue.schedule('e', 51)
+    assert queue.pop_due(49) == ['d']
+    assert queue.pop_due(50) == ['c', 'a', 'b']
+    assert queue.pop_due(50) == []
+    assert list(queue.pop_due(51)) == ['e']
+
+
+def test_pause_and_resume_shift_deadline():
+    queue = DeadlineQueue()
+    queue.schedule('a', 100)
+    assert queue.pause('a', 40)
+    assert queue.is_paused('a')
+    assert 'a' not in queue
+    assert queue.pop_due(1000) == []
+    assert queue.resume('a', 500)
+    assert queue.deadline('a') == 560
+    assert not queue.is_paused('a')
+    assert not queue.resume('a', 600)
+    assert not queue.pause('missing', 0)
+
+
+def test_cancel_clears_pause():
+    queue = DeadlineQueue()
+    queue.schedule('a', 100)
+    queue.pause('a', 0)
+    queue.cancel('a')
+    assert not queue.resume('a', 10)
+
+
+def test_latest_before():
+    queue = DeadlineQueue()
+    assert queue.latest_before(100) is None
+    for key, deadline in zip('abcde', (10, 30, 20, 50, 40)):
+        queue.schedule(key, deadline)
+    queue.cancel('b')
+    assert queue.latest_before(5) is None
+    assert queue.latest_before(10) == 10
+    assert queue.latest_before(35) == 20
+    assert queue.latest_before(45) == 40
+    assert queue.latest_before(1000) == 50
+
+
+def test_matches_sorted_list_model():
+    rng = random.Random(20261018)
+    queue, model = DeadlineQueue(), Model()
+    keys = list(range(40))
+    ns_now = 0
+    # 足够多的 cancel/reschedule，触发失效元素过多时的整体重建
+    for _ in range(5000):
+        op = rng.random()
+        key = rng.choice(keys)
+        if op < 0.35:
+            deadline = ns_now + rng.randrange(0, 200, 10)  # 取整到 10，制造同一时刻
+            queue.schedule(key, deadline)
+            model.schedule(key, deadline)
+        elif op < 0.5:
+            queue.cancel(key)
+            model.cancel(key)
+        elif op < 0.6:
+            assert queue.pause(key, ns_now) == model.pause(key, ns_now)
+        elif op < 0.7:
+            assert queue.resume(key, ns_now) == model.resume(key, ns_now)
+        elif op < 0.85:
+            ns_now += rng.randrange(0, 30)
+            assert queue.pop_due(ns_now) == model.pop_due(ns_now)
+        else:
+            bound = ns_now + rng.randrange(0, 200)
+            assert queue.latest_before(bound) == model.latest_before(bound)
+        assert queue.peek() == model.peek()
+        assert len(queue) == len(model.entries)
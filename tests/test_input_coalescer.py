@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from input_coalescer import WHEEL_UNITS_PER_STEP, WheelAccumulator  # noqa: E402
+
+
+def test_whole_notches():
+    acc = WheelAccumulator()
+    assert acc.add(WHEEL_UNITS_PER_STEP) == 1
+    assert acc.add(-WHEEL_UNITS_PER_STEP) == -1
+    assert acc.add(3 * WHEEL_UNITS_PER_STEP) == 3
+    assert acc.residual == 0
+    assert acc.add(0) == 0
+
+
+def test_small_deltas_accumulate():
+    acc = WheelAccumulator()
+    # 高精度滚轮：每次 8 单位，15 次凑满一格
+    steps = [acc.add(8) for _ in range(15)]
+    assert steps == [0] * 14 + [1]
+    assert acc.residual == 0
+    assert sum(acc.add(-8) for _ in range(30)) == -2
+
+
+def test_residual_carries_over():
+    acc = WheelAccumulator()
+    assert acc.add(100) == 0
+    assert acc.residual == 100
+    assert acc.add(50) == 1
+    assert acc.residual == 30
+    assert acc.add(330) == 3
+    assert acc.residual == 0
+    assert acc.add(-130) == -1
+    assert acc.residual == -10
+    assert acc.add(-230) == -2
+    assert acc.residual == 0
+
+
+def test_direction_change_drops_residual():
+    acc = WheelAccumulator()
+    assert acc.add(100) == 0
+    # 反向：丢弃 +100，不需要先抵消
+    assert acc.add(-30) == 0
+    assert acc.residual == -30
+    assert acc.add(-90) == -1
+    assert acc.residual == 0
+    assert acc.add(-110) == 0
+    assert acc.add(119) == 0
+    assert acc.residual == 119
+    assert acc.add(1) == 1
+
+
+def test_direction_change_with_full_step():
+    acc = WheelAccumulator()
+    acc.add(-119)
+    assert acc.add(WHEEL_UNITS_PER_STEP + 5) == 1
+    assert acc.residual == 5
+
+
+def test_steps_match_total_within_one_direction():
+    acc = WheelAccumulator(units_per_step=24)
+    deltas = [3, 5, 1, 7, 2, 9, 4, 6, 8, 1, 1, 13, 2] * 7
+    assert sum(acc.add(delta) for delta in deltas) == sum(deltas) // 24
+    assert acc.residual == sum(deltas) % 24
+
+
+def test_reset():
+    acc = WheelAccumulator()
+    acc.add(90)
+    acc.reset()
+    assert acc.residual == 0
+    assert acc.add(60) == 0
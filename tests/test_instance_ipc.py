@@ -0,0 +1,87 @@
+import json
+import os
+import platform
+import socket
+import uuid
+
+import pytest
+
+from instance_ipc import (
+    CommandError, dispatch, forward_and_report, forward_argv, handle_line, parse_argv, server_address)
+
+
+def test_parse_argv_commands_in_order():
+    assert parse_argv(['--start', '25', '--add-seconds', '30', '--query']) == [
+        {'cmd': 'start', 'args': {'minutes': 25}},
+        {'cmd': 'add-seconds', 'args': {'seconds': 30}},
+        {'cmd': 'query'},
+    ]
+    assert parse_argv(['--start', '--pause']) == [{'cmd': 'start', 'args': {}}, {'cmd': 'pause'}]
+    assert parse_argv(['--cycle', '50/10']) == [{'cmd': 'cycle', 'args': {'schedule': '50/10'}}]
+
+
+def test_parse_argv_defaults_to_activate():
+    assert parse_argv([]) == [{'cmd': 'activate'}]
+    assert parse_argv(['--dashboard', '3']) == [{'cmd': 'activate'}]
+
+
+@pytest.mark.parametrize('argv', [['--start', 'abc'], ['--add-seconds'], ['--add-seconds', 'x']])
+def test_parse_argv_rejects_bad_values(argv):
+    with pytest.raises(ValueError):
+        parse_argv(argv)
+
+
+def make_handlers():
+    def start(minutes: int = 25):
+        if minutes <= 0:
+            raise CommandError('duration must be positive')
+        return {'minutes': minutes}
+    return {'start': start, 'query': lambda: {'state': 'idle'}}
+
+
+def test_dispatch():
+    handlers = make_handlers()
+    assert dispatch(handlers, {'id': 7, 'cmd': 'start', 'args': {'minutes': 5}}) == {
+        'id': 7, 'ok': True, 'result': {'minutes': 5}}
+    assert dispatch(handlers, {'cmd': 'start', 'args': {'minutes': 0}}) == {
+        'id': None, 'ok': False, 'error': 'duration must be positive'}
+    assert not dispatch(handlers, {'cmd': 'nope'})['ok']
+    assert not dispatch(handlers, {'cmd': 'start', 'args': [1]})['ok']
+    assert not dispatch(handlers, {'cmd': 'start', 'args': {'hours': 1}})['ok']  # TypeError
+    assert not dispatch(handlers, ['start'])['ok']
+
+
+def test_handle_line_single_and_batch():
+    handlers = make_handlers()
+    line = handle_line(handlers, b'{"id":1,"cmd":"query"}\n')
+    assert line.endswith(b'\n')
+    assert json.loads(line) == {'id': 1, 'ok': True, 'result': {'state': 'idle'}}
+    batch = json.loads(handle_line(handlers, b'[{"id":1,"cmd":"query"},{"id":2,"cmd":"missing"}]'))
+    assert [(response['id'], response['ok']) for response in batch] == [(1, True), (2, False)]
+    error = json.loads(handle_line(handlers, b'{not json'))
+    assert not error['ok'] and error['error'].startswith('invalid json')
+
+
+def test_forward_without_instance_returns_none():
+    name = f'test-{uuid.uuid4().hex[:8]}'
+    assert forward_argv(['--query'], name) is None
+    assert forward_and_report(['--query'], name) is None
+
+
+def test_forward_reports_usage_error(capsys):
+    assert forward_and_report(['--start', 'abc'], f'test-{uuid.uuid4().hex[:8]}') == 2
+    assert 'usage' in capsys.readouterr().err
+
+
+@pytest.mark.skipif(platform.system() == 'Windows', reason='Unix domain socket')
+def test_forward_to_hung_instance_returns_none():
+    name = f'test-{uuid.uuid4().hex[:8]}'
+    address = server_address(name)
+    hung = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    hung.bind(address)
+    hung.listen(1)  # 接受连接但从不回复
+    try:
+        assert forward_argv(['--query'], name, timeout_s=0.1) is None
+    finally:
+        hung.close()
+        os.unlink(address)
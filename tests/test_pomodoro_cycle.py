@@ -0,0 +1,96 @@
+import pytest
+
+from pomodoro_cycle import DEFAULT_SCHEDULE, Phase, PhaseKindEnum, PomodoroCycle
+
+MS_PER_MIN = 60_000
+
+
+def test_default_schedule():
+    cycle = PomodoroCycle.parse()
+    assert len(cycle) == 6
+    assert [phase.kind for phase in cycle.phases] == [
+        PhaseKindEnum.FOCUS, PhaseKindEnum.SHORT_BREAK, PhaseKindEnum.FOCUS, PhaseKindEnum.SHORT_BREAK,
+        PhaseKindEnum.FOCUS, PhaseKindEnum.LONG_BREAK,
+    ]
+    assert cycle.ends_ms == [m * MS_PER_MIN for m in (25, 30, 55, 60, 85, 100)]
+    assert cycle.ms_total == 100 * MS_PER_MIN
+    assert (cycle.start_ms(0), cycle.end_ms(0)) == (0, 25 * MS_PER_MIN)
+    assert (cycle.start_ms(5), cycle.end_ms(5)) == (85 * MS_PER_MIN, 100 * MS_PER_MIN)
+
+
+def test_locate_inside_phases():
+    cycle = PomodoroCycle.parse()
+    assert cycle.locate(0) == (0, 0)
+    assert cycle.locate(10 * MS_PER_MIN) == (0, 10 * MS_PER_MIN)
+    assert cycle.locate(27 * MS_PER_MIN) == (1, 2 * MS_PER_MIN)
+    assert cycle.locate(99 * MS_PER_MIN) == (5, 14 * MS_PER_MIN)
+    # 时钟回拨等原因出现的负值按循环开始处理
+    assert cycle.locate(-5) == (0, 0)
+
+
+def test_locate_phase_end_belongs_to_next_phase():
+    cycle = PomodoroCycle.parse()
+    for index, ms_end in enumerate(cycle.ends_ms[:-1]):
+        assert cycle.locate(ms_end - 1) == (index, cycle.phases[index].ms - 1)
+        # bisect_right：恰好在结束时刻时已进入下一阶段
+        assert cycle.locate(ms_end) == (index + 1, 0)
+    assert cycle.locate(cycle.ms_total - 1) == (5, 15 * MS_PER_MIN - 1)
+    assert cycle.locate(cycle.ms_total) is None
+    assert cycle.locate(cycle.ms_total + MS_PER_MIN) is None
+
+
+def test_locate_matches_linear_scan():
+    cycle = PomodoroCycle.parse('1/2/3')
+    for ms_elapsed in range(0, cycle.ms_total + 1, 7_000):
+        expected = None
+        for index in range(len(cycle)):
+            if cycle.start_ms(index) <= ms_elapsed < cycle.end_ms(index):
+                expected = (index, ms_elapsed - cycle.start_ms(index))
+                break
+        assert cycle.locate(ms_elapsed) == expected
+
+
+@pytest.mark.parametrize('spec', (DEFAULT_SCHEDULE, '50/10', '25', '1/1/1/1', '45/5/45/30'))
+def test_parse_spec_roundtrip(spec):
+    cycle = PomodoroCycle.parse(spec)
+    assert cycle.spec() == spec
+    assert PomodoroCycle.parse(cycle.spec()) == cycle
+    assert PomodoroCycle.from_dict(cycle.to_dict()) == cycle
+
+
+def test_parse_accepts_commas_and_spaces():
+    assert PomodoroCycle.parse('25, 5, 25,15') == PomodoroCycle.parse('25/5/25/15')
+    assert PomodoroCycle.parse('25/5/') == PomodoroCycle.parse('25/5')
+
+
+@pytest.mark.parametrize('spec', ('', 'abc', '25/x', '25/0', '25/-5'))
+def test_parse_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        PomodoroCycle.parse(spec)
+
+
+def test_from_minutes_short_vs_long_break():
+    kinds = [phase.kind for phase in PomodoroCycle.from_minutes([25, 5, 25, 15, 25, 5]).phases]
+    assert kinds[1::2] == [PhaseKindEnum.SHORT_BREAK, PhaseKindEnum.LONG_BREAK, PhaseKindEnum.SHORT_BREAK]
+    assert set(kinds[0::2]) == {PhaseKindEnum.FOCUS}
+    # 休息时长都相同时都是短休息
+    kinds = [phase.kind for phase in PomodoroCycle.from_minutes([25, 5, 25, 5]).phases]
+    assert kinds[1::2] == [PhaseKindEnum.SHORT_BREAK, PhaseKindEnum.SHORT_BREAK]
+    # 只有一个休息时它就是最短的，算短休息
+    assert PomodoroCycle.from_minutes([50, 20]).phases[1].kind == PhaseKindEnum.SHORT_BREAK
+    assert [phase.kind for phase in PomodoroCycle.from_minutes([25]).phases] == [PhaseKindEnum.FOCUS]
+
+
+def test_dict_keeps_phase_kinds():
+    cycle = PomodoroCycle([Phase(PhaseKindEnum.FOCUS, 1_000), Phase(PhaseKindEnum.LONG_BREAK, 500)])
+    data = cycle.to_dict()
+    assert data == {'phases': [['focus', 1_000], ['long_break', 500]]}
+    assert PomodoroCycle.from_dict(data) == cycle
+    assert cycle != PomodoroCycle([Phase(PhaseKindEnum.FOCUS, 1_000), Phase(PhaseKindEnum.SHORT_BREAK, 500)])
+
+
+def test_invalid_phases():
+    with pytest.raises(ValueError):
+        PomodoroCycle([])
+    with pytest.raises(ValueError):
+        PomodoroCycle([Phase(PhaseKindEnum.FOCUS, 0)])
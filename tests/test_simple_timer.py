@@ -0,0 +1,115 @@
+import pytest
+
+from simple_timer import NS_PER_MS, SimpleTimer, VirtualClock
+
+
+def new_simple_timer(clock, ms_total=None):
+    return SimpleTimer(clock=clock) if ms_total is None else SimpleTimer.from_duration(ms_total, clock=clock)
+
+
+def new_bank_timer(clock, ms_total=None):
+    pytest.importorskip('numpy')
+    from timer_bank import TimerBank
+    bank = TimerBank(4, clock=clock)
+    return bank.view(bank.allocate(ms_total))
+
+
+# 同一组场景同时验证 SimpleTimer 和 TimerBank 的槽位视图 BankTimer
+@pytest.fixture(params=(new_simple_timer, new_bank_timer), ids=('simple', 'bank'))
+def new_timer(request):
+    return request.param
+
+
+def make_timer(new_timer, ms_total: int = 10_000):
+    clock = VirtualClock(1_000 * NS_PER_MS)
+    return clock, new_timer(clock, ms_total)
+
+
+def test_start(new_timer):
+    clock, timer = make_timer(new_timer)
+    assert timer.is_time_set()
+    assert not timer.is_paused()
+    assert timer.ms_total() == 10_000
+    assert timer.ms_remain() == 10_000
+    assert timer.ms_passed() == 0
+    assert timer.sec_remain() == 10
+
+
+def test_remaining_follows_clock(new_timer):
+    clock, timer = make_timer(new_timer)
+    clock.advance(ms=2_500)
+    assert timer.ms_remain() == 7_500
+    assert timer.ms_passed() == 2_500
+    assert timer.sec_remain() == 7
+    assert not timer.is_time_up()
+
+
+def test_pause_and_resume(new_timer):
+    clock, timer = make_timer(new_timer)
+    clock.advance(ms=3_000)
+    assert timer.pause() == clock.now_ns()
+    assert timer.is_paused()
+    clock.advance(ms=60_000)
+    assert timer.ms_remain() == 7_000
+    timer.resume()
+    assert not timer.is_paused()
+    assert timer.ms_remain() == 7_000
+    clock.advance(ms=1_000)
+    assert timer.ms_remain() == 6_000
+    assert timer.ms_total() == 10_000
+
+
+def test_time_up(new_timer):
+    clock, timer = make_timer(new_timer)
+    clock.advance(ms=9_999)
+    assert not timer.is_time_up()
+    clock.advance(ms=1)
+    assert timer.is_time_up()
+    assert timer.ms_remain() == 0
+    clock.advance(ms=500)
+    assert timer.ms_remain() == -500
+    assert timer.sec_remain() == 0
+
+
+def test_reset_restarts_full_duration(new_timer):
+    clock, timer = make_timer(new_timer)
+    clock.advance(ms=4_000)
+    timer.pause()
+    clock.advance(ms=1_000)
+    timer.reset()
+    assert not timer.is_paused()
+    assert timer.ms_remain() == 10_000
+
+
+def test_unset_timer(new_timer):
+    timer = new_timer(VirtualClock())
+    assert not timer.is_time_set()
+    assert not timer.is_time_up()
+    assert timer.ms_remain() == 0
+    timer.pause()
+    assert not timer.is_paused()
+
+
+def test_snapshot_is_shared_and_cleared(new_timer):
+    clock, timer = make_timer(new_timer)
+    with timer.snapshot() as ns_now:
+        assert ns_now == clock.now_ns()
+        clock.advance(ms=1_000)
+        assert timer.ms_remain() == 10_000
+        with timer.snapshot():
+            assert timer.ms_remain() == 10_000
+        with timer.snapshot(ns_now + 500 * NS_PER_MS):
+            assert timer.ms_remain() == 9_500
+        assert timer.ms_remain() == 10_000
+    # 块外不再使用过期的快照
+    assert timer.ns_now is None
+    assert timer.ms_remain() == 9_000
+
+
+def test_explicit_time(new_timer):
+    clock, timer = make_timer(new_timer)
+    ns_start = clock.now_ns()
+    timer.pause(ns_start + 2_000 * NS_PER_MS)
+    timer.resume(ns_start + 5_000 * NS_PER_MS)
+    clock.advance(ms=5_000)
+    assert timer.ms_remain() == 8_000
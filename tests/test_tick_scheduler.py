@@ -0,0 +1,111 @@
+from simple_timer import NS_PER_MS, NS_PER_SEC, SimpleTimer, VirtualClock
+from tick_scheduler import TickPlan, ns_to_next_second, ns_to_next_step, plan_next_tick
+
+
+def make_timer(ms_total: int):
+    clock = VirtualClock(1_000 * NS_PER_SEC)
+    return clock, SimpleTimer.from_duration(ms_total, clock=clock)
+
+
+def test_next_second_at_exact_second():
+    # 显示值是向下取整到秒：恰好 5 s 时显示 5，再过 1 ns 变为 4
+    assert ns_to_next_second(5 * NS_PER_SEC) == 1
+    assert ns_to_next_second(5 * NS_PER_SEC - 1) == NS_PER_SEC
+    assert ns_to_next_second(5 * NS_PER_SEC + 1) == 2
+    assert ns_to_next_second(1) == 2
+    assert ns_to_next_second(0) == 1
+
+
+def test_next_second_lands_on_change():
+    for ns_remain in (1, 999_999_999, NS_PER_SEC, NS_PER_SEC + 1, 7_123_456_789):
+        ns_delay = ns_to_next_second(ns_remain)
+        assert (ns_remain - ns_delay + 1) // NS_PER_SEC == ns_remain // NS_PER_SEC
+        assert (ns_remain - ns_delay) // NS_PER_SEC == ns_remain // NS_PER_SEC - 1
+
+
+def test_next_step_at_boundaries():
+    ns_total = 10 * NS_PER_SEC
+    # 100 像素，每像素 100 ms；恰好在边界上时再过 1 ns 少一个像素
+    assert ns_to_next_step(ns_total, ns_total, 100) == 1
+    assert ns_to_next_step(ns_total - 1, ns_total, 100) == 100 * NS_PER_MS
+    assert ns_to_next_step(5 * NS_PER_SEC + 1, ns_total, 100) == 2
+    # 剩余不足一个像素 (100 ms) 后不再有像素变化
+    assert ns_to_next_step(100 * NS_PER_MS, ns_total, 100) == 1
+    assert ns_to_next_step(100 * NS_PER_MS - 1, ns_total, 100) is None
+    assert ns_to_next_step(0, ns_total, 100) is None
+
+
+def test_next_step_lands_on_change():
+    ns_total, steps = 7 * NS_PER_SEC, 333
+    for ns_remain in range(ns_total, 0, -12_345_677):
+        ns_step = ns_to_next_step(ns_remain, ns_total, steps)
+        step = ns_remain * steps // ns_total
+        if step == 0:
+            assert ns_step is None
+            continue
+        assert (ns_remain - ns_step + 1) * steps // ns_total == step
+        assert (ns_remain - ns_step) * steps // ns_total == step - 1
+
+
+def test_next_step_degenerate():
+    assert ns_to_next_step(NS_PER_SEC, 10 * NS_PER_SEC, 0) is None
+    assert ns_to_next_step(NS_PER_SEC, 10 * NS_PER_SEC, -1) is None
+    assert ns_to_next_step(NS_PER_SEC, 0, 100) is None
+
+
+def test_plan_unset_and_paused():
+    assert plan_next_tick(SimpleTimer(clock=VirtualClock())) is None
+    clock, timer = make_timer(10_000)
+    clock.advance(ms=1_500)
+    timer.pause()
+    assert plan_next_tick(timer, 100) is None
+    timer.resume()
+    # 剩余 8.5 s，500 ms + 1 ns 后显示变化，向上取整
+    assert plan_next_tick(timer, 0) == TickPlan(501, False)
+
+
+def test_plan_zero_total_and_expired():
+    clock, timer = make_timer(0)
+    assert plan_next_tick(timer) == TickPlan(0, True)
+    assert plan_next_tick(timer, 100) == TickPlan(0, True)
+    clock, timer = make_timer(1_000)
+    clock.advance(ms=1_000)
+    assert plan_next_tick(timer) == TickPlan(0, True)
+    clock.advance(ms=5_000)
+    assert plan_next_tick(timer) == TickPlan(0, True)
+
+
+def test_plan_at_exact_second():
+    clock, timer = make_timer(10_000)
+    # 刚开始时恰好在整秒上，1 ns 后显示变化，向上取整为 1 ms
+    assert plan_next_tick(timer) == TickPlan(1, False)
+    clock.advance(ns=1)
+    assert plan_next_tick(timer) == TickPlan(1_000, False)
+    clock.advance(ms=999)
+    assert plan_next_tick(timer) == TickPlan(1, False)
+
+
+def test_plan_uses_progress_steps():
+    clock, timer = make_timer(10_000)
+    clock.advance(ms=250)
+    # 每像素 100 ms，早于下一秒
+    assert plan_next_tick(timer, 100) == TickPlan(51, False)
+    # 像素更粗时下一秒更早
+    assert plan_next_tick(timer, 4) == TickPlan(751, False)
+
+
+def test_plan_precise_at_end():
+    clock, timer = make_timer(10_000)
+    clock.advance(ms=9_400)
+    # 剩余 600 ms，显示已是 0 秒，下一次唤醒就是结束时刻
+    assert plan_next_tick(timer) == TickPlan(600, True)
+    clock.advance(ns=1)
+    assert plan_next_tick(timer) == TickPlan(600, True)
+    clock.advance(ms=599)
+    assert plan_next_tick(timer, 100) == TickPlan(1, True)
+    # 进度条最后一个像素在 100 ms 处消失，之后的唤醒是结束时刻
+    clock, timer = make_timer(1_000)
+    clock.advance(ms=900)
+    assert plan_next_tick(timer, 10) == TickPlan(1, False)
+    clock.advance(ms=1)
+    assert plan_next_tick(timer, 10) == TickPlan(99, True)
@@ -0,0 +1,151 @@
+import pytest
+
+from simple_timer import NS_PER_MS, NS_PER_SEC, SimpleTimer, VirtualClock
+from tick_scheduler import ns_to_next_second, ns_to_next_step
+
+np = pytest.importorskip('numpy')
+
+from timer_bank import UNSET, TimerBank  # noqa: E402
+
+STEPS = 200
+
+
+def make_bank():
+    """ 同一时钟上的 TimerBank 和对照用的 SimpleTimer 列表，覆盖运行、暂停、已结束、未设置、总时长为 0 """
+    clock = VirtualClock(1_000 * NS_PER_SEC)
+    bank = TimerBank(2, clock=clock)
+    timers = []
+
+    def add(ms_total=None):
+        slot = bank.allocate(ms_total)
+        assert slot == len(timers)
+        timer = SimpleTimer(clock=clock) if ms_total is None else SimpleTimer.from_duration(ms_total, clock=clock)
+        timers.append(timer)
+        return bank.view(slot), timer
+
+    add(10_000)                                 # 运行中
+    add(1_500)                                  # 稍后结束
+    view, timer = add(60_000)                   # 暂停
+    add()                                       # 未设置
+    add(0)                                      # 总时长为 0
+    add(25 * 60_000)                            # 长时间运行
+    clock.advance(ms=1_000)
+    view.pause()
+    timer.pause()
+    clock.advance(ms=1_250)
+    return clock, bank, timers
+
+
+def expected_steps(timer: SimpleTimer, steps: int) -> int:
+    if not timer.is_time_set():
+        return 0
+    ns_total = timer.ns_stop - timer.ns_start
+    if ns_total <= 0:
+        return 0
+    return min(max(timer.ns_remain(), 0) * steps // ns_total, steps)
+
+
+def expected_next_change(timer: SimpleTimer, steps: int) -> int:
+    ns_remain = timer.ns_remain()
+    ns_delay = ns_to_next_second(ns_remain)
+    ns_step = ns_to_next_step(ns_remain, timer.ns_stop - timer.ns_start, steps)
+    return ns_delay if ns_step is None else min(ns_delay, ns_step)
+
+
+def test_unset_slots():
+    bank = TimerBank(3, clock=VirtualClock())
+    slot = bank.allocate()
+    assert (bank.ns_start[slot], bank.ns_stop[slot], bank.ns_pause_start[slot]) == (UNSET, UNSET, UNSET)
+    view = bank.view(slot)
+    assert (view.ns_start, view.ns_stop, view.ns_pause_start) == (None, None, None)
+    assert not view.is_time_set()
+    assert bank.ns_remain().tolist() == [0, 0, 0]
+    assert bank.progress_steps(STEPS).tolist() == [0, 0, 0]
+    assert not bank.expired().any()
+
+
+def test_vectorized_matches_simple_timer():
+    clock, bank, timers = make_bank()
+    # 扩容后多出的槽位未分配，全部为 UNSET
+    slots = list(range(len(timers)))
+    assert bank.capacity > len(timers)
+    for _ in range(40):
+        ns_now = clock.now_ns()
+        assert bank.ns_remain(ns_now, slots).tolist() == [t.ns_remain() for t in timers]
+        assert bank.ms_remain(ns_now, slots).tolist() == [t.ms_remain() for t in timers]
+        assert bank.sec_remain(ns_now, slots).tolist() == [t.sec_remain() for t in timers]
+        assert bank.expired(ns_now, slots).tolist() == [t.is_time_up() for t in timers]
+        assert bank.progress_steps(STEPS, ns_now, slots).tolist() == [expected_steps(t, STEPS) for t in timers]
+        assert not bank.expired(ns_now)[len(timers):].any()
+        # 默认使用 bank 的时钟
+        assert bank.ns_remain().tolist() == bank.ns_remain(ns_now).tolist()
+        clock.advance(ns=333_333_337)
+
+
+def test_expired_boundary():
+    clock = VirtualClock(0)
+    bank = TimerBank(clock=clock)
+    slot = bank.allocate(1_000)
+    assert not bank.expired(NS_PER_SEC - 1)[slot]
+    assert bank.expired(NS_PER_SEC)[slot]
+    assert bank.ns_remain(NS_PER_SEC + 5)[slot] == -5
+    assert bank.sec_remain(NS_PER_SEC + 5)[slot] == 0
+    # 暂停中的计时器停在暂停时刻，不会到期
+    bank.view(slot).pause(NS_PER_SEC // 2)
+    assert not bank.expired(10 * NS_PER_SEC)[slot]
+    assert bank.ns_remain(10 * NS_PER_SEC)[slot] == NS_PER_SEC // 2
+
+
+@pytest.mark.parametrize('steps', (0, 1, 7, STEPS))
+def test_ns_to_next_change_matches_scheduler(steps):
+    clock, bank, timers = make_bank()
+    running = [i for i, t in enumerate(timers) if t.is_time_set() and not t.is_paused() and t.ns_remain() > 0]
+    assert running == [0, 5]
+    for _ in range(40):
+        ns_now = clock.now_ns()
+        delays = bank.ns_to_next_change(steps, ns_now, slots=running).tolist()
+        assert delays == [expected_next_change(timers[i], steps) for i in running]
+        clock.advance(ns=123_456_789)
+
+
+def test_ns_to_next_change_lands_on_display_change():
+    clock = VirtualClock(0)
+    bank = TimerBank(clock=clock)
+    slot = bank.allocate(7_000)
+    ns_now = 0
+    changes = 0
+    while True:
+        ns_delay = int(bank.ns_to_next_change(STEPS, ns_now)[slot])
+        assert ns_delay > 0
+        if ns_delay >= bank.ns_remain(ns_now)[slot]:
+            # 最后一段显示不再变化，下一次唤醒是倒计时结束 (plan_next_tick 单独处理)
+            break
+        shown = (bank.sec_remain(ns_now)[slot], bank.progress_steps(STEPS, ns_now)[slot])
+        # 下一刻之前显示不变，到下一刻时至少一项变化
+        assert (bank.sec_remain(ns_now + ns_delay - 1)[slot],
+                bank.progress_steps(STEPS, ns_now + ns_delay - 1)[slot]) == shown
+        assert (bank.sec_remain(ns_now + ns_delay)[slot], bank.progress_steps(STEPS, ns_now + ns_delay)[slot]) != shown
+        ns_now += ns_delay
+        changes += 1
+    # 7 秒、200 像素：每 35 ms 少一个像素，共 200 次；6 秒到 1 秒的 6 次秒数变化不在像素边界上
+    assert changes == STEPS + 6
+
+
+def test_slots_argument_and_release():
+    clock, bank, timers = make_bank()
+    slots = [5, 0, 2]
+    assert bank.ns_remain(slots=slots).tolist() == [timers[i].ns_remain() for i in slots]
+    assert bank.progress_steps(STEPS, slots=slots).tolist() == [expected_steps(timers[i], STEPS) for i in slots]
+    bank.release(5)
+    assert bank.ns_remain()[5] == 0
+    assert len(bank) == 5
+    assert bank.allocate() == 5
+
+
+def test_grow_keeps_existing_timers():
+    clock = VirtualClock(0)
+    bank = TimerBank(1, clock=clock)
+    slots = [bank.allocate(ms) for ms in (1_000, 2_000, 3_000)]
+    assert bank.capacity >= 3
+    assert bank.ms_remain(slots=slots).tolist() == [1_000, 2_000, 3_000]
+    assert bank.ns_remain()[3:].tolist() == [0] * (bank.capacity - 3)
@@ -0,0 +1,173 @@
+import sqlite3
+import time
+
+import pytest
+
+from timer_history import (
+    DAILY_COLUMNS, SCHEMA, SESSION_COLUMNS, HistoryAnalytics, HistoryStore, SessionOutcomeEnum, SessionRecord,
+    local_day,
+)
+
+MS_PER_MIN = 60_000
+
+
+def local_ms(day: str, hour: int = 12) -> int:
+    """ 本地日期某时整点的毫秒时间戳 """
+    return int(time.mktime(time.strptime(f'{day} {hour}', '%Y-%m-%d %H'))) * 1000
+
+
+def record(day: str, label: str = 'focus', focus_min: int = 25, pause_cnt: int = 0,
+           outcome: SessionOutcomeEnum = SessionOutcomeEnum.COMPLETED, hour: int = 12) -> SessionRecord:
+    started_at = local_ms(day, hour)
+    return SessionRecord(
+        timer='t', label=label, started_at=started_at, ended_at=started_at + focus_min * MS_PER_MIN,
+        planned_ms=25 * MS_PER_MIN, focus_ms=focus_min * MS_PER_MIN, pause_cnt=pause_cnt, outcome=outcome.value)
+
+
+@pytest.fixture
+def store():
+    store = HistoryStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_add_and_fetch(store):
+    store.add_many([record('2026-03-01'), record('2026-03-02', label='read')])
+    store.add(record('2026-03-03'))
+    rows = store.fetch()
+    assert [row[0] for row in rows] == [1, 2, 3]
+    assert rows[1][1:] == tuple(getattr(record('2026-03-02', label='read'), name) for name in SESSION_COLUMNS)
+    assert len(store.fetch(since_ms=local_ms('2026-03-02', 0))) == 2
+    assert len(store.fetch(until_ms=local_ms('2026-03-02', 0))) == 1
+    assert [row[0] for row in store.fetch(label='read')] == [2]
+    assert [row[0] for row in store.fetch(after_id=2)] == [3]
+
+
+def test_daily_stats_maintained_on_insert(store):
+    store.add_many([
+        record('2026-03-01', focus_min=25, pause_cnt=1),
+        record('2026-03-01', focus_min=10, outcome=SessionOutcomeEnum.RESET),
+        record('2026-03-01', label='read', focus_min=5, outcome=SessionOutcomeEnum.CLEARED),
+        record('2026-03-02', focus_min=25, pause_cnt=2, hour=0),
+    ])
+    assert store.fetch_daily() == [
+        ('2026-03-01', 'focus', 2, 1, 35 * MS_PER_MIN, 1),
+        ('2026-03-01', 'read', 1, 0, 5 * MS_PER_MIN, 0),
+        ('2026-03-02', 'focus', 1, 1, 25 * MS_PER_MIN, 2),
+    ]
+    assert store.fetch_daily(since_day='2026-03-02') == [('2026-03-02', 'focus', 1, 1, 25 * MS_PER_MIN, 2)]
+    assert [row[1] for row in store.fetch_daily(label='read')] == ['read']
+
+
+def test_day_boundary_is_local_midnight(store):
+    store.add_many([record('2026-03-01', hour=23), record('2026-03-02', hour=0)])
+    assert [row[0] for row in store.fetch_daily()] == ['2026-03-01', '2026-03-02']
+    assert local_day(local_ms('2026-03-01', 23)) == '2026-03-01'
+    assert local_day(local_ms('2026-03-02', 0) - 1) == '2026-03-01'
+
+
+def test_daily_stats_backfilled_for_old_database(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    # 只有 sessions 表的旧数据库
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA.split('-- 按 (本地日期')[0])
+    rows = [record('2026-03-01'), record('2026-03-01', outcome=SessionOutcomeEnum.RESET), record('2026-03-02')]
+    conn.executemany(
+        f'INSERT INTO sessions ({", ".join(SESSION_COLUMNS)}) VALUES ({", ".join("?" * len(SESSION_COLUMNS))})',
+        [tuple(getattr(r, name) for name in SESSION_COLUMNS) for r in rows])
+    conn.commit()
+    conn.close()
+
+    store = HistoryStore(path)
+    assert store.fetch_daily() == [
+        ('2026-03-01', 'focus', 2, 1, 50 * MS_PER_MIN, 0),
+        ('2026-03-02', 'focus', 1, 1, 25 * MS_PER_MIN, 0),
+    ]
+    store.add(record('2026-03-02'))
+    assert store.fetch_daily(since_day='2026-03-02')[0][2] == 2
+    store.close()
+
+    # 重新打开不会重复补算
+    store = HistoryStore(path)
+    assert [row[2] for row in store.fetch_daily()] == [2, 2]
+    store.close()
+
+
+def test_rebuild_matches_trigger(store):
+    store.add_many(record(f'2026-03-{day:02}', label=label, pause_cnt=day % 3, outcome=outcome)
+                   for day in range(1, 11) for label in ('focus', 'read') for outcome in SessionOutcomeEnum)
+    maintained = store.fetch_daily()
+    store.rebuild_daily_stats()
+    assert store.fetch_daily() == maintained
+    assert len(maintained) == 20
+
+
+@pytest.fixture
+def analytics_store(store):
+    pytest.importorskip('pandas')
+    store.add_many([
+        record('2026-03-01', focus_min=25, pause_cnt=1),
+        record('2026-03-01', focus_min=10, outcome=SessionOutcomeEnum.RESET),
+        record('2026-03-01', label='read', focus_min=30),
+        record('2026-03-02', focus_min=25, pause_cnt=2),
+        record('2026-03-03', label='read', focus_min=5, outcome=SessionOutcomeEnum.CLEARED),
+    ])
+    return store
+
+
+def test_analytics_loads_daily_stats(analytics_store):
+    analytics = HistoryAnalytics(analytics_store)
+    assert list(analytics.frame.columns) == list(DAILY_COLUMNS)
+    assert len(analytics.frame) == 4
+
+
+def test_daily_focus_totals(analytics_store):
+    totals = HistoryAnalytics(analytics_store).daily_focus_totals()
+    assert totals.name == 'focus_min'
+    assert [str(day.date()) for day in totals.index] == ['2026-03-01', '2026-03-02', '2026-03-03']
+    assert list(totals) == [65, 25, 5]
+    assert list(HistoryAnalytics(analytics_store).daily_focus_totals(label='read')) == [30, 5]
+
+
+def test_completion_rate(analytics_store):
+    analytics = HistoryAnalytics(analytics_store)
+    assert analytics.completion_rate() == pytest.approx(3 / 5)
+    by_label = analytics.completion_rate(by_label=True)
+    assert by_label.name == 'completion_rate'
+    assert by_label.to_dict() == {'focus': pytest.approx(2 / 3), 'read': pytest.approx(1 / 2)}
+    assert analytics.completion_rate(since_ms=local_ms('2026-04-01')) == 0.0
+
+
+def test_interruption_counts(analytics_store):
+    counts = HistoryAnalytics(analytics_store).interruption_counts()
+    assert counts.name == 'interruptions'
+    assert list(counts) == [2, 2, 1]
+
+
+def test_range_rounded_to_local_days(analytics_store):
+    analytics = HistoryAnalytics(analytics_store)
+    # since 在 3 月 1 日当天，包含整天；until 是 3 月 3 日零点，不含 3 月 3 日
+    totals = analytics.daily_focus_totals(since_ms=local_ms('2026-03-01', 18), until_ms=local_ms('2026-03-03', 0))
+    assert list(totals) == [65, 25]
+    assert list(HistoryAnalytics(analytics_store, since_ms=local_ms('2026-03-02')).daily_focus_totals()) == [25, 5]
+
+
+def test_refresh_rereads_from_last_day(analytics_store):
+    analytics = HistoryAnalytics(analytics_store)
+    analytics_store.add_many([record('2026-03-03', focus_min=20), record('2026-03-04', focus_min=15)])
+    # 最后一天 (3 月 3 日) 起重新读取：3 月 3 日两种提醒内容 + 3 月 4 日
+    assert analytics.refresh() == 3
+    assert list(analytics.daily_focus_totals()) == [65, 25, 25, 15]
+    assert analytics.refresh() == 1
+    assert len(analytics.frame) == 6
+
+
+def test_analytics_on_empty_store(store):
+    pytest.importorskip('pandas')
+    analytics = HistoryAnalytics(store)
+    assert analytics.completion_rate() == 0.0
+    assert analytics.daily_focus_totals().empty
+    store.add(record('2026-03-01'))
+    assert analytics.refresh() == 1
+    assert list(analytics.daily_focus_totals()) == [25]
+
@@ -0,0 +1,122 @@
+import json
+import os
+
+from timer_journal import JOURNAL_FILE, SNAPSHOT_FILE, TimerJournal, TimerState, TimerStatusEnum, apply_event
+
+NS_PER_MS = 1_000_000
+
+
+def test_apply_event_sequence():
+    state = TimerState('a')
+    state = apply_event(state, {'ev': 'start', 't': 1_000 * NS_PER_MS, 'ms_total': 60_000, 'hint': 'tea'})
+    assert state.status == TimerStatusEnum.RUNNING
+    assert state.remaining_ms(11_000 * NS_PER_MS) == 50_000
+    state = apply_event(state, {'ev': 'pause', 't': 21_000 * NS_PER_MS, 'ms_total': 60_000, 'ms_remain': 40_000})
+    assert state.status == TimerStatusEnum.PAUSED
+    assert state.remaining_ms() == 40_000
+    assert state.hint == 'tea'
+    state = apply_event(state, {'ev': 'resume', 't': 100_000 * NS_PER_MS, 'ms_total': 60_000, 'ms_remain': 40_000})
+    assert state.remaining_ms(110_000 * NS_PER_MS) == 30_000
+    state = apply_event(state, {'ev': 'reset', 't': 0, 'ms_total': 60_000})
+    assert (state.status, state.remaining_ms()) == (TimerStatusEnum.IDLE, 60_000)
+    state = apply_event(state, {'ev': 'clear', 't': 0})
+    assert (state.ms_total, state.remaining_ms()) == (0, 0)
+
+
+def test_cycle_kept_on_reset_and_dropped_on_complete():
+    cycle = {'phases': [['focus', 1500000], ['short_break', 300000]], 'index': 0}
+    state = apply_event(TimerState('a'), {'ev': 'start', 't': 0, 'ms_total': 1500000, 'cycle': cycle})
+    state = apply_event(state, {'ev': 'reset', 't': 0, 'ms_total': 1500000})
+    assert state.cycle == cycle
+    state = apply_event(state, {'ev': 'complete', 't': 0, 'ms_total': 1500000})
+    assert state.cycle is None
+
+
+def test_restore_roundtrip(tmp_path):
+    journal = TimerJournal(str(tmp_path))
+    journal.record('a', 'start', ms_total=60_000, ms_remain=60_000, hint='tea')
+    journal.record('a', 'pause', ms_total=60_000, ms_remain=40_000, hint='tea')
+    journal.record('b', 'start', ms_total=30_000, ms_remain=30_000, hint='')
+    journal.close()
+    restored = TimerJournal(str(tmp_path))
+    assert restored.states == journal.states
+    assert restored.states['a'].status == TimerStatusEnum.PAUSED
+    assert restored.states['a'].remaining_ms() == 40_000
+    assert restored.states['b'].status == TimerStatusEnum.RUNNING
+    assert restored.seq == 3
+    restored.close()
+
+
+def test_torn_last_line_is_truncated(tmp_path):
+    journal = TimerJournal(str(tmp_path))
+    journal.record('a', 'start', ms_total=60_000, ms_remain=60_000)
+    journal.record('a', 'pause', ms_total=60_000, ms_remain=40_000)
+    journal.close()
+    path = os.path.join(str(tmp_path), JOURNAL_FILE)
+    size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b'{"seq":3,"t":0,"timer":"a","ev":"res')  # 崩溃时写了一半
+    restored = TimerJournal(str(tmp_path))
+    assert os.path.getsize(path) == size
+    assert restored.states['a'].status == TimerStatusEnum.PAUSED
+    # 之后追加的事件从新的一行开始
+    restored.record('a', 'resume', ms_total=60_000, ms_remain=40_000)
+    restored.close()
+    with open(path, encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    assert [event['ev'] for event in events] == ['start', 'pause', 'resume']
+
+
+def test_corrupt_middle_line_is_skipped(tmp_path):
+    path = os.path.join(str(tmp_path), JOURNAL_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"seq":1,"t":0,"timer":"a","ev":"start","ms_total":60000}\n')
+        f.write('not json\n')
+        f.write('{"seq":3,"t":0,"timer":"a","ev":"pause","ms_total":60000,"ms_remain":5000}\n')
+    journal = TimerJournal(str(tmp_path))
+    assert journal.states['a'].remaining_ms() == 5_000
+    assert journal.seq == 3
+    journal.close()
+
+
+def test_compaction_writes_snapshot_and_empties_journal(tmp_path):
+    journal = TimerJournal(str(tmp_path), compact_every=4)
+    for i in range(5):
+        journal.record('a', 'pause', ms_total=60_000, ms_remain=60_000 - i * 1_000)
+    journal.close()
+    with open(os.path.join(str(tmp_path), SNAPSHOT_FILE), encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot['seq'] == 4
+    assert snapshot['timers']['a']['ms_remain'] == 57_000
+    with open(os.path.join(str(tmp_path), JOURNAL_FILE), encoding='utf-8') as f:
+        assert [json.loads(line)['seq'] for line in f] == [5]
+    restored = TimerJournal(str(tmp_path))
+    assert restored.states['a'].remaining_ms() == 56_000
+    assert restored.seq == 5
+    restored.close()
+
+
+def test_events_already_in_snapshot_are_not_replayed(tmp_path):
+    journal = TimerJournal(str(tmp_path), compact_every=2)
+    journal.record('a', 'start', ms_total=60_000, ms_remain=60_000)
+    journal.record('a', 'pause', ms_total=60_000, ms_remain=50_000)
+    journal.close()
+    # 压缩后、清空日志前崩溃：日志中仍留着快照已包含的事件
+    with open(os.path.join(str(tmp_path), JOURNAL_FILE), 'w', encoding='utf-8') as f:
+        f.write('{"seq":1,"t":0,"timer":"a","ev":"start","ms_total":60000}\n')
+    restored = TimerJournal(str(tmp_path))
+    assert restored.states['a'].status == TimerStatusEnum.PAUSED
+    restored.close()
+
+
+def test_schedule_sync_once_per_batch(tmp_path):
+    calls = []
+    journal = TimerJournal(
+        str(tmp_path), fsync_interval_ms=60_000, schedule_sync=lambda ms, callback: calls.append((ms, callback)))
+    journal.record('a', 'start', ms_total=1_000)
+    journal.record('a', 'pause', ms_total=1_000)
+    assert [ms for ms, _ in calls] == [60_000]
+    calls[0][1]()
+    journal.record('a', 'resume', ms_total=1_000)
+    assert len(calls) == 2
+    journal.close()
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from instance_ipc import CommandError
+from simple_timer import VirtualClock
+from timer_service import STATUS_DONE, Subscriber, TimerService
+
+
+class FakeTransport:
+    def __init__(self) -> None:
+        self.buffered = 0
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+
+class FakeWriter:
+    """ 只记录写入内容的 StreamWriter 替身 """
+
+    def __init__(self) -> None:
+        self.transport = FakeTransport()
+        self.lines = []
+        self.closing = False
+
+    def is_closing(self) -> bool:
+        return self.closing
+
+    def write(self, data: bytes) -> None:
+        self.lines.append(json.loads(data))
+
+
+def make_service(rate_hz: float = 4):
+    clock = VirtualClock()
+    service = TimerService(clock=clock, rate_hz=rate_hz)
+    writer = FakeWriter()
+    service.subscribers.add(Subscriber(writer))
+    return clock, service, writer
+
+
+def test_commands():
+    clock, service, _ = make_service()
+    assert service.create('tea', minutes=1) == {'tea': ['idle', 60_000, 60_000]}
+    with pytest.raises(CommandError):
+        service.create('tea', minutes=1)
+    with pytest.raises(CommandError):
+        service.create('empty')
+    service.add_seconds('tea', 30)
+    assert service.start('tea') == {'tea': ['running', 90_000, 90_000]}
+    with pytest.raises(CommandError):
+        service.add_seconds('tea', 30)
+    clock.advance(ms=10_000)
+    assert service.pause('tea') == {'tea': ['paused', 80_000, 90_000]}
+    clock.advance(ms=60_000)
+    assert service.resume('tea') == {'tea': ['running', 80_000, 90_000]}
+    assert service.reset('tea') == {'tea': ['idle', 90_000, 90_000]}
+    assert service.remove('tea') == {'removed': 'tea'}
+    with pytest.raises(CommandError):
+        service.pause('tea')
+
+
+def test_first_tick_sends_snapshot():
+    clock, service, writer = make_service()
+    service.create('a', seconds=10)
+    service.tick()
+    assert writer.lines[0]['ev'] == 'snapshot'
+    assert writer.lines[0]['timers'] == {'a': ['idle', 10_000, 10_000]}
+
+
+def test_tick_pushes_only_whole_second_changes():
+    clock, service, writer = make_service(rate_hz=4)
+    service.create('a', seconds=10, start=True)
+    service.create('idle', seconds=10)
+    service.tick()  # 快照
+    pushed = []
+    for _ in range(8):
+        clock.advance(ms=250)
+        broadcast = service.tick()
+        pushed.append(None if broadcast is None else broadcast.payload['timers'])
+    # 剩余整秒数按向下取整显示：开始 250 ms 后第一次变化 (10 -> 9)，之后每秒变化一次；空闲的计时器不推送
+    assert pushed == [
+        {'a': ['running', 9_750, 10_000]}, None, None, None,
+        {'a': ['running', 8_750, 10_000]}, None, None, None,
+    ]
+
+
+def test_tick_pushes_commands_and_completion():
+    clock, service, writer = make_service()
+    service.create('a', seconds=1, start=True)
+    service.tick()
+    service.pause('a')
+    assert service.tick().payload['timers'] == {'a': ['paused', 1_000, 1_000]}
+    assert service.tick() is None
+    service.resume('a')
+    service.tick()
+    clock.advance(ms=1_000)
+    assert service.tick().payload['timers'] == {'a': [STATUS_DONE, 0, 1_000]}
+    service.remove('a')
+    assert service.tick().payload['timers'] == {'a': None}
+
+
+def test_backlogged_subscriber_gets_snapshot_later():
+    clock, service, writer = make_service()
+    service.create('a', seconds=10, start=True)
+    service.tick()
+    writer.transport.buffered = 1 << 30
+    clock.advance(ms=1_000)
+    service.tick()
+    assert len(writer.lines) == 1
+    writer.transport.buffered = 0
+    service.tick()
+    assert writer.lines[-1]['ev'] == 'snapshot'
+
+
+def test_closed_subscriber_is_dropped():
+    clock, service, writer = make_service()
+    writer.closing = True
+    service.tick()
+    assert not service.subscribers
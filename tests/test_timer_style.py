@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+pytest.importorskip('PyQt5')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from timer_style import (  # noqa: E402
+    DEFAULT_THEME, PROP_STYLE_INSTALLED, STYLE_BEGIN, STYLE_END, TimerTheme, build_stylesheet, install_stylesheet,
+)
+
+BASE = 'QToolTip { color: red; }'
+
+
+@pytest.fixture
+def app():
+    app = QApplication.instance() or QApplication([])
+    app.setStyleSheet(BASE)
+    app.setProperty(PROP_STYLE_INSTALLED, None)
+    yield app
+    app.setStyleSheet('')
+    app.setProperty(PROP_STYLE_INSTALLED, None)
+
+
+def test_install_keeps_base_sheet(app):
+    install_stylesheet()
+    assert app.styleSheet() == f'{BASE}\n{STYLE_BEGIN}{build_stylesheet(DEFAULT_THEME)}{STYLE_END}'
+    # 同一主题不重复设置
+    install_stylesheet()
+    assert app.styleSheet().count(STYLE_BEGIN) == 1
+
+
+def test_theme_change_replaces_section(app):
+    dark = TimerTheme(color_text='white', color_hint='silver')
+    for theme in (DEFAULT_THEME, dark, DEFAULT_THEME, dark):
+        install_stylesheet(theme)
+    sheet = app.styleSheet()
+    assert sheet.count(STYLE_BEGIN) == sheet.count(STYLE_END) == 1
+    assert sheet == f'{BASE}\n{STYLE_BEGIN}{build_stylesheet(dark)}{STYLE_END}'
+
+
+def test_rules_added_after_install_are_kept(app):
+    install_stylesheet()
+    app.setStyleSheet(f'{app.styleSheet()}\nQMenu {{ color: blue; }}')
+    theme = TimerTheme(color_text='white')
+    install_stylesheet(theme)
+    assert app.styleSheet() == f'{BASE}\nQMenu {{ color: blue; }}\n{STYLE_BEGIN}{build_stylesheet(theme)}{STYLE_END}'
+
+
+def test_empty_base_sheet(app):
+    app.setStyleSheet('')
+    install_stylesheet()
+    assert app.styleSheet().startswith(STYLE_BEGIN)
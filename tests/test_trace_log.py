@@ -0,0 +1,125 @@
+import io
+
+import pytest
+
+from trace_log import TraceLevel, Tracer, _level_from_env, format_record
+
+
+class Lazy:
+    """ 记录 __str__ 被调用的次数 """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return 'lazy'
+
+
+def events(tracer: Tracer):
+    return [record[3] for record in tracer.records]
+
+
+def test_ring_buffer_evicts_oldest():
+    tracer = Tracer(capacity=3)
+    for i in range(5):
+        tracer.info(f'e{i}')
+    assert events(tracer) == ['e2', 'e3', 'e4']
+    assert len(tracer.lines()) == 3
+    tracer.clear()
+    assert tracer.lines() == []
+
+
+def test_level_filtering():
+    tracer = Tracer(TraceLevel.WARNING)
+    tracer.debug('d')
+    tracer.info('i')
+    tracer.warning('w')
+    tracer.error('e')
+    assert events(tracer) == ['w', 'e']
+    assert (tracer.debug_on, tracer.info_on) == (False, False)
+    tracer.set_level(TraceLevel.DEBUG)
+    assert (tracer.debug_on, tracer.info_on) == (True, True)
+    tracer.debug('d')
+    assert events(tracer)[-1] == 'd'
+    tracer.set_level(TraceLevel.OFF)
+    tracer.error('e')
+    assert len(tracer.records) == 3
+
+
+def test_formatting_is_lazy():
+    tracer = Tracer()
+    lazy = Lazy()
+    tracer.info('fmt', 'value=%s', lazy)
+    assert lazy.calls == 0
+    calls = []
+    tracer.info('fn', lambda n: calls.append(n) or f'n={n}', 7)
+    assert calls == []
+    lines = tracer.lines()
+    assert lines[0].endswith('INFO    [MainThread] fmt value=lazy')
+    assert lines[1].endswith('fn n=7')
+    assert (lazy.calls, calls) == (1, [7])
+
+
+def test_filtered_records_are_never_formatted():
+    tracer = Tracer(TraceLevel.INFO)
+    lazy = Lazy()
+    tracer.debug('fmt', '%s', lazy)
+    tracer.lines()
+    assert lazy.calls == 0
+    assert len(tracer.records) == 0
+
+
+def test_message_without_args_is_not_percent_formatted():
+    tracer = Tracer()
+    tracer.info('pct', '100%')
+    assert tracer.lines()[0].endswith('pct 100%')
+
+
+def test_format_error_does_not_break_dump():
+    tracer = Tracer()
+    tracer.info('bad', '%d', 'x')
+    tracer.info('ok', 'fine')
+    lines = tracer.lines()
+    assert '<format error:' in lines[0]
+    assert lines[1].endswith('ok fine')
+
+
+def test_format_record_layout():
+    ns = 1_700_000_000_123_456_789
+    line = format_record((ns, TraceLevel.ERROR, 'worker', 'evt', 'a=%s b=%s', (1, 2)))
+    assert line.split(' ', 1)[0].endswith('.123')
+    assert line.split(' ', 1)[1] == 'ERROR   [worker] evt a=1 b=2'
+    assert format_record((ns, TraceLevel.INFO, 'T', 'evt', '', ())).endswith('[T] evt')
+
+
+def test_dump_targets(tmp_path):
+    tracer = Tracer()
+    tracer.info('a')
+    tracer.info('b')
+    text = tracer.dump()
+    assert text.count('\n') == 2
+    stream = io.StringIO()
+    assert tracer.dump(stream) is None
+    assert stream.getvalue() == text
+    path = tmp_path / 'sub' / 'trace.log'
+    tracer.dump(str(path))
+    assert path.read_text(encoding='utf-8') == text
+
+
+def test_echo_to_stderr(capsys, monkeypatch):
+    tracer = Tracer(echo=True)
+    tracer.info('evt', 'x=%d', 1)
+    assert capsys.readouterr().err.rstrip().endswith('evt x=1')
+    # --noconsole 打包后 stderr 为 None
+    monkeypatch.setattr('sys.stderr', None)
+    tracer.info('evt')
+    assert len(tracer.records) == 2
+
+
+@pytest.mark.parametrize('value, level', (
+    (None, TraceLevel.INFO), ('', TraceLevel.INFO), ('debug', TraceLevel.DEBUG), ('OFF', TraceLevel.OFF),
+    ('verbose', TraceLevel.INFO),
+))
+def test_level_from_env(value, level):
+    assert _level_from_env(value) == level